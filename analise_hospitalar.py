@@ -1,8 +1,19 @@
 import pygame
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+import os
 import re
+import time
 import unicodedata
+from deteccao_encoding import detectar_encoding
+from conversao_colunar import ler_convertido, ler_esquema
+from inferencia_tipos import otimizar_tipos
+from codificacao import AUSENTE, codificar_ordinal, codificar_numerico
+from indice_bitmap import IndiceBitmap
+from indice_espacial import IndiceEspacial, extrair_coordenadas
+from juncao_demografica import metricas_per_capita
+from selecao_top_k import top_k, top_k_linhas
 
 # Configurações do Pygame
 pygame.init()
@@ -13,6 +24,41 @@ pygame.display.set_caption("Análise de Dados Hospitalares")
 BLUE = (0, 0, 255)
 WHITE = (255, 255, 255)
 FONT = pygame.font.Font(None, 30)
+FONTE_FILTROS = pygame.font.Font(None, 24)
+CSV_PATH = "./assets/datasets/cms/hospital-general-information/HospInfo.csv"
+
+# Quantidade de linhas lidas por vez na leitura projetada
+TAMANHO_CHUNK = 2000
+
+# Colunas de comparação com a média nacional, codificadas como int8
+COLUNAS_COMPARACAO = [
+    'mortality_national_comparison', 'safety_of_care_national_comparison',
+    'readmission_national_comparison', 'patient_experience_national_comparison',
+    'effectiveness_of_care_national_comparison', 'timeliness_of_care_national_comparison',
+    'efficient_use_of_medical_imaging_national_comparison',
+]
+CODIGOS_COMPARACAO = {
+    'Below the national average': -1,
+    'Same as the national average': 0,
+    'Above the national average': 1,
+}
+
+# Avaliação geral (1 a 5), também codificada como int8
+COLUNA_AVALIACAO = 'hospital_overall_rating'
+
+# Colunas calculadas na carga e a coluna do CSV de onde saem
+COLUNAS_DERIVADAS = {'latitude': 'location', 'longitude': 'location'}
+
+# Colunas com índice bitmap, usado pelos filtros dos insights e pela barra de filtros
+COLUNAS_INDICE = ['state', 'hospital_type', 'hospital_ownership', 'emergency_services'] + COLUNAS_COMPARACAO + [COLUNA_AVALIACAO]
+
+# Colunas selecionáveis na barra de filtros e seus rótulos
+FILTROS_BARRA = {
+    'state': 'Estado',
+    'hospital_type': 'Tipo',
+    'hospital_ownership': 'Propriedade',
+    'emergency_services': 'Emergência',
+}
 
 # Função para limpar os nomes das colunas
 def clean_column_name(name):
@@ -27,30 +73,238 @@ def clean_column_name(name):
     s = re.sub(r'\s+', '_', s)
     return s
 
-# Função para carregar o arquivo CSV e limpar os nomes das colunas
-def load_csv(filepath):
+def codificar_colunas(df):
+    """
+    Converte as colunas de comparação nacional e a avaliação geral presentes
+    em `df` para códigos int8 (-1/0/1 e 1 a 5), com `AUSENTE` para "Not
+    Available". Os textos são comparados sem diferenciar maiúsculas de
+    minúsculas.
+    """
+    for col in COLUNAS_COMPARACAO:
+        if col in df.columns:
+            df[col] = codificar_ordinal(df[col], CODIGOS_COMPARACAO)
+    if COLUNA_AVALIACAO in df.columns:
+        df[COLUNA_AVALIACAO] = codificar_numerico(df[COLUNA_AVALIACAO], minimo=1, maximo=5)
+    return df
+
+def extrair_localizacao(df):
+    """
+    Extrai a latitude e a longitude do "(lat, lon)" no fim da coluna
+    'location', quando ela está presente (NaN para os hospitais sem
+    coordenadas).
+    """
+    if 'location' in df.columns:
+        df['latitude'], df['longitude'] = extrair_coordenadas(df['location'])
+    return df
+
+def preparar_colunas(df):
+    """
+    Codifica as colunas de comparação e a avaliação e extrai as coordenadas.
+    """
+    return extrair_localizacao(codificar_colunas(df))
+
+# Operadores aceitos nos filtros declarados pelos insights
+OPERADORES_FILTRO = {
+    '==': lambda serie, valor: serie == valor,
+    '!=': lambda serie, valor: serie != valor,
+    'in': lambda serie, valor: serie.isin(valor),
+    'notna': lambda serie, valor: serie.notna(),
+}
+
+def aplicar_filtros(df, filtros):
+    """
+    Aplica os filtros (coluna, operador, valor) de forma vetorizada,
+    combinando-os com E lógico.
+    """
+    mascara = pd.Series(True, index=df.index)
+    for coluna, operador, valor in filtros:
+        mascara &= OPERADORES_FILTRO[operador](df[coluna], valor)
+    return df[mascara]
+
+def load_csv_projetado(filepath, colunas, filtros=(), tamanho_chunk=TAMANHO_CHUNK, manter_posicoes=False):
     """
-    Carrega o arquivo CSV, limpa os nomes das colunas e trata erros de encoding.
+    Lê apenas as colunas informadas (nomes já limpos) e aplica os filtros de
+    linhas enquanto o arquivo é percorrido em blocos, sem nunca carregar o
+    arquivo completo em memória. Se o CSV já foi convertido para Feather, lê
+    apenas as colunas necessárias do arquivo convertido. As colunas de
+    comparação e a avaliação são codificadas antes dos filtros, e as colunas
+    derivadas (`COLUNAS_DERIVADAS`) são calculadas a partir das colunas de
+    origem.
+
+    Com `manter_posicoes`, o índice do resultado é a posição de cada linha
+    no arquivo (a mesma dos índices bitmap e espacial).
     """
-    try:
-        df = pd.read_csv(filepath, encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv(filepath, encoding='latin-1')
-        except UnicodeDecodeError:
-            df = pd.read_csv(filepath, encoding='cp1252')
-            
-    df.columns = [clean_column_name(col) for col in df.columns]
+    esquema = ler_esquema(filepath)
+    if esquema is not None:
+        cabecalho = [coluna['nome'] for coluna in esquema['colunas']]
+    else:
+        cabecalho = pd.read_csv(filepath, encoding=detectar_encoding(filepath), nrows=0).columns
+    nomes_originais = {clean_column_name(col): col for col in cabecalho}
+
+    necessarias = list(dict.fromkeys(list(colunas) + [coluna for coluna, _, _ in filtros]))
+    usecols = list(dict.fromkeys(nomes_originais[COLUNAS_DERIVADAS.get(col, col)] for col in necessarias))
+
+    df = ler_convertido(filepath, colunas=usecols) if esquema is not None else None
+    if df is not None:
+        df.columns = [clean_column_name(col) for col in df.columns]
+        df = aplicar_filtros(preparar_colunas(df), filtros)
+    else:
+        partes = []
+        for chunk in pd.read_csv(filepath, encoding=detectar_encoding(filepath), usecols=usecols, chunksize=tamanho_chunk):
+            chunk.columns = [clean_column_name(col) for col in chunk.columns]
+            partes.append(aplicar_filtros(preparar_colunas(chunk), filtros))
+        df = pd.concat(partes)
+
+    df = df[necessarias]
+    codificadas = COLUNAS_COMPARACAO + [COLUNA_AVALIACAO]
+    df = otimizar_tipos(df if manter_posicoes else df.reset_index(drop=True), ignorar=codificadas)
+
+    # Os códigos de `codificar_colunas` devem continuar em int8
+    alargadas = [col for col in codificadas if col in df.columns and df[col].dtype != np.int8]
+    if alargadas:
+        raise TypeError(f"Colunas codificadas fora de int8: {alargadas}")
     return df
 
-# Carregar os dados
-try:
-    df = load_csv("./assets/datasets/cms/hospital-general-information/HospInfo.csv") # Substitua "hospital_data.csv" pelo nome do seu arquivo
-except FileNotFoundError:
+def insight(colunas, filtros=()):
+    """
+    Decorador que declara as colunas e os filtros de linhas usados por uma
+    função de plotagem. O carregador lê somente o que estiver declarado.
+    """
+    def decorador(plot_function):
+        plot_function.colunas = list(colunas)
+        plot_function.filtros = list(filtros)
+        return plot_function
+    return decorador
+
+# Verifica se o arquivo de dados existe
+if not os.path.exists(CSV_PATH):
     print("Erro: Arquivo hospital_data.csv não encontrado. Certifique-se de que o arquivo está no mesmo diretório do script ou forneça o caminho completo.")
     pygame.quit()
     exit()
 
+# Colunas já carregadas para cada insight (as linhas aprovadas pelos filtros sem índice), reaproveitadas entre cliques
+dados_insights = {}
+
+# Índice bitmap das colunas categóricas, montado uma única vez ao carregar
+indice_hospitais = IndiceBitmap(load_csv_projetado(CSV_PATH, COLUNAS_INDICE), COLUNAS_INDICE)
+
+# Índice espacial das coordenadas dos hospitais (mesmas posições do índice bitmap)
+indice_espacial = IndiceEspacial(*load_csv_projetado(CSV_PATH, ['latitude', 'longitude']).to_numpy(dtype=float).T)
+
+def hospitais_proximos(lat, lon, raio_km=None, k=None, avaliacao_minima=None, emergencia=None):
+    """
+    Consulta os hospitais próximos a um ponto, por raio e/ou pelos k mais
+    próximos, opcionalmente apenas os com serviço de emergência e com
+    avaliação mínima. Ex: hospitais com emergência a até 50 km, com
+    avaliação >= 4:
+
+        hospitais_proximos(29.76, -95.37, raio_km=50, avaliacao_minima=4, emergencia=True)
+
+    Returns:
+        Um DataFrame com nome, cidade, estado, avaliação e distância (km), do
+        mais próximo para o mais distante.
+    """
+    bitsets = []
+    if emergencia is not None:
+        bitsets.append(indice_hospitais.bitmap('emergency_services', emergencia))
+    if avaliacao_minima is not None:
+        bitsets.append(indice_hospitais.qualquer(COLUNA_AVALIACAO, range(int(avaliacao_minima), 6)))
+    mascara = indice_hospitais.mascara(indice_hospitais.e(*bitsets)) if bitsets else None
+
+    if k is not None:
+        posicoes, distancias = indice_espacial.vizinhos(lat, lon, k, mascara)
+        if raio_km is not None:
+            posicoes, distancias = posicoes[distancias <= raio_km], distancias[distancias <= raio_km]
+    else:
+        posicoes, distancias = indice_espacial.raio(lat, lon, raio_km if raio_km is not None else 50, mascara)
+
+    colunas = ('hospital_name', 'city', 'state', COLUNA_AVALIACAO)
+    if colunas not in dados_insights:
+        dados_insights[colunas] = load_csv_projetado(CSV_PATH, colunas)
+    resultado = dados_insights[colunas].iloc[posicoes].reset_index(drop=True)
+    return resultado.assign(distancia_km=distancias)
+
+class BarraFiltros:
+    """
+    Seleção da barra de filtros: um valor (ou todos) por coluna de
+    `FILTROS_BARRA`, com as colunas selecionadas combinadas com E ou OU.
+    """
+
+    def __init__(self, indice):
+        self.indice = indice
+        self.modo = 'E'
+        self.limpar()
+
+    def limpar(self):
+        self.selecao = {coluna: None for coluna in FILTROS_BARRA}
+        self.atualizar()
+
+    def alternar_modo(self):
+        self.modo = 'OU' if self.modo == 'E' else 'E'
+        self.atualizar()
+
+    def avancar(self, coluna, passo):
+        """
+        Seleciona o próximo (ou o anterior) valor da coluna; None é "todos".
+        """
+        opcoes = [None] + list(self.indice.valores[coluna])
+        atual = opcoes.index(self.selecao[coluna])
+        self.selecao[coluna] = opcoes[(atual + passo) % len(opcoes)]
+        self.atualizar()
+
+    def bitmap(self):
+        bitsets = [self.indice.bitmap(coluna, valor) for coluna, valor in self.selecao.items() if valor is not None]
+        if not bitsets:
+            return self.indice.cheio
+        return self.indice.e(*bitsets) if self.modo == 'E' else self.indice.ou(*bitsets)
+
+    def atualizar(self):
+        inicio = time.perf_counter()
+        self.selecionados = self.indice.contar(self.bitmap())
+        self.tempo_ms = (time.perf_counter() - inicio) * 1000
+
+barra_filtros = BarraFiltros(indice_hospitais)
+
+def filtro_indexado(filtro):
+    """
+    Indica se o filtro (coluna, operador, valor) pode ser resolvido pelos
+    índices bitmap.
+    """
+    coluna, operador, _ = filtro
+    return coluna in indice_hospitais.colunas and operador in ('==', '!=', 'in')
+
+def bitmap_dos_filtros(filtros):
+    """
+    Converte os filtros indexados (veja `filtro_indexado`) de um insight em
+    um bitset.
+    """
+    bitsets = []
+    for coluna, operador, valor in filtros:
+        bitset = indice_hospitais.qualquer(coluna, valor if operador == 'in' else [valor])
+        bitsets.append(indice_hospitais.negar(bitset) if operador == '!=' else bitset)
+    return indice_hospitais.e(*bitsets)
+
+def dados_do_insight(plot_function):
+    """
+    Retorna as linhas que o insight precisa: as colunas declaradas, com os
+    filtros do insight e os da barra de filtros aplicados.
+
+    Os filtros sobre colunas sem índice bitmap são aplicados na leitura em
+    blocos, que guarda só as linhas aprovadas (com as suas posições no
+    arquivo); os filtros indexados e a barra de filtros são resolvidos pelos
+    bitmaps sobre essas linhas, sem reler o arquivo a cada mudança da barra.
+    """
+    filtros_leitura = [filtro for filtro in plot_function.filtros if not filtro_indexado(filtro)]
+    filtros_bitmap = [filtro for filtro in plot_function.filtros if filtro_indexado(filtro)]
+
+    chave = (tuple(plot_function.colunas), tuple(filtros_leitura))
+    if chave not in dados_insights:
+        dados_insights[chave] = load_csv_projetado(CSV_PATH, plot_function.colunas, filtros_leitura, manter_posicoes=True)
+    df = dados_insights[chave]
+
+    mascara = indice_hospitais.mascara(indice_hospitais.e(bitmap_dos_filtros(filtros_bitmap), barra_filtros.bitmap()))
+    return df[mascara[df.index.to_numpy()]][plot_function.colunas].reset_index(drop=True)
+
 # Insights sugeridos
 insights = [
     "Top 10 Hospitais por Avaliação",
@@ -58,11 +312,15 @@ insights = [
     "Serviços de Emergência por Tipo de Propriedade",
     "Avaliação por Tipo de Hospital",
     "Readmissão vs. Experiência do Paciente",
+    "Mapa de Hospitais",
+    "Hospitais por 100 mil Habitantes",
 ]
 
 # Funções para gerar os gráficos
+@insight(colunas=['hospital_name', 'hospital_overall_rating'],
+         filtros=[('hospital_overall_rating', '!=', AUSENTE)])
 def plot_top_10_hospitals(df):
-    df_sorted = df.sort_values('hospital_overall_rating', ascending=False).head(10)
+    df_sorted = top_k_linhas(df, 'hospital_overall_rating', 10)
     plt.figure(figsize=(12, 6))
     plt.bar(df_sorted['hospital_name'], df_sorted['hospital_overall_rating'])
     plt.title('Top 10 Hospitais por Avaliação')
@@ -72,10 +330,11 @@ def plot_top_10_hospitals(df):
     plt.tight_layout()
     plt.show()
 
+@insight(colunas=['state'],
+         filtros=[('mortality_national_comparison', '!=', AUSENTE)])
 def plot_mortality_by_state(df):
-    df_filtered = df[df['mortality_national_comparison'] != 'Not Available']
     plt.figure(figsize=(12, 6))
-    plt.bar(df_filtered['state'].value_counts().index, df_filtered['state'].value_counts().values, color=(0,0,255))
+    plt.bar(df['state'].value_counts().index, df['state'].value_counts().values, color='blue')
     plt.title('Comparação de Mortalidade por Estado')
     plt.xlabel('Estado')
     plt.ylabel('Número de Hospitais')
@@ -83,20 +342,21 @@ def plot_mortality_by_state(df):
     plt.tight_layout()
     plt.show()
 
+@insight(colunas=['hospital_ownership'],
+         filtros=[('emergency_services', '==', True)])
 def plot_emergency_services_by_ownership(df):
-    df_filtered = df[df['emergency_services'] == 'Yes']
-    ownership_counts = df_filtered['hospital_ownership'].value_counts()
+    ownership_counts = df['hospital_ownership'].value_counts()
     plt.figure(figsize=(10, 6))
     plt.pie(ownership_counts, labels=ownership_counts.index, autopct='%1.1f%%', startangle=140)
     plt.title('Serviços de Emergência por Tipo de Propriedade')
     plt.tight_layout()
     plt.show()
 
+@insight(colunas=['hospital_type', 'hospital_overall_rating'],
+         filtros=[('hospital_overall_rating', '!=', AUSENTE)])
 def plot_rating_by_hospital_type(df):
-    df_filtered = df[df['hospital_overall_rating'] != 'Not Available']
-    df_filtered['hospital_overall_rating'] = pd.to_numeric(df_filtered['hospital_overall_rating'], errors='coerce')
     plt.figure(figsize=(12, 6))
-    df_filtered.boxplot(column='hospital_overall_rating', by='hospital_type', grid=False, rot=45)
+    df.boxplot(column='hospital_overall_rating', by='hospital_type', grid=False, rot=45)
     plt.title('Avaliação por Tipo de Hospital')
     plt.xlabel('Tipo de Hospital')
     plt.ylabel('Avaliação')
@@ -104,26 +364,13 @@ def plot_rating_by_hospital_type(df):
     plt.tight_layout()
     plt.show()
 
+@insight(colunas=['readmission_national_comparison', 'patient_experience_national_comparison'],
+         filtros=[('readmission_national_comparison', '!=', AUSENTE),
+                  ('patient_experience_national_comparison', '!=', AUSENTE)])
 def plot_readmission_vs_patient_experience(df):
-    readmission_map = {
-        'Same as the National average': 0,
-        'Below the National average': -1,
-        'Above the National average': 1,
-        'Not Available': None,
-    }
-    patient_exp_map = {
-        'Same as the National average': 0,
-        'Below the National average': -1,
-        'Above the National average': 1,
-        'Not Available': None,
-    }
-    df['readmission_score'] = df['readmission_national_comparison'].map(readmission_map)
-    df['patient_exp_score'] = df['patient_experience_national_comparison'].map(patient_exp_map)
-
-    df_filtered = df.dropna(subset=['readmission_score', 'patient_exp_score'])
-
+    # As colunas já chegam codificadas: -1 (abaixo), 0 (igual) e 1 (acima da média nacional)
     plt.figure(figsize=(8, 6))
-    plt.scatter(df_filtered['readmission_score'], df_filtered['patient_exp_score'], color=BLUE)
+    plt.scatter(df['readmission_national_comparison'], df['patient_experience_national_comparison'], color='blue')
     plt.title('Readmissão vs. Experiência do Paciente')
     plt.xlabel('Readmissão (Comparado à Média Nacional)')
     plt.ylabel('Experiência do Paciente (Comparado à Média Nacional)')
@@ -133,6 +380,39 @@ def plot_readmission_vs_patient_experience(df):
     plt.tight_layout()
     plt.show()
     
+@insight(colunas=['latitude', 'longitude', 'hospital_overall_rating'],
+         filtros=[('latitude', 'notna', None)])
+def plot_hospital_map(df):
+    avaliados = df['hospital_overall_rating'] != AUSENTE
+    plt.figure(figsize=(12, 7))
+    plt.scatter(df.loc[~avaliados, 'longitude'], df.loc[~avaliados, 'latitude'], s=4, color='lightgray', label='Sem avaliação')
+    pontos = plt.scatter(df.loc[avaliados, 'longitude'], df.loc[avaliados, 'latitude'], s=6,
+                         c=df.loc[avaliados, 'hospital_overall_rating'], cmap='RdYlGn', vmin=1, vmax=5)
+    plt.colorbar(pontos, label='Avaliação')
+    plt.title('Mapa de Hospitais')
+    plt.xlabel('Longitude')
+    plt.ylabel('Latitude')
+    plt.legend(loc='lower left')
+    plt.gca().set_aspect(1.3)
+    plt.tight_layout()
+    plt.show()
+
+@insight(colunas=['state'])
+def plot_hospitals_per_capita(df):
+    # A população por estado vem da junção com os condados, feita uma única vez e guardada em cache;
+    # aqui só as contagens dos hospitais selecionados (barra de filtros) são refeitas
+    _, por_estado = metricas_per_capita(CSV_PATH)
+    populacao = por_estado.set_index('sigla')['total_population']
+    contagens = df['state'].astype(str).value_counts()
+    taxa = top_k((contagens / populacao.reindex(contagens.index) * 100_000).dropna(), 15)
+    plt.figure(figsize=(12, 6))
+    plt.bar(taxa.index, taxa.values, color='blue')
+    plt.title('Hospitais por 100 mil Habitantes (15 estados com maior taxa)')
+    plt.xlabel('Estado')
+    plt.ylabel('Hospitais por 100 mil habitantes')
+    plt.tight_layout()
+    plt.show()
+
 # Dicionário de insights e suas funções de plotagem
 insight_functions = {
     "Top 10 Hospitais por Avaliação": plot_top_10_hospitals,
@@ -140,6 +420,8 @@ insight_functions = {
     "Serviços de Emergência por Tipo de Propriedade": plot_emergency_services_by_ownership,
     "Avaliação por Tipo de Hospital": plot_rating_by_hospital_type,
     "Readmissão vs. Experiência do Paciente": plot_readmission_vs_patient_experience,
+    "Mapa de Hospitais": plot_hospital_map,
+    "Hospitais por 100 mil Habitantes": plot_hospitals_per_capita,
 }
 
 # Classe para os botões
@@ -166,12 +448,42 @@ class Button:
                 if self.action:
                     self.action()
 
+class SeletorFiltro:
+    """
+    Campo da barra de filtros: clique esquerdo (ou rolagem para baixo)
+    seleciona o próximo valor da coluna, clique direito (ou rolagem para
+    cima) o anterior.
+    """
+
+    def __init__(self, coluna, x, y, width, height):
+        self.coluna = coluna
+        self.rect = pygame.Rect(x, y, width, height)
+
+    def draw(self, surface):
+        valor = barra_filtros.selecao[self.coluna]
+        if valor is None:
+            texto = 'Todos'
+        elif isinstance(valor, (bool, np.bool_)):
+            texto = 'Sim' if valor else 'Não'
+        else:
+            texto = str(valor)[:24]
+        pygame.draw.rect(surface, BLUE, self.rect, width=2, border_radius=10)
+        text_surface = FONTE_FILTROS.render(f"{FILTROS_BARRA[self.coluna]}: {texto}", True, BLUE)
+        surface.blit(text_surface, text_surface.get_rect(center=self.rect.center))
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
+            if event.button in (1, 5):
+                barra_filtros.avancar(self.coluna, 1)
+            elif event.button in (3, 4):
+                barra_filtros.avancar(self.coluna, -1)
+
 # Função para exibir a tela de gráfico
 def show_graph_screen(plot_function):
     graph_screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Gráfico")
     
-    plot_function(df)  # Chama a função de plotagem
+    plot_function(dados_do_insight(plot_function))  # Chama a função de plotagem
 
     running = True
     while running:
@@ -190,7 +502,7 @@ def show_graph_screen(plot_function):
 buttons = []
 button_width = 450
 button_height = 40
-button_y_start = 50
+button_y_start = 20
 button_spacing = 10
 
 for i, insight in enumerate(insights):
@@ -198,6 +510,17 @@ for i, insight in enumerate(insights):
     button = Button(insight, (SCREEN_WIDTH - button_width) // 2, button_y, button_width, button_height, action=lambda insight=insight: show_graph_screen(insight_functions[insight]))
     buttons.append(button)
 
+# Barra de filtros, abaixo dos insights
+filtros_y = button_y_start + len(insights) * (button_height + button_spacing) + 30
+seletor_width = (SCREEN_WIDTH - 3 * 20) // 2
+seletores = [
+    SeletorFiltro(coluna, 20 + (i % 2) * (seletor_width + 20), filtros_y + (i // 2) * (button_height + button_spacing), seletor_width, button_height)
+    for i, coluna in enumerate(FILTROS_BARRA)
+]
+controles_y = filtros_y + 2 * (button_height + button_spacing)
+buttons.append(Button("Combinar: E / OU", 20, controles_y, seletor_width, button_height, action=barra_filtros.alternar_modo))
+buttons.append(Button("Limpar Filtros", 40 + seletor_width, controles_y, seletor_width, button_height, action=barra_filtros.limpar))
+
 # Loop principal
 running = True
 while running:
@@ -206,10 +529,16 @@ while running:
             running = False
         for button in buttons:
             button.handle_event(event)
+        for seletor in seletores:
+            seletor.handle_event(event)
 
     screen.fill(WHITE)
     for button in buttons:
         button.draw(screen)
+    for seletor in seletores:
+        seletor.draw(screen)
+    status = f"Modo {barra_filtros.modo}: {barra_filtros.selecionados} de {indice_hospitais.n} hospitais ({barra_filtros.tempo_ms:.3f} ms)"
+    screen.blit(FONTE_FILTROS.render(status, True, BLUE), (20, controles_y + button_height + button_spacing))
 
     pygame.display.flip()
 
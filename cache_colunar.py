@@ -0,0 +1,310 @@
+import os
+import glob
+import json
+import hashlib
+import inspect
+import functools
+import pandas as pd
+
+# Diretório onde ficam os DataFrames já limpos em formato colunar
+DIRETORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "cache")
+
+# Tamanho do bloco lido a cada passo do hash (1 MiB)
+TAMANHO_BLOCO = 1024 * 1024
+
+
+def hash_arquivo(caminho):
+    """
+    Calcula o hash do conteúdo de um arquivo lendo-o em blocos.
+
+    Args:
+        caminho: O caminho do arquivo.
+
+    Returns:
+        Uma string hexadecimal com o hash BLAKE2b (128 bits) do conteúdo.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def identidade_carregador(carregador, versao):
+    """
+    Monta um identificador estável para a função de carregamento, combinando
+    o script onde ela foi definida, o seu nome e a versão do normalizador.
+    """
+    script = os.path.splitext(os.path.basename(inspect.getfile(carregador)))[0]
+    nome = carregador.__qualname__.replace('<', '').replace('>', '')
+    return f"{script}.{nome}.v{versao}"
+
+
+def _formato_disponivel():
+    """
+    Retorna o formato colunar disponível: Feather quando o pyarrow está
+    instalado, ou pickle como alternativa.
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return 'feather'
+    except ImportError:
+        return 'pkl'
+
+
+def ler_tabela(caminho_cache, colunas=None):
+    """
+    Lê uma tabela gravada por `gravar_tabela`, opcionalmente apenas com as
+    colunas informadas.
+    """
+    if caminho_cache.endswith('.feather'):
+        return pd.read_feather(caminho_cache, columns=colunas)
+    df = pd.read_pickle(caminho_cache)
+    return df[colunas] if colunas is not None else df
+
+
+def gravar_tabela(df, base_cache):
+    """
+    Grava o DataFrame em formato colunar de forma atômica (arquivo temporário
+    + rename), em `base_cache` acrescido da extensão do formato. Se o formato
+    Feather não suportar alguma coluna, grava em pickle.
+
+    Returns:
+        O caminho do arquivo gravado, ou None em caso de erro.
+    """
+    formatos = [_formato_disponivel(), 'pkl']
+    for formato in dict.fromkeys(formatos):
+        caminho_cache = f"{base_cache}.{formato}"
+        temporario = f"{caminho_cache}.tmp{os.getpid()}"
+        try:
+            if formato == 'feather':
+                df.to_feather(temporario)
+            else:
+                df.to_pickle(temporario)
+            os.replace(temporario, caminho_cache)
+            return caminho_cache
+        except Exception as e:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            print(f"Não foi possível gravar o cache em {formato}: {e}")
+    return None
+
+
+def remover_versoes_antigas(prefixo, manter):
+    """
+    Remove entradas do mesmo carregador e arquivo geradas a partir de um
+    conteúdo ou versão anterior.
+    """
+    for antigo in glob.glob(glob.escape(prefixo) + "-*"):
+        if antigo not in manter:
+            try:
+                os.remove(antigo)
+            except OSError:
+                pass
+
+
+def concatenar(anterior, novo):
+    """
+    Acrescenta as linhas de `novo` ao fim de `anterior` (com índice
+    contínuo). As colunas categóricas de `anterior` continuam categóricas,
+    com as categorias novas no fim, na ordem em que aparecem.
+    """
+    novo = novo.copy(deep=False)
+    for col in anterior.columns:
+        if col in novo.columns and isinstance(anterior[col].dtype, pd.CategoricalDtype) and not isinstance(novo[col].dtype, pd.CategoricalDtype):
+            # Poucas linhas novas podem não ter sido convertidas em categóricas
+            novo[col] = novo[col].astype('category')
+    df = pd.concat([anterior, novo], ignore_index=True)
+    for col in anterior.columns:
+        if col in novo.columns and isinstance(anterior[col].dtype, pd.CategoricalDtype) and isinstance(novo[col].dtype, pd.CategoricalDtype):
+            # As categorias lidas do Feather podem ter outro dtype (ex: str do pyarrow)
+            partes = [pd.Categorical.from_codes(serie.cat.codes, categories=serie.cat.categories.astype(object)) for serie in (anterior[col], novo[col])]
+            categorias = pd.api.types.union_categoricals(partes)
+            df[col] = pd.Series(categorias, index=df.index, name=col)
+    df.attrs = dict(anterior.attrs)
+    return df
+
+
+def _caminho_manifesto(prefixo):
+    return f"{prefixo}.ingestao.json"
+
+
+def _gravar_manifesto(prefixo, caminho, caminho_cache, hash_origem):
+    """
+    Registra até onde o arquivo de origem já foi ingerido: o tamanho em
+    bytes, o hash desse prefixo, se ele termina em uma quebra de linha e o
+    cache com o DataFrame correspondente.
+    """
+    tamanho = os.path.getsize(caminho)
+    with open(caminho, 'rb') as f:
+        f.seek(max(tamanho - 1, 0))
+        termina_com_quebra = f.read(1) in (b'', b'\n')
+    manifesto = {'tamanho': tamanho, 'hash': hash_origem, 'quebra_final': termina_com_quebra, 'cache': os.path.basename(caminho_cache)}
+    temporario = f"{_caminho_manifesto(prefixo)}.tmp{os.getpid()}"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f)
+    os.replace(temporario, _caminho_manifesto(prefixo))
+
+
+def _carregar_incremental(caminho, carregador, prefixo, combinar):
+    """
+    Tenta carregar o arquivo a partir da última ingestão registrada no
+    manifesto. Se o arquivo só recebeu linhas no fim (o prefixo já ingerido
+    tem o mesmo hash), apenas as linhas novas passam pelo `carregador` e são
+    combinadas ao DataFrame do cache.
+
+    Returns:
+        O DataFrame, ou None quando o arquivo não é uma extensão do que foi
+        ingerido (o carregamento completo deve ser feito).
+    """
+    try:
+        with open(_caminho_manifesto(prefixo), encoding='utf-8') as f:
+            manifesto = json.load(f)
+    except (OSError, ValueError):
+        return None
+    caminho_cache = os.path.join(os.path.dirname(prefixo), manifesto['cache'])
+    if not os.path.exists(caminho_cache) or os.path.getsize(caminho) < manifesto['tamanho']:
+        return None
+
+    # Hash do prefixo já ingerido; o mesmo hash, continuado com o acréscimo,
+    # é o hash do arquivo inteiro
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        cabecalho = f.readline()
+        f.seek(0)
+        restante = manifesto['tamanho']
+        while restante:
+            bloco = f.read(min(TAMANHO_BLOCO, restante))
+            if not bloco:
+                return None
+            h.update(bloco)
+            restante -= len(bloco)
+        if h.hexdigest() != manifesto['hash']:
+            return None
+        acrescimo = f.read()
+
+    # Sem a quebra de linha final, o acréscimo precisa começar em uma linha
+    # nova; senão ele alterou a última linha já ingerida
+    if acrescimo and not manifesto['quebra_final'] and not acrescimo.startswith((b'\n', b'\r\n')):
+        return None
+    h.update(acrescimo)
+    hash_origem = h.hexdigest()
+
+    anterior = ler_tabela(caminho_cache)
+    anterior.attrs['hash_origem'] = manifesto['hash']
+    if not acrescimo.strip():
+        return anterior
+
+    # Só as linhas novas (com o cabeçalho) são lidas e limpas
+    temporario = f"{prefixo}.acrescimo{os.getpid()}{os.path.splitext(caminho)[1]}"
+    try:
+        with open(temporario, 'wb') as f:
+            f.write(cabecalho + acrescimo)
+        novo = carregador(temporario)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+    df = (combinar or concatenar)(anterior, novo)
+    caminho_cache = gravar_tabela(df, f"{prefixo}-{hash_origem}")
+    if caminho_cache:
+        remover_versoes_antigas(prefixo, {caminho_cache})
+        _gravar_manifesto(prefixo, caminho, caminho_cache, hash_origem)
+    print(f"{caminho}: {len(novo)} linhas novas acrescentadas às {len(anterior)} já carregadas.")
+
+    df.attrs['hash_origem'] = hash_origem
+    df.attrs['hash_anterior'] = manifesto['hash']
+    df.attrs['linhas_anteriores'] = len(anterior)
+    return df
+
+
+def _marcar_origem(df, prefixo):
+    """
+    Registra em `df.attrs` de onde o DataFrame veio (arquivo e carregador) e
+    quantas linhas ele tinha ao ser carregado. Filtros e fatias copiam os
+    attrs, então quem guarda resultados derivados do DataFrame compara
+    `attrs['linhas']` com `len(df)` para saber se recebeu os dados completos.
+    """
+    df.attrs['origem'] = os.path.basename(prefixo)
+    df.attrs['linhas'] = len(df)
+    return df
+
+
+def carregar_com_cache(caminho, carregador, versao=1, diretorio_cache=None, incremental=False, combinar=None):
+    """
+    Carrega um CSV através de `carregador`, reaproveitando um cache colunar.
+
+    Na primeira leitura, o DataFrame limpo retornado por `carregador(caminho)`
+    é gravado em disco (Feather). As próximas chamadas com o mesmo conteúdo de
+    arquivo e a mesma versão do normalizador carregam direto do cache, sem
+    reprocessar o CSV. O hash do arquivo fica em `df.attrs['hash_origem']`,
+    e a identidade do arquivo e do carregador em `df.attrs['origem']`.
+
+    Args:
+        caminho: O caminho do arquivo CSV de origem.
+        carregador: Função que recebe o caminho e retorna o DataFrame limpo.
+        versao: Versão do normalizador. Incremente sempre que a limpeza mudar.
+        diretorio_cache: Diretório do cache (padrão: assets/cache).
+        incremental: Se True, o arquivo é tratado como só de acréscimos: o
+            tamanho e o hash do trecho já ingerido ficam registrados e, quando
+            o arquivo cresce mantendo esse trecho, só as linhas novas são
+            lidas. O DataFrame recebe então `attrs['hash_anterior']` e
+            `attrs['linhas_anteriores']`, para que os agregados possam ser
+            atualizados apenas com as linhas novas.
+        combinar: Função `combinar(anterior, novo)` que junta o DataFrame do
+            cache às linhas novas (padrão: `concatenar`).
+
+    Returns:
+        O DataFrame limpo.
+    """
+    diretorio_cache = diretorio_cache or DIRETORIO_CACHE
+    os.makedirs(diretorio_cache, exist_ok=True)
+
+    # O hash do caminho absoluto separa arquivos de mesmo nome em diretórios diferentes
+    nome_arquivo = os.path.splitext(os.path.basename(caminho))[0]
+    local = hashlib.blake2b(os.path.abspath(caminho).encode('utf-8'), digest_size=4).hexdigest()
+    prefixo = os.path.join(diretorio_cache, f"{nome_arquivo}.{local}.{identidade_carregador(carregador, versao)}")
+    if incremental:
+        df = _carregar_incremental(caminho, carregador, prefixo, combinar)
+        if df is not None:
+            return _marcar_origem(df, prefixo)
+
+    hash_origem = hash_arquivo(caminho)
+    base_cache = f"{prefixo}-{hash_origem}"
+
+    for formato in ('feather', 'pkl'):
+        caminho_cache = f"{base_cache}.{formato}"
+        if os.path.exists(caminho_cache):
+            try:
+                df = ler_tabela(caminho_cache)
+                df.attrs['hash_origem'] = hash_origem
+                if incremental:
+                    _gravar_manifesto(prefixo, caminho, caminho_cache, hash_origem)
+                return _marcar_origem(df, prefixo)
+            except Exception as e:
+                print(f"Cache inválido em {caminho_cache}, recarregando o CSV: {e}")
+
+    df = carregador(caminho)
+    if df is None:
+        return df
+
+    caminho_cache = gravar_tabela(df, base_cache)
+    if caminho_cache:
+        remover_versoes_antigas(prefixo, {caminho_cache})
+        if incremental:
+            _gravar_manifesto(prefixo, caminho, caminho_cache, hash_origem)
+    df.attrs['hash_origem'] = hash_origem
+    return _marcar_origem(df, prefixo)
+
+
+def com_cache_colunar(versao=1, incremental=False, combinar=None):
+    """
+    Decorador que aplica `carregar_com_cache` a uma função de carregamento
+    no formato `carregador(caminho)`.
+    """
+    def decorador(carregador):
+        @functools.wraps(carregador)
+        def wrapper(caminho):
+            return carregar_com_cache(caminho, carregador, versao=versao, incremental=incremental, combinar=combinar)
+        return wrapper
+    return decorador
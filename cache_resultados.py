@@ -0,0 +1,126 @@
+import sys
+import hashlib
+import functools
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+# Limite padrão de memória ocupada pelos resultados guardados (64 MiB)
+LIMITE_BYTES = 64 * 1024 * 1024
+
+
+def impressao_digital(df):
+    """
+    Calcula a impressão digital de um DataFrame: formato, colunas, dtypes,
+    o hash do arquivo de origem (gravado em `df.attrs['hash_origem']` por
+    `carregar_com_cache`) e o hash de todas as linhas. Uma amostra não basta:
+    DataFrames que diferem só nas linhas fora dela teriam a mesma chave. O
+    custo é linear, mas pequeno perto das agregações guardadas.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode('utf-8'))
+    h.update(str(df.attrs.get('hash_origem', '')).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def tamanho_em_bytes(valor):
+    """
+    Estima a memória ocupada por um resultado (inclusive dentro de
+    dicionários, listas e tuplas e nos atributos de objetos, como os arrays
+    de uma `CurvaAcumulada` ou o heap de um `TopKIncremental`).
+    """
+    if isinstance(valor, (pd.DataFrame, pd.Series, pd.Index)):
+        uso = valor.memory_usage(deep=True)
+        return int(uso.sum() if isinstance(uso, pd.Series) else uso)
+    if isinstance(valor, np.ndarray):
+        return int(valor.nbytes)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(tamanho_em_bytes(k) + tamanho_em_bytes(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(tamanho_em_bytes(v) for v in valor)
+    if hasattr(valor, '__dict__') and not isinstance(valor, type):
+        return sys.getsizeof(valor) + tamanho_em_bytes(vars(valor))
+    return sys.getsizeof(valor)
+
+
+class CacheResultados:
+    """
+    Cache LRU de resultados limitado pela memória ocupada. Quando a soma dos
+    tamanhos passa de `limite_bytes`, os resultados usados há mais tempo são
+    descartados.
+    """
+
+    def __init__(self, limite_bytes=LIMITE_BYTES):
+        self.limite_bytes = limite_bytes
+        self.entradas = OrderedDict()  # chave -> (resultado, tamanho)
+        self.bytes_usados = 0
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave):
+        """
+        Retorna uma tupla (encontrado, resultado) e marca a entrada como a
+        mais recente.
+        """
+        if chave not in self.entradas:
+            self.falhas += 1
+            return False, None
+        self.entradas.move_to_end(chave)
+        self.acertos += 1
+        return True, self.entradas[chave][0]
+
+    def guardar(self, chave, resultado):
+        """
+        Guarda um resultado. Resultados maiores que o limite não são guardados.
+        """
+        tamanho = tamanho_em_bytes(resultado)
+        if tamanho > self.limite_bytes:
+            return
+        if chave in self.entradas:
+            self.bytes_usados -= self.entradas.pop(chave)[1]
+        self.entradas[chave] = (resultado, tamanho)
+        self.bytes_usados += tamanho
+        while self.bytes_usados > self.limite_bytes:
+            _, (_, tamanho_antigo) = self.entradas.popitem(last=False)
+            self.bytes_usados -= tamanho_antigo
+
+    def limpar(self):
+        self.entradas.clear()
+        self.bytes_usados = 0
+
+
+def com_cache_resultado(cache):
+    """
+    Decorador para funções de análise no formato `funcao(df, *args)`. O
+    resultado é guardado em `cache` com a chave (função, impressão digital do
+    DataFrame, argumentos): chamadas repetidas com os mesmos dados retornam o
+    resultado guardado, e um DataFrame recarregado com outro conteúdo gera
+    uma nova chave. Os argumentos extras devem ser hashable.
+
+    O resultado guardado é compartilhado entre as chamadas e não deve ser
+    alterado por quem o recebe.
+
+    A função decorada ganha o método `guardar(df, resultado, *args)`, para
+    registrar um resultado calculado por outro caminho (por exemplo, um
+    agregado atualizado só com as linhas novas de `df`).
+    """
+    def decorador(funcao):
+        def chave(df, args, kwargs):
+            return (funcao.__module__, funcao.__qualname__, impressao_digital(df), args, tuple(sorted(kwargs.items())))
+
+        @functools.wraps(funcao)
+        def wrapper(df, *args, **kwargs):
+            chave_resultado = chave(df, args, kwargs)
+            encontrado, resultado = cache.obter(chave_resultado)
+            if not encontrado:
+                resultado = funcao(df, *args, **kwargs)
+                cache.guardar(chave_resultado, resultado)
+            return resultado
+
+        def guardar(df, resultado, *args, **kwargs):
+            cache.guardar(chave(df, args, kwargs), resultado)
+
+        wrapper.guardar = guardar
+        return wrapper
+    return decorador
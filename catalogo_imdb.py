@@ -0,0 +1,291 @@
+import os
+import json
+import argparse
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from cache_colunar import DIRETORIO_CACHE, gravar_tabela, ler_tabela
+from conversao_colunar import ler_csv, normalizar_nome_coluna
+from parsers_imdb import extrair_movie_id, processar_filmes
+
+# Diretório com uma subpasta por ano (Data/1960, Data/1961, ...)
+DIRETORIO_IMDB = "./assets/datasets/raedaddala/imdb-movies-from-1960-to-2023/Data"
+
+# Loja colunar particionada por ano (assets/cache/imdb/ano=1995/imdb_movies.feather)
+DIRETORIO_LOJA = os.path.join(DIRETORIO_CACHE, "imdb")
+MANIFESTO = "manifesto.json"
+
+# Arquivos convertidos de cada partição anual. O merged_movies_data_AAAA.csv
+# é apenas a junção dos dois pela coluna "Movie Link", por isso não é
+# convertido: a visão mesclada é montada sob demanda em `carregar_imdb`.
+TIPO_FILMES = 'imdb_movies'
+TIPO_DETALHES = 'advanced_movies_details'
+TIPO_MESCLADO = 'merged_movies_data'
+TIPOS = (TIPO_FILMES, TIPO_DETALHES)
+
+# Chave da junção entre filmes e detalhes
+CHAVE = ['ano', 'movie_id']
+
+# Versão da conversão; incremente quando a limpeza das partições mudar
+VERSAO = 2
+
+
+def descobrir_particoes(diretorio=DIRETORIO_IMDB, tipos=TIPOS):
+    """
+    Localiza as partições anuais do dataset.
+
+    Returns:
+        Um dicionário {ano: {tipo: caminho_csv}}.
+    """
+    particoes = {}
+    for nome in sorted(os.listdir(diretorio)):
+        caminho_ano = os.path.join(diretorio, nome)
+        if not (nome.isdigit() and os.path.isdir(caminho_ano)):
+            continue
+        arquivos = {}
+        for tipo in tipos:
+            caminho = os.path.join(caminho_ano, f"{tipo}_{nome}.csv")
+            if os.path.isfile(caminho):
+                arquivos[tipo] = caminho
+        if arquivos:
+            particoes[int(nome)] = arquivos
+    return particoes
+
+
+def _chave(ano, tipo):
+    return f"{ano}/{tipo}"
+
+
+def _ler_manifesto(destino):
+    try:
+        with open(os.path.join(destino, MANIFESTO), 'r', encoding='utf-8') as f:
+            manifesto = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifesto.get('versao') != VERSAO:
+        return {}
+    return manifesto.get('particoes', {})
+
+
+def _gravar_manifesto(destino, particoes):
+    caminho = os.path.join(destino, MANIFESTO)
+    temporario = f"{caminho}.tmp{os.getpid()}"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump({'versao': VERSAO, 'particoes': particoes}, f, indent=1, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+def ler_particao_csv(ano, tipo, caminho_csv):
+    """
+    Lê o CSV de uma partição com os nomes de colunas normalizados e a chave
+    da junção (ano, movie_id), extraída do identificador tt do "Movie Link".
+    Nos detalhes, o link é descartado para não ser armazenado duas vezes.
+    """
+    df = ler_csv(caminho_csv)
+    df.columns = [normalizar_nome_coluna(col) for col in df.columns]
+    df.insert(0, 'movie_id', extrair_movie_id(df['movie_link']))
+    df.insert(0, 'ano', pd.Series(ano, index=df.index, dtype='int16'))
+    if tipo == TIPO_DETALHES:
+        df = df.drop(columns='movie_link')
+    return df
+
+
+def _converter_particao(tarefa):
+    """
+    Converte um CSV de uma partição para o formato colunar. Executada nos
+    processos do pool, por isso recebe e retorna apenas tipos simples.
+    """
+    ano, tipo, caminho_csv, destino = tarefa
+    df = ler_particao_csv(ano, tipo, caminho_csv)
+
+    pasta = os.path.join(destino, f"ano={ano}")
+    os.makedirs(pasta, exist_ok=True)
+    arquivo = gravar_tabela(df, os.path.join(pasta, tipo))
+    return ano, tipo, arquivo and os.path.relpath(arquivo, destino), len(df), list(df.columns)
+
+
+def consolidar(diretorio=DIRETORIO_IMDB, destino=DIRETORIO_LOJA, max_workers=None):
+    """
+    Converte as partições anuais para a loja colunar usando um pool de
+    processos. Apenas os CSVs novos ou alterados (tamanho/data de modificação)
+    desde a última consolidação são convertidos.
+
+    Returns:
+        A quantidade de arquivos convertidos.
+    """
+    os.makedirs(destino, exist_ok=True)
+    manifesto = _ler_manifesto(destino)
+
+    tarefas = []
+    estados = {}
+    for ano, arquivos in descobrir_particoes(diretorio).items():
+        for tipo, caminho_csv in arquivos.items():
+            estado = os.stat(caminho_csv)
+            estados[_chave(ano, tipo)] = {'tamanho': estado.st_size, 'mtime_ns': estado.st_mtime_ns}
+            registro = manifesto.get(_chave(ano, tipo))
+            if (registro and registro['tamanho'] == estado.st_size
+                    and registro['mtime_ns'] == estado.st_mtime_ns
+                    and os.path.exists(os.path.join(destino, registro['arquivo']))):
+                continue
+            tarefas.append((ano, tipo, caminho_csv, destino))
+
+    if tarefas:
+        # Os arquivos são pequenos: enviar vários por vez reduz o custo de comunicação
+        chunksize = max(1, len(tarefas) // (4 * (max_workers or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for ano, tipo, arquivo, linhas, colunas in executor.map(_converter_particao, tarefas, chunksize=chunksize):
+                if arquivo:
+                    manifesto[_chave(ano, tipo)] = {**estados[_chave(ano, tipo)], 'arquivo': arquivo, 'linhas': linhas, 'colunas': colunas}
+
+    # Remove as partições cujo CSV não existe mais
+    for chave in [chave for chave in manifesto if chave not in estados]:
+        arquivo = os.path.join(destino, manifesto.pop(chave)['arquivo'])
+        if os.path.exists(arquivo):
+            os.remove(arquivo)
+    _gravar_manifesto(destino, manifesto)
+    return len(tarefas)
+
+
+def anos_disponiveis(tipo=TIPO_FILMES, destino=DIRETORIO_LOJA):
+    """
+    Retorna os anos presentes na loja colunar para o tipo de arquivo informado.
+    """
+    return sorted(int(chave.split('/')[0]) for chave in _ler_manifesto(destino) if chave.endswith(f"/{tipo}"))
+
+
+def _carregar_particoes(manifesto, tipo, ano_inicio, ano_fim, colunas, destino):
+    """
+    Concatena as partições de um tipo dentro do intervalo de anos, lendo
+    apenas as colunas pedidas (None para todas).
+    """
+    partes = []
+    for chave, registro in sorted(manifesto.items()):
+        ano, tipo_particao = chave.split('/')
+        ano = int(ano)
+        if tipo_particao != tipo:
+            continue
+        if (ano_inicio is not None and ano < ano_inicio) or (ano_fim is not None and ano > ano_fim):
+            continue
+        partes.append(ler_tabela(os.path.join(destino, registro['arquivo']), colunas))
+
+    if not partes:
+        return pd.DataFrame(columns=colunas)
+    return pd.concat(partes, ignore_index=True)
+
+
+def _colunas_do_tipo(manifesto, tipo):
+    for chave, registro in manifesto.items():
+        if chave.endswith(f"/{tipo}"):
+            return registro.get('colunas', [])
+    return []
+
+
+def carregar_imdb(tipo=TIPO_MESCLADO, ano_inicio=None, ano_fim=None, colunas=None, destino=DIRETORIO_LOJA):
+    """
+    Carrega os filmes da loja colunar abrindo somente as partições dentro do
+    intervalo de anos pedido.
+
+    Para o tipo 'merged_movies_data', os filmes e os detalhes são lidos
+    separadamente e unidos por uma junção hash (left join) na chave
+    (ano, movie_id), reproduzindo o arquivo merged_movies_data_AAAA.csv.
+
+    Args:
+        tipo: 'imdb_movies', 'advanced_movies_details' ou 'merged_movies_data'.
+        ano_inicio: Primeiro ano (inclusive). None para sem limite.
+        ano_fim: Último ano (inclusive). None para sem limite.
+        colunas: Lista de colunas a ler. None para todas.
+        destino: Diretório da loja colunar.
+
+    Returns:
+        Um DataFrame com as partições selecionadas concatenadas.
+    """
+    manifesto = _ler_manifesto(destino)
+    if not manifesto:
+        consolidar(destino=destino)
+        manifesto = _ler_manifesto(destino)
+
+    if tipo != TIPO_MESCLADO:
+        if colunas is not None:
+            colunas = CHAVE + [col for col in colunas if col not in CHAVE]
+        return _carregar_particoes(manifesto, tipo, ano_inicio, ano_fim, colunas, destino)
+
+    colunas_filmes = colunas_detalhes = None
+    if colunas is not None:
+        # Cada coluna pedida é lida apenas da tabela que a contém
+        colunas_filmes = CHAVE + [col for col in colunas if col in _colunas_do_tipo(manifesto, TIPO_FILMES) and col not in CHAVE]
+        colunas_detalhes = CHAVE + [col for col in colunas if col in _colunas_do_tipo(manifesto, TIPO_DETALHES) and col not in colunas_filmes]
+
+    filmes = _carregar_particoes(manifesto, TIPO_FILMES, ano_inicio, ano_fim, colunas_filmes, destino)
+    if colunas_detalhes == CHAVE:
+        return filmes
+    detalhes = _carregar_particoes(manifesto, TIPO_DETALHES, ano_inicio, ano_fim, colunas_detalhes, destino)
+    return filmes.merge(detalhes, on=CHAVE, how='left')
+
+
+def carregar_filmes(tipo=TIPO_MESCLADO, ano_inicio=None, ano_fim=None, colunas=None, destino=DIRETORIO_LOJA):
+    """
+    Carrega os filmes da loja colunar (veja `carregar_imdb`) e converte as
+    colunas em texto com `processar_filmes`.
+
+    Returns:
+        Uma tupla (filmes, listas), como em `processar_filmes`.
+    """
+    return processar_filmes(carregar_imdb(tipo, ano_inicio, ano_fim, colunas, destino))
+
+
+def juntar_lista(filmes, tabela, colunas=None):
+    """
+    Junta uma tabela de lista de `carregar_filmes` (ex: listas['genres']) às
+    `colunas` dos filmes pela chave (ano, movie_id), já que o mesmo movie_id
+    pode aparecer em mais de uma partição.
+    """
+    colunas = [col for col in (colunas or filmes.columns) if col not in CHAVE]
+    return tabela.merge(filmes[CHAVE + colunas], on=CHAVE, how='left')
+
+
+def validar_mesclado(ano_inicio=None, ano_fim=None, diretorio=DIRETORIO_IMDB, destino=DIRETORIO_LOJA):
+    """
+    Compara a visão mesclada com os arquivos merged_movies_data_AAAA.csv
+    distribuídos com o dataset.
+
+    Returns:
+        A lista de anos em que a visão mesclada diverge do arquivo original.
+    """
+    divergentes = []
+    for ano, arquivos in descobrir_particoes(diretorio, tipos=(TIPO_MESCLADO,)).items():
+        if (ano_inicio is not None and ano < ano_inicio) or (ano_fim is not None and ano > ano_fim):
+            continue
+        original = ler_particao_csv(ano, TIPO_MESCLADO, arquivos[TIPO_MESCLADO])
+        visao = carregar_imdb(TIPO_MESCLADO, ano, ano, destino=destino)
+        try:
+            pd.testing.assert_frame_equal(visao[original.columns], original, check_dtype=False)
+        except (AssertionError, KeyError) as e:
+            print(f"Divergência em {ano}: {e}")
+            divergentes.append(ano)
+    return divergentes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catálogo particionado por ano do dataset IMDB (1960-2024).")
+    parser.add_argument("-consolidar", dest="consolidar", action="store_true", help="Converte os CSVs novos ou alterados para a loja colunar")
+    parser.add_argument("-validar", dest="validar", action="store_true", help="Compara a visão mesclada com os arquivos merged_movies_data originais")
+    parser.add_argument("-tipo", dest="tipo", default=TIPO_MESCLADO, help="Tipo de arquivo (imdb_movies, advanced_movies_details, merged_movies_data)")
+    parser.add_argument("-inicio", dest="inicio", type=int, help="Primeiro ano da consulta (ex: 1990)")
+    parser.add_argument("-fim", dest="fim", type=int, help="Último ano da consulta (ex: 2000)")
+    args = parser.parse_args()
+
+    if args.consolidar:
+        convertidos = consolidar()
+        print(f"Partições convertidas: {convertidos}")
+
+    if args.validar:
+        divergentes = validar_mesclado(args.inicio, args.fim)
+        print("Visão mesclada idêntica aos arquivos originais." if not divergentes else f"Anos divergentes: {divergentes}")
+
+    df, listas = carregar_filmes(args.tipo, args.inicio, args.fim)
+    print(f"{len(df)} filmes carregados de {df['ano'].nunique() if len(df) else 0} partições.")
+    for coluna, tabela in listas.items():
+        print(f"  {coluna}: {len(tabela)} itens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+# Código usado para os valores ausentes ou desconhecidos (ex: "Not Available")
+AUSENTE = np.int8(-128)
+
+
+def _normalizar(valor):
+    return str(valor).strip().casefold()
+
+
+def codificar_ordinal(serie, mapa):
+    """
+    Converte uma coluna de texto em códigos int8 a partir de `mapa`
+    ({texto: código}), sem diferenciar maiúsculas de minúsculas nem espaços
+    nas pontas. Valores ausentes ou fora do mapa recebem `AUSENTE`.
+
+    Apenas os valores distintos são comparados com o mapa (via factorize); o
+    resultado é espalhado para as linhas com uma indexação do NumPy.
+
+    Returns:
+        Uma série int8 com o mesmo índice de `serie`.
+    """
+    mapa = {_normalizar(texto): codigo for texto, codigo in mapa.items()}
+    codigos, valores = pd.factorize(serie)
+    tabela = np.array([mapa.get(_normalizar(valor), AUSENTE) for valor in valores] + [AUSENTE], dtype=np.int8)
+    # O código -1 do factorize (ausente) pega a última posição da tabela
+    return pd.Series(tabela[codigos], index=serie.index, name=serie.name)
+
+
+def codificar_numerico(serie, minimo=-127, maximo=127):
+    """
+    Converte uma coluna com números em texto (ex: avaliação de '1' a '5' ou
+    'Not Available') em códigos int8. Valores não numéricos, não inteiros ou
+    fora de [minimo, maximo] recebem `AUSENTE`.
+    """
+    codigos, valores = pd.factorize(serie)
+    numeros = pd.to_numeric(pd.Series(valores, dtype=object).astype(str), errors='coerce').to_numpy(dtype=np.float64)
+    validos = (numeros == np.round(numeros)) & (numeros >= minimo) & (numeros <= maximo)
+    tabela = np.append(np.where(validos, numeros, AUSENTE), AUSENTE).astype(np.int8)
+    return pd.Series(tabela[codigos], index=serie.index, name=serie.name)
+
+
+def mascara_presentes(codigos):
+    """
+    Máscara dos códigos diferentes de `AUSENTE`.
+    """
+    return np.asarray(codigos) != AUSENTE
@@ -0,0 +1,165 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from selecao_top_k import posicoes_top_k
+
+# Registro das colunas derivadas: nome -> (colunas de entrada, função)
+DERIVADAS = {}
+
+
+def derivada(nome, entradas):
+    """
+    Decorador que registra uma coluna derivada. A função recebe os valores
+    das colunas de `entradas` como arrays NumPy (na mesma ordem) e retorna o
+    array da coluna, calculado de forma vetorizada. As entradas podem ser
+    outras colunas derivadas.
+    """
+    def decorador(funcao):
+        DERIVADAS[nome] = (tuple(entradas), funcao)
+        return funcao
+    return decorador
+
+
+def _razao(numerador, denominador):
+    numerador = np.asarray(numerador, dtype=np.float64)
+    denominador = np.asarray(denominador, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominador > 0, numerador / denominador, np.nan)
+
+
+# Colunas derivadas dos dados demográficos dos condados
+@derivada('hispanic_percentage', ['hispanic_or_latino', 'total_population'])
+def percentual_hispanico(hispanicos, populacao):
+    return _razao(hispanicos, populacao) * 100
+
+
+@derivada('male_ratio', ['male_population', 'female_population'])
+def razao_homens(homens, mulheres):
+    # Homens por mulher
+    return _razao(homens, mulheres)
+
+
+@derivada('white_alone_share', ['white_alone', 'total_race_responses'])
+def participacao_brancos(brancos, respostas):
+    # Fração (0 a 1) das respostas de raça
+    return _razao(brancos, respostas)
+
+
+def _impressao_coluna(serie):
+    """
+    Impressão digital de uma coluna: tamanho, dtype e o hash de todos os
+    valores (com o índice). Qualquer valor alterado muda a impressão.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((len(serie), str(serie.dtype))).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(serie, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class ColunasDerivadas:
+    """
+    Acesso preguiçoso às colunas derivadas (veja `derivada`) de um DataFrame.
+
+    Cada coluna é calculada na primeira vez que é usada e guardada junto com
+    as colunas de entrada; os acessos seguintes não recalculam nada, a menos
+    que a impressão digital de alguma entrada mude (veja `_impressao_coluna`).
+    A impressão cobre todas as linhas: cada acesso percorre as entradas uma
+    vez para o hash, e qualquer alteração nelas é detectada. `invalidar`
+    descarta resultados explicitamente, por exemplo para liberar memória. O DataFrame
+    de origem nunca é alterado: as colunas derivadas vivem apenas no cache e
+    os arrays retornados são somente leitura.
+    """
+
+    def __init__(self, df, registro=None):
+        self.df = df
+        self.registro = DERIVADAS if registro is None else registro
+        self.cache = {}  # chave -> (entradas, impressões das entradas, resultado)
+        self.calculos = 0
+
+    def _entrada(self, nome):
+        if nome in self.registro:
+            return pd.Series(self.valores(nome), index=self.df.index, name=nome, copy=False)
+        return self.df[nome]
+
+    def _guardado(self, chave, entradas, calcular):
+        """
+        Retorna o resultado guardado em `chave` se as `entradas` não mudaram;
+        senão chama `calcular(*series_das_entradas)` e guarda o resultado.
+        """
+        series = [self._entrada(nome) for nome in entradas]
+        impressoes = [_impressao_coluna(serie) for serie in series]
+        if chave in self.cache:
+            _, guardadas, resultado = self.cache[chave]
+            if impressoes == guardadas:
+                return resultado
+        resultado = calcular(*series)
+        if isinstance(resultado, np.ndarray):
+            resultado.setflags(write=False)
+        self.cache[chave] = (tuple(entradas), impressoes, resultado)
+        self.calculos += 1
+        return resultado
+
+    def invalidar(self, colunas=None):
+        """
+        Descarta os resultados guardados que dependem das `colunas` (direta ou
+        indiretamente, por outras derivadas), ou todos quando None.
+        """
+        if colunas is None:
+            self.cache.clear()
+            return
+        alteradas = set(colunas)
+        while True:
+            dependentes = {chave for chave, (entradas, _, _) in self.cache.items()
+                           if alteradas.intersection(entradas)}
+            if not dependentes:
+                return
+            for chave in dependentes:
+                if chave[0] == 'coluna':
+                    alteradas.add(chave[1])
+                del self.cache[chave]
+
+    def valores(self, nome):
+        """
+        Array NumPy (somente leitura) da coluna derivada `nome`.
+        """
+        entradas, funcao = self.registro[nome]
+        return self._guardado(('coluna', nome), entradas,
+                              lambda *series: np.asarray(funcao(*[serie.to_numpy() for serie in series])))
+
+    def __getitem__(self, nome):
+        """
+        A coluna `nome` como série, derivada ou original.
+        """
+        return self._entrada(nome)
+
+    def com(self, *nomes):
+        """
+        Um novo DataFrame com as colunas originais e as derivadas `nomes`.
+        """
+        return self.df.assign(**{nome: self[nome] for nome in nomes})
+
+    def somas(self, colunas):
+        """
+        Soma de cada coluna (derivada ou original), guardada até que alguma
+        delas mude.
+        """
+        colunas = tuple(colunas)
+        return self._guardado(('somas', colunas), colunas,
+                              lambda *series: pd.Series({serie.name: serie.sum() for serie in series})).copy()
+
+    def maiores(self, nome, k, colunas=()):
+        """
+        As `k` linhas com os maiores valores de `nome` (valores ausentes no
+        fim), com as `colunas` pedidas e a própria coluna `nome`. A seleção
+        é parcial (veja `posicoes_top_k`) e guardada até que alguma entrada
+        mude.
+        """
+        colunas = tuple(colunas)
+
+        def calcular(valores, *series):
+            ordem = posicoes_top_k(valores.to_numpy(dtype=np.float64), k)
+            resultado = pd.DataFrame({serie.name: serie.to_numpy()[ordem] for serie in series})
+            resultado[nome] = valores.to_numpy()[ordem]
+            return resultado
+
+        return self._guardado(('maiores', nome, k, colunas), (nome,) + colunas, calcular).copy()
@@ -0,0 +1,208 @@
+import os
+import re
+import json
+import hashlib
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from unidecode import unidecode
+from cache_colunar import DIRETORIO_CACHE
+from deteccao_encoding import read_csv_com_encoding
+
+# Compressão usada nos arquivos Feather convertidos
+COMPRESSAO = 'zstd'
+
+# Versão da conversão; incremente quando o formato dos arquivos mudar
+VERSAO = 2
+
+# Os arquivos convertidos e os seus esquemas ficam no cache, fora dos datasets
+DIRETORIO_CONVERTIDOS = os.path.join(DIRETORIO_CACHE, "convertidos")
+
+
+def normalizar_nome_coluna(nome):
+    """
+    Converte o nome da coluna para snake_case, sem acentos e caracteres especiais.
+    """
+    nome = unidecode(nome)
+    nome = re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', nome)
+    nome = re.sub(r'[^a-z0-9_]', '_', nome.lower())
+    nome = re.sub(r'[_]+', '_', nome)
+    return nome.strip('_')
+
+
+def caminho_convertido(caminho_csv):
+    """
+    Retorna os caminhos do arquivo convertido e do seu esquema, no cache
+    (dados.csv -> dados.<hash do caminho>.feather e .esquema.json).
+    """
+    chave = hashlib.blake2b(os.path.abspath(caminho_csv).encode('utf-8'), digest_size=16).hexdigest()
+    base = os.path.join(DIRETORIO_CONVERTIDOS, f"{os.path.splitext(os.path.basename(caminho_csv))[0]}.{chave}")
+    return f"{base}.feather", f"{base}.esquema.json"
+
+
+def _gravar_json(caminho, dados):
+    temporario = f"{caminho}.tmp{os.getpid()}"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, indent=1, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+
+def ler_esquema(caminho_csv):
+    """
+    Lê o esquema do arquivo convertido de um CSV.
+
+    Returns:
+        O dicionário do esquema, ou None se o arquivo não foi convertido ou se
+        o CSV mudou desde a conversão.
+    """
+    caminho_feather, caminho_esquema = caminho_convertido(caminho_csv)
+    try:
+        with open(caminho_esquema, 'r', encoding='utf-8') as f:
+            esquema = json.load(f)
+        estado = os.stat(caminho_csv)
+    except (OSError, ValueError):
+        return None
+    if (esquema.get('versao') != VERSAO or esquema.get('tamanho') != estado.st_size
+            or esquema.get('mtime_ns') != estado.st_mtime_ns or not os.path.exists(caminho_feather)):
+        return None
+    return esquema
+
+
+def converter_csv(caminho_csv):
+    """
+    Converte um CSV para Feather comprimido, com os nomes de colunas
+    originais (cada script aplica a sua própria normalização), e grava o
+    esquema ao lado (nome e dtype de cada coluna), ambos no cache (veja
+    `caminho_convertido`). O CSV só é convertido de novo quando muda.
+
+    Returns:
+        Uma tupla (caminho_csv, convertido), onde `convertido` indica se o
+        arquivo precisou ser convertido.
+    """
+    if ler_esquema(caminho_csv) is not None:
+        return caminho_csv, False
+
+    estado = os.stat(caminho_csv)
+    df = read_csv_com_encoding(caminho_csv)
+
+    caminho_feather, caminho_esquema = caminho_convertido(caminho_csv)
+    os.makedirs(DIRETORIO_CONVERTIDOS, exist_ok=True)
+    temporario = f"{caminho_feather}.tmp{os.getpid()}"
+    df.to_feather(temporario, compression=COMPRESSAO)
+    os.replace(temporario, caminho_feather)
+
+    _gravar_json(caminho_esquema, {
+        'versao': VERSAO,
+        'tamanho': estado.st_size,
+        'mtime_ns': estado.st_mtime_ns,
+        'linhas': len(df),
+        'colunas': [
+            {'nome': nome, 'dtype': str(dtype)}
+            for nome, dtype in zip(df.columns, df.dtypes)
+        ],
+    })
+    return caminho_csv, True
+
+
+def listar_csvs(diretorio):
+    """
+    Lista recursivamente os arquivos CSV de um diretório.
+    """
+    return sorted(
+        os.path.join(raiz, nome)
+        for raiz, _, nomes in os.walk(diretorio)
+        for nome in nomes if nome.lower().endswith('.csv')
+    )
+
+
+def converter_datasets(diretorios, max_workers=None):
+    """
+    Converte os CSVs dos diretórios informados em um pool de processos, um
+    arquivo por tarefa.
+
+    Returns:
+        Um dicionário com as listas 'convertidos', 'ignorados' e 'falhas'
+        (esta com tuplas (caminho, erro)).
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("A conversão para Feather exige o pyarrow; os CSVs serão lidos diretamente.")
+        return {'convertidos': [], 'ignorados': [], 'falhas': []}
+
+    arquivos = [caminho for diretorio in diretorios for caminho in listar_csvs(diretorio)]
+    resumo = {'convertidos': [], 'ignorados': [], 'falhas': []}
+    if not arquivos:
+        return resumo
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        tarefas = {executor.submit(converter_csv, caminho): caminho for caminho in arquivos}
+        for tarefa, caminho in tarefas.items():
+            try:
+                _, convertido = tarefa.result()
+            except Exception as e:
+                resumo['falhas'].append((caminho, str(e)))
+                continue
+            resumo['convertidos' if convertido else 'ignorados'].append(caminho)
+
+    print(f"Conversão para Feather: {len(resumo['convertidos'])} convertidos, "
+          f"{len(resumo['ignorados'])} já atualizados, {len(resumo['falhas'])} falhas.")
+    for caminho, erro in resumo['falhas']:
+        print(f"  Falha ao converter '{caminho}': {erro}")
+    return resumo
+
+
+def ler_convertido(caminho_csv, colunas=None):
+    """
+    Lê o arquivo convertido de um CSV, se existir e estiver atualizado.
+
+    As colunas têm os nomes originais do CSV, para que cada script continue
+    aplicando a sua própria normalização.
+
+    Args:
+        caminho_csv: O caminho do CSV de origem.
+        colunas: Lista de colunas a ler. None para todas.
+
+    Returns:
+        O DataFrame, ou None quando não há arquivo convertido válido.
+
+    Raises:
+        ValueError: Se alguma das `colunas` não existir no CSV.
+    """
+    esquema = ler_esquema(caminho_csv)
+    if esquema is None:
+        return None
+
+    if colunas is not None:
+        existentes = {coluna['nome'] for coluna in esquema['colunas']}
+        ausentes = [col for col in colunas if col not in existentes]
+        if ausentes:
+            raise ValueError(f"Colunas não encontradas em '{caminho_csv}': {ausentes}")
+    try:
+        df = pd.read_feather(caminho_convertido(caminho_csv)[0], columns=colunas)
+    except Exception as e:
+        print(f"Arquivo convertido inválido para {caminho_csv}, lendo o CSV: {e}")
+        return None
+    return df
+
+
+def ler_csv(caminho, **kwargs):
+    """
+    Lê um CSV dando preferência ao arquivo convertido por `converter_csv`.
+    Quando não há arquivo convertido, ou quando são usados parâmetros do
+    `read_csv` que não se aplicam ao Feather, o CSV é lido normalmente.
+
+    Args:
+        caminho: O caminho do arquivo CSV.
+        **kwargs: Parâmetros do `read_csv`. Apenas `usecols` (lista de nomes)
+            e `encoding` são aceitos na leitura do arquivo convertido.
+
+    Returns:
+        O DataFrame.
+    """
+    if set(kwargs) <= {'usecols', 'encoding'}:
+        df = ler_convertido(caminho, colunas=kwargs.get('usecols'))
+        if df is not None:
+            return df
+    if 'encoding' in kwargs:
+        return pd.read_csv(caminho, **kwargs)
+    return read_csv_com_encoding(caminho, **kwargs)
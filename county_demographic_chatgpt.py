@@ -2,6 +2,9 @@ import pygame
 import pandas as pd
 import unicodedata
 import matplotlib.pyplot as plt
+from cache_colunar import com_cache_colunar
+from colunas_derivadas import ColunasDerivadas
+from inferencia_tipos import read_csv_otimizado
 
 
 def normalize_column_names(columns):
@@ -13,8 +16,9 @@ def normalize_column_names(columns):
     return [normalize(col) for col in columns]
 
 
+@com_cache_colunar(versao=2)
 def load_data(file_path):
-    df = pd.read_csv(file_path)
+    df = read_csv_otimizado(file_path)
     df.columns = normalize_column_names(df.columns)
     return df
 
@@ -25,23 +29,22 @@ def show_plot(plot_func):
 
 
 def plot_population_distribution():
-    df[['male_population', 'female_population']].sum().plot(
+    derivadas.somas(['male_population', 'female_population']).plot(
         kind='bar', color=['blue', 'pink'])
     plt.title("Distribuição da População por Gênero")
     plt.ylabel("População")
 
 
 def plot_race_comparison():
-    df[['white_alone', 'black_or_african_american_alone',
-        'hispanic_or_latino']].sum().plot(kind='bar')
+    derivadas.somas(['white_alone', 'black_or_african_american_alone',
+                     'hispanic_or_latino']).plot(kind='bar')
     plt.title("Distribuição por Raça")
     plt.ylabel("População")
 
 
 def plot_hispanic_percentage():
-    df['hispanic_percentage'] = (
-        df['hispanic_or_latino'] / df['total_population']) * 100
-    df.sort_values('hispanic_percentage', ascending=False).head(20).plot(
+    # Calculado e ordenado só no primeiro clique, sem alterar o df
+    derivadas.maiores('hispanic_percentage', 20, ['county']).plot(
         x='county', y='hispanic_percentage', kind='bar', color='orange')
     plt.title("Percentual de Hispânicos/Latinos nos 20 principais condados")
     plt.ylabel("% da População")
@@ -100,4 +103,5 @@ def main():
 
 if __name__ == "__main__":
     df = load_data("./assets/datasets/ahmedmohamed2003/county-level-demographic-population-race-gender/demographic_data.csv")  # Substitua pelo caminho do arquivo
+    derivadas = ColunasDerivadas(df)
     main()
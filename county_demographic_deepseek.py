@@ -3,6 +3,9 @@ import pygame
 import sys
 import matplotlib.pyplot as plt
 from unidecode import unidecode
+from cache_colunar import com_cache_colunar
+from colunas_derivadas import ColunasDerivadas
+from inferencia_tipos import read_csv_otimizado
 
 # Função para normalizar os nomes das colunas
 
@@ -17,8 +20,9 @@ def normalize_column_name(column_name):
 # Carregar o arquivo CSV
 
 
+@com_cache_colunar(versao=2)
 def load_csv(file_path):
-    df = pd.read_csv(file_path)
+    df = read_csv_otimizado(file_path)
     # Normalizar os nomes das colunas
     df.columns = [normalize_column_name(col) for col in df.columns]
     return df
@@ -34,22 +38,31 @@ def show_descriptive_stats(df):
 # Função para plotar gráficos
 
 
-def plot_gender_distribution(df):
-    df[['male_population', 'female_population']].sum().plot(
+def plot_gender_distribution(derivadas):
+    derivadas.somas(['male_population', 'female_population']).plot(
         kind='bar', color=['blue', 'pink'])
     plt.title('Distribuição de Gênero')
     plt.ylabel('População')
     plt.show()
 
 
-def plot_racial_distribution(df):
-    df[['white_alone', 'black_or_african_american_alone', 'hispanic_or_latino']
-       ].sum().plot(kind='bar', color=['gray', 'black', 'orange'])
+def plot_racial_distribution(derivadas):
+    derivadas.somas(['white_alone', 'black_or_african_american_alone', 'hispanic_or_latino']
+                    ).plot(kind='bar', color=['gray', 'black', 'orange'])
     plt.title('Distribuição Racial')
     plt.ylabel('População')
     plt.show()
 
 
+def plot_male_ratio(derivadas):
+    derivadas.maiores('male_ratio', 20, ['county']).plot(
+        x='county', y='male_ratio', kind='bar', color='blue', legend=False)
+    plt.title('Condados com Mais Homens por Mulher')
+    plt.ylabel('Homens por Mulher')
+    plt.tight_layout()
+    plt.show()
+
+
 # Inicializar o Pygame
 pygame.init()
 
@@ -82,12 +95,15 @@ def draw_button(text, x, y, width, height, color):
 def main():
     # Substitua pelo caminho do seu arquivo CSV
     df = load_csv("./assets/datasets/ahmedmohamed2003/county-level-demographic-population-race-gender/demographic_data.csv")
+    derivadas = ColunasDerivadas(df)
 
     buttons = [
         {"text": "Distribuição de Gênero",
-            "action": lambda: plot_gender_distribution(df)},
+            "action": lambda: plot_gender_distribution(derivadas)},
         {"text": "Distribuição Racial",
-            "action": lambda: plot_racial_distribution(df)},
+            "action": lambda: plot_racial_distribution(derivadas)},
+        {"text": "Homens por Mulher",
+            "action": lambda: plot_male_ratio(derivadas)},
         {"text": "Estatísticas Descritivas",
             "action": lambda: show_descriptive_stats(df)},
     ]
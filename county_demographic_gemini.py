@@ -4,6 +4,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import io
 import sys
+from cache_colunar import com_cache_colunar
+from colunas_derivadas import ColunasDerivadas
+from selecao_top_k import top_k, top_k_linhas, top_k_por_grupo
+from inferencia_tipos import read_csv_otimizado
 
 # Função para limpar e padronizar os nomes das colunas
 def clean_column_names(df):
@@ -28,16 +32,19 @@ def clean_column_names(df):
     return df
 
 # Carregar o arquivo CSV
+@com_cache_colunar(versao=2)
+def load_csv(file_path):
+    df = read_csv_otimizado(file_path)
+    return clean_column_names(df)
+
 try:
-    df = pd.read_csv("./assets/datasets/ahmedmohamed2003/county-level-demographic-population-race-gender/demographic_data.csv", encoding='utf-8')
-except UnicodeDecodeError:
-    try:
-        df = pd.read_csv("data.csv", encoding='latin1')
-    except Exception as e:
-        print(f"Erro ao ler o arquivo CSV: {e}")
-        sys.exit()
+    df = load_csv("./assets/datasets/ahmedmohamed2003/county-level-demographic-population-race-gender/demographic_data.csv")
+except Exception as e:
+    print(f"Erro ao ler o arquivo CSV: {e}")
+    sys.exit()
 
-df = clean_column_names(df)
+# Colunas derivadas e somas calculadas sob demanda, sem alterar o df
+derivadas = ColunasDerivadas(df)
 
 # Inicializar o Pygame
 pygame.init()
@@ -64,7 +71,7 @@ title_rect = title_text.get_rect(center=(screen_width // 2, 50))
 
 def plot_population_by_state():
     plt.figure(figsize=(12, 6))
-    population_by_state = df.groupby('state')['total_population'].sum().sort_values(ascending=False).head(10)
+    population_by_state = top_k(df.groupby('state', observed=True)['total_population'].sum(), 10)
     sns.barplot(x=population_by_state.index, y=population_by_state.values, palette="viridis")
     plt.title('Top 10 Estados por População Total')
     plt.xlabel('Estado')
@@ -82,7 +89,7 @@ def plot_population_by_state():
 
 def plot_gender_distribution():
     plt.figure(figsize=(8, 6))
-    gender_counts = [df['male_population'].sum(), df['female_population'].sum()]
+    gender_counts = derivadas.somas(['male_population', 'female_population']).to_list()
     plt.pie(gender_counts, labels=['Masculino', 'Feminino'], autopct='%1.1f%%', colors=['skyblue', 'lightcoral'])
     plt.title('Distribuição de Gênero')
     plt.tight_layout()
@@ -98,7 +105,7 @@ def plot_gender_distribution():
 def plot_race_distribution():
     plt.figure(figsize=(10, 6))
     race_columns = ['white_alone', 'black_or_african_american_alone', 'hispanic_or_latino']
-    race_sums = df[race_columns].sum()
+    race_sums = derivadas.somas(race_columns)
     sns.barplot(x=race_sums.index, y=race_sums.values, palette="Set2")
     plt.title('Distribuição de Raça')
     plt.xlabel('Raça')
@@ -116,7 +123,7 @@ def plot_race_distribution():
 
 def plot_top_counties_by_population():
     plt.figure(figsize=(12, 6))
-    top_counties = df.sort_values('total_population', ascending=False).head(10)
+    top_counties = top_k_linhas(df, 'total_population', 10)
     sns.barplot(x='county', y='total_population', hue='state', data=top_counties, dodge=False, palette="magma")
     plt.title('Top 10 Condados por População Total')
     plt.xlabel('Condado')
@@ -133,6 +140,47 @@ def plot_top_counties_by_population():
     buf.close()
     return image
 
+def plot_largest_county_share_by_state():
+    plt.figure(figsize=(12, 6))
+    # Condado mais populoso de cada estado, sem ordenar todos os condados
+    maiores = top_k_por_grupo(df, 'state', 'total_population', 1)
+    populacao_estado = df.groupby('state', observed=True)['total_population'].sum()
+    participacao = maiores.set_index('state')['total_population'] / populacao_estado.reindex(maiores['state']).to_numpy() * 100
+    participacao = top_k(participacao, 15)
+    sns.barplot(x=participacao.index.astype(str), y=participacao.values, palette="flare")
+    plt.title('Estados Mais Concentrados: % da População no Maior Condado')
+    plt.xlabel('Estado')
+    plt.ylabel('% da População do Estado')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+
+    # Converte o gráfico para uma superfície Pygame
+    buf = io.BytesIO()
+    plt.savefig(buf, format='png')
+    buf.seek(0)
+    image = pygame.image.load(buf)
+    buf.close()
+    return image
+
+def plot_top_counties_by_white_share():
+    plt.figure(figsize=(12, 6))
+    top_counties = derivadas.maiores('white_alone_share', 10, ['county', 'state'])
+    sns.barplot(x='county', y='white_alone_share', hue='state', data=top_counties, dodge=False, palette="crest")
+    plt.title('Top 10 Condados por Participação de Brancos')
+    plt.xlabel('Condado')
+    plt.ylabel('Participação nas Respostas de Raça')
+    plt.xticks(rotation=45)
+    plt.legend([],[], frameon=False)
+    plt.tight_layout()
+
+    # Converte o gráfico para uma superfície Pygame
+    buf = io.BytesIO()
+    plt.savefig(buf, format='png')
+    buf.seek(0)
+    image = pygame.image.load(buf)
+    buf.close()
+    return image
+
 def show_all_stats():
     desc_stats = df.describe(include='all').T
     desc_stats.reset_index(inplace=True)
@@ -165,6 +213,8 @@ buttons = [
     {"text": "Distribuição de Gênero", "action": plot_gender_distribution},
     {"text": "Distribuição de Raça", "action": plot_race_distribution},
     {"text": "Top Condados por População", "action": plot_top_counties_by_population},
+    {"text": "Top Condados por % Brancos", "action": plot_top_counties_by_white_share},
+    {"text": "Concentração no Maior Condado", "action": plot_largest_county_share_by_state},
     {"text": "Estatísticas Descritivas", "action": show_all_stats}
 ]
 
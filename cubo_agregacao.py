@@ -0,0 +1,99 @@
+import pandas as pd
+
+# Agregações guardadas no cubo. A média é derivada de sum/count.
+FUNCOES = ('sum', 'count', 'mean', 'max')
+
+# Como cada agregação do nível mais detalhado é consolidada nos níveis superiores
+CONSOLIDACAO = {'sum': 'sum', 'count': 'sum', 'max': 'max'}
+
+
+def construir_cubo(df, conjuntos, colunas):
+    """
+    Constrói um cubo de agregação com vários conjuntos de agrupamento
+    (grouping sets) percorrendo o DataFrame uma única vez.
+
+    O agrupamento mais detalhado (o conjunto com mais colunas, que deve
+    conter todos os outros) é calculado sobre o DataFrame; os demais são
+    consolidados a partir dele, que tem no máximo uma linha por combinação
+    de chaves.
+
+    Args:
+        df: O DataFrame de origem.
+        conjuntos: Lista de tuplas com as colunas de cada agrupamento
+            (ex: [('departamento',), ('cargo',), ('departamento', 'cargo')]).
+        colunas: Colunas numéricas agregadas.
+
+    Returns:
+        Um dicionário {conjunto: DataFrame}, com colunas (funcao, coluna) para
+        cada função em `FUNCOES`.
+    """
+    conjuntos = [tuple(conjunto) for conjunto in conjuntos]
+    base = max(conjuntos, key=len)
+    for conjunto in conjuntos:
+        if not set(conjunto) <= set(base):
+            raise ValueError(f"O agrupamento {conjunto} não está contido em {base}.")
+
+    colunas = list(colunas)
+    detalhado = df.groupby(list(base), observed=True)[colunas].agg(list(CONSOLIDACAO))
+    detalhado = detalhado.swaplevel(axis=1)
+
+    cubo = {}
+    for conjunto in conjuntos:
+        if conjunto == base:
+            parcial = detalhado
+        else:
+            parcial = pd.concat(
+                {
+                    funcao: detalhado[funcao].groupby(level=list(conjunto), observed=True).agg(consolidacao)
+                    for funcao, consolidacao in CONSOLIDACAO.items()
+                },
+                axis=1,
+            )
+        media = parcial['sum'] / parcial['count'].where(parcial['count'] > 0)
+        cubo[conjunto] = pd.concat(
+            {funcao: media if funcao == 'mean' else parcial[funcao] for funcao in FUNCOES},
+            axis=1,
+        )
+    return cubo
+
+
+def combinar_cubos(cubo, delta):
+    """
+    Atualiza um cubo com o cubo `delta` das linhas acrescentadas ao
+    DataFrame (construído com os mesmos conjuntos e colunas), sem percorrer
+    as linhas antigas: somas e contagens são somadas, máximos comparados e a
+    média recalculada. Para manter a ordem de um cubo construído do zero, o
+    `delta` deve ser construído a partir das linhas novas já com as
+    categorias do DataFrame completo.
+
+    Returns:
+        Um novo cubo; `cubo` não é alterado.
+    """
+    combinado = {}
+    for conjunto, parcial in cubo.items():
+        juntos = pd.concat([parcial, delta[conjunto]])
+        indice_delta = delta[conjunto].index
+        niveis = []
+        for i in range(juntos.index.nlevels):
+            valores = juntos.index.get_level_values(i)
+            tipo = indice_delta.get_level_values(i).dtype
+            niveis.append(pd.Categorical(valores, dtype=tipo) if isinstance(tipo, pd.CategoricalDtype) else valores)
+
+        partes = {
+            funcao: juntos[funcao].groupby(niveis, observed=True).agg(consolidacao)
+            for funcao, consolidacao in CONSOLIDACAO.items()
+        }
+        media = partes['sum'] / partes['count'].where(partes['count'] > 0)
+        resultado = pd.concat({funcao: media if funcao == 'mean' else partes[funcao] for funcao in FUNCOES}, axis=1)
+        resultado.index.names = parcial.index.names
+        combinado[conjunto] = resultado
+    return combinado
+
+
+def consultar(cubo, conjunto, coluna, funcao='sum'):
+    """
+    Retorna uma agregação do cubo como uma série indexada pelas chaves do
+    agrupamento.
+    """
+    return cubo[tuple(conjunto)][funcao][coluna].rename(coluna)
+
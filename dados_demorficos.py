@@ -3,6 +3,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import unicodedata
 import re
+from cache_colunar import com_cache_colunar
+from inferencia_tipos import read_csv_otimizado
 
 def normalize_column_name(name):
     name = name.strip().lower()
@@ -12,8 +14,9 @@ def normalize_column_name(name):
     name = re.sub(r'[^a-z0-9_]', '_', name)
     return name
 
+@com_cache_colunar(versao=2)
 def load_csv(file_path):
-    df = pd.read_csv(file_path)
+    df = read_csv_otimizado(file_path)
     df.columns = [normalize_column_name(col) for col in df.columns]
     return df
 
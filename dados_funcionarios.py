@@ -1,11 +1,21 @@
 import pandas as pd
+import numpy as np
 import pygame
 import matplotlib.pyplot as plt
 import re
 import locale
-import chardet
 from unidecode import unidecode
 from matplotlib.backends.backend_agg import FigureCanvasAgg
+from cache_colunar import com_cache_colunar, concatenar
+from conversao_colunar import ler_csv
+from cache_resultados import CacheResultados, com_cache_resultado
+from cubo_agregacao import construir_cubo, combinar_cubos, consultar
+from selecao_top_k import top_k, TopKIncremental
+from serie_temporal import curva_acumulada
+from intervalos import ativos_por_periodo
+from simulador_folha import grade_cenarios, simular_cenarios
+from validacao import normalizar_cpf, validar, resumo_erros, atualizar_duplicados
+from moeda import para_centavos, para_unidades, centavos_numpy
 
 # Configurar localidade para pt_BR para formatação monetária
 locale.setlocale(locale.LC_ALL, 'pt_BR.UTF-8')
@@ -24,27 +34,192 @@ def clean_column_name(name):
     name = name.strip('_')  # Remove '_' do início e do fim
     return name
 
+# Colunas de data no formato dd/mm/aaaa
+COLUNAS_DATA = ['data_de_admissao', 'data_de_demissao']
+
+# Colunas monetárias (salário, custo e seus componentes), guardadas em centavos
+COLUNAS_CUSTO = [
+    'custo_total_anual', 'salario', 'horas_extras', 'adicional_noturno', 'insalubridade',
+    'periculosidade', 'descanso_remunerado', 'ferias', 'adicional_de_ferias', '1_3_de_ferias',
+    'fgts_de_ferias', 'inss_de_ferias', '13o_salario', 'fgts_do_13o_salario', 'inss_13o_salario',
+    'fgts', 'inss_patronal', 'inss_terceiros_sistema_s', 'rat_fap_sat', 'salario_educacao_salario_familia',
+]
+
+# Colunas com um valor por funcionário, mantidas como texto (não categóricas)
+COLUNAS_IDENTIFICADORAS = ['nome_completo', 'cpf']
+
+# Proporção máxima de valores distintos para uma coluna de texto virar categórica
+PROPORCAO_CATEGORICA = 0.5
+
+# Caminho padrão do arquivo de funcionários
+CAMINHO_DADOS = "./assets/datasets/funcionarios_ficticios/dados.csv"
+
+def combinar_funcionarios(anterior, novo):
+    """
+    Acrescenta os funcionários novos (ingestão incremental) aos já
+    carregados. Os demais erros de validação de cada linha não mudam, mas IDs
+    e CPFs repetidos precisam ser conferidos contra o arquivo inteiro.
+    """
+    df = concatenar(anterior, novo)
+    if 'erros_validacao' in df.columns:
+        df['erros_validacao'] = atualizar_duplicados(
+            df['erros_validacao'], df,
+            coluna_cpf='cpf' if 'cpf' in df.columns else None,
+            coluna_id='id_funcionario' if 'id_funcionario' in df.columns else None,
+        )
+    return df
+
+@com_cache_colunar(versao=6, incremental=True, combinar=combinar_funcionarios)
 def load_and_clean_csv(file_path):
     """
     Carrega um arquivo CSV, limpa os nomes das colunas e retorna um DataFrame.
-    Detecta automaticamente a codificação do arquivo usando chardet.
+    Detecta automaticamente a codificação do arquivo a partir de uma amostra.
+    As colunas de data são convertidas para datetime64 uma única vez, aqui.
+
+    Antes da conversão, os registros são validados (veja `validar_funcionarios`)
+    e o resultado fica na coluna 'erros_validacao' (0 para registros válidos).
+    As colunas monetárias (`COLUNAS_CUSTO`) são guardadas em centavos inteiros.
+
+    O arquivo é tratado como só de acréscimos: quando o RH apenas acrescenta
+    linhas no fim, só as linhas novas são lidas (veja `carregar_com_cache`).
     """
-    with open(file_path, 'rb') as f:
-        result = chardet.detect(f.read())
+    df = ler_csv(file_path)
 
-    encoding = result['encoding']
-    df = pd.read_csv(file_path, encoding=encoding)
+    # As colunas obrigatórias são marcadas com '*' no cabeçalho original
+    obrigatorias = [clean_column_name(col) for col in df.columns if col.strip().endswith('*')]
     df.columns = [clean_column_name(col) for col in df.columns]
+
+    if 'cpf' in df.columns:
+        df['cpf'] = normalizar_cpf(df['cpf'])
+
+    df['erros_validacao'], relatorio = validar_funcionarios(df, obrigatorias)
+    if not relatorio.empty:
+        print(f"Validação de {file_path}: {int((df['erros_validacao'] != 0).sum())} de {len(df)} registros com erros")
+        print(relatorio.to_string(index=False))
+
+    for col in COLUNAS_DATA:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col].astype(object), format='%d/%m/%Y', errors='coerce')
+
+    for col in COLUNAS_CUSTO:
+        if col in df.columns:
+            df[col] = para_centavos(df[col])
     
     #Removendo caracteres especiais dos dados
-    for col in df.columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].apply(lambda x: unidecode(x) if isinstance(x, str) else x)
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        categorica = col not in COLUNAS_IDENTIFICADORAS and df[col].nunique() < PROPORCAO_CATEGORICA * len(df)
+        df[col] = transliterar_coluna(df[col], categorica=categorica)
 
     return df
 
+def validar_funcionarios(df, obrigatorias):
+    """
+    Valida os registros de funcionários: campos obrigatórios preenchidos,
+    dígitos verificadores do CPF, datas no formato dd/mm/aaaa e IDs ou CPFs
+    repetidos. As datas ainda devem estar em texto.
+
+    Returns:
+        Uma tupla (erros, relatorio), veja `validacao.validar`.
+    """
+    return validar(
+        df,
+        obrigatorias=obrigatorias,
+        coluna_cpf='cpf' if 'cpf' in df.columns else None,
+        colunas_data=COLUNAS_DATA,
+        formato_data='%d/%m/%Y',
+        coluna_id='id_funcionario' if 'id_funcionario' in df.columns else None,
+    )
+
+def registros_validos(df):
+    """
+    Máscara dos registros sem erros de validação.
+    """
+    if 'erros_validacao' not in df.columns:
+        return pd.Series(True, index=df.index)
+    return df['erros_validacao'] == 0
+
+def transliterar_coluna(serie, categorica=True):
+    """
+    Remove acentos de uma coluna de texto transliterando cada valor distinto
+    uma única vez (via factorize) e reaplicando o resultado pelos códigos.
+    Retorna uma coluna categórica, ou de texto com `categorica=False` (para
+    colunas com quase um valor por linha, como nomes e CPFs).
+    """
+    codigos, valores = pd.factorize(serie)
+    transliterados = [unidecode(v) if isinstance(v, str) else v for v in valores]
+
+    if not categorica:
+        resultado = np.asarray(transliterados, dtype=object)[codigos]
+        resultado[codigos < 0] = np.nan
+        return pd.Series(resultado, index=serie.index, name=serie.name, dtype=object)
+
+    # Valores diferentes podem ficar iguais após a transliteração ("Produção" e "Producao")
+    novos_codigos, categorias = pd.factorize(pd.Index(transliterados, dtype=object))
+    codigos = np.where(codigos >= 0, novos_codigos[codigos], -1)
+
+    return pd.Series(pd.Categorical.from_codes(codigos, categories=categorias), index=serie.index, name=serie.name)
+
 # --- Funções de Análise ---
 
+# Resultados das análises, reaproveitados entre cliques enquanto os dados não mudam
+cache_analises = CacheResultados()
+
+# Agrupamentos do cubo de agregação
+CONJUNTOS_CUBO = [('departamento',), ('cargo',), ('departamento', 'cargo')]
+
+def em_moeda(dados):
+    """
+    Retorna uma cópia de `dados` marcada como valores monetários (em
+    centavos), para que os gráficos formatem o eixo com `formatar_valor`.
+    """
+    dados = dados.copy()
+    dados.attrs['moeda'] = True
+    return dados
+
+@com_cache_resultado(cache_analises)
+def cubo_custos(df):
+    """
+    Cubo com soma, contagem, média e máximo de cada coluna de custo por
+    departamento, por cargo e por departamento e cargo. Construído uma vez
+    (ao carregar os dados) e consultado por todas as análises por setor e
+    por função.
+    """
+    colunas = [col for col in COLUNAS_CUSTO if col in df.columns]
+    return construir_cubo(df, CONJUNTOS_CUBO, colunas)
+
+@com_cache_resultado(cache_analises)
+def ranking_salarios(df):
+    """
+    Heap com os 10 maiores salários individuais, mantido com as linhas novas
+    quando o arquivo só recebe acréscimos (veja `atualizar_dados`).
+    """
+    return TopKIncremental(10).acrescentar(centavos_numpy(df['salario']), df['nome_completo'])
+
+def atualizar_dados(df, file_path=CAMINHO_DADOS):
+    """
+    Recarrega o arquivo de funcionários. Se ele só recebeu linhas novas, o
+    cubo de agregação (totais por setor e função, de onde saem os top 10) e
+    o ranking dos maiores salários são atualizados apenas com essas linhas, e
+    a curva de custo acumulado é estendida a partir da gravada no cache.
+
+    Returns:
+        O DataFrame atualizado (ou `df`, se o arquivo não mudou).
+    """
+    novo = load_and_clean_csv(file_path)
+    if novo.attrs.get('hash_origem') == df.attrs.get('hash_origem'):
+        return df
+
+    if novo.attrs.get('hash_anterior') == df.attrs.get('hash_origem') and novo.attrs.get('linhas_anteriores') == len(df):
+        colunas = [col for col in COLUNAS_CUSTO if col in novo.columns]
+        delta = construir_cubo(novo.iloc[len(df):], CONJUNTOS_CUBO, colunas)
+        cubo_custos.guardar(novo, combinar_cubos(cubo_custos(df), delta))
+        novas = novo.iloc[len(df):]
+        ranking_salarios.guardar(novo, ranking_salarios(df).copia().acrescentar(centavos_numpy(novas['salario']), novas['nome_completo']))
+    else:
+        cubo_custos(novo)
+    return novo
+
+@com_cache_resultado(cache_analises)
 def total_anual_salarios(df):
     """
     Calcula o total anual de salários.
@@ -52,66 +227,155 @@ def total_anual_salarios(df):
     total = df['custo_total_anual'].sum()
     return {"name": "total_anual_salarios","data":total,"texto": 'Total anual dos sálarios:'}
 
+@com_cache_resultado(cache_analises)
 def top_10_setores_por_salario_anual(df):
     """
     Retorna os top 10 setores por salário anual.
     """
-    return {"name": "top_10_setores_por_salario_anual","data":df.groupby('departamento')['custo_total_anual'].sum().nlargest(10),"texto": ''}
+    dados = top_k(consultar(cubo_custos(df), ['departamento'], 'custo_total_anual'), 10)
+    return {"name": "top_10_setores_por_salario_anual","data":em_moeda(dados),"texto": ''}
 
+@com_cache_resultado(cache_analises)
 def top_10_funcoes_por_salario_anual(df):
     """
     Retorna os top 10 funções por salário anual.
     """
-    return {"name": "top_10_funcoes_por_salario_anual","data":df.groupby('cargo')['custo_total_anual'].sum().nlargest(10),"texto": ''}
+    dados = top_k(consultar(cubo_custos(df), ['cargo'], 'custo_total_anual'), 10)
+    return {"name": "top_10_funcoes_por_salario_anual","data":em_moeda(dados),"texto": ''}
 
+@com_cache_resultado(cache_analises)
 def top_10_setores_por_salario_mensal(df):
     """
     Retorna os top 10 setores por salário mensal (aproximado).
     """
-    df_temp = df.copy()
-    df_temp['salario_mensal_aprox'] = df_temp['salario']
-    return {"name": "top_10_setores_por_salario_mensal","data":df_temp.groupby('departamento')['salario_mensal_aprox'].sum().nlargest(10),"texto": ''}
+    dados = top_k(consultar(cubo_custos(df), ['departamento'], 'salario'), 10).rename('salario_mensal_aprox')
+    return {"name": "top_10_setores_por_salario_mensal","data":em_moeda(dados),"texto": ''}
 
+@com_cache_resultado(cache_analises)
 def top_10_funcoes_por_salario_mensal(df):
     """
     Retorna os top 10 funções por salário mensal (aproximado).
     """
-    df_temp = df.copy()
-    df_temp['salario_mensal_aprox'] = df_temp['salario']
-    return {"name": "top_10_funcoes_por_salario_mensal","data": df_temp.groupby('cargo')['salario_mensal_aprox'].sum().nlargest(10),"texto": ''}
+    dados = top_k(consultar(cubo_custos(df), ['cargo'], 'salario'), 10).rename('salario_mensal_aprox')
+    return {"name": "top_10_funcoes_por_salario_mensal","data": em_moeda(dados),"texto": ''}
+
+@com_cache_resultado(cache_analises)
+def top_10_maiores_salarios(df):
+    """
+    Retorna os 10 maiores salários mensais individuais.
+    """
+    dados = ranking_salarios(df).resultado('salario')
+    return {"name": "top_10_maiores_salarios","data":em_moeda(dados),"texto": ''}
 
+@com_cache_resultado(cache_analises)
+def curva_custo_acumulado(df):
+    """
+    Curva do custo total anual acumulado por data de admissão. A ordenação
+    fica gravada no cache junto com os dados e a curva pode ser estendida
+    com `CurvaAcumulada.acrescentar` quando novos funcionários chegam.
+    """
+    return curva_acumulada(df, 'data_de_admissao', 'custo_total_anual')
+
+@com_cache_resultado(cache_analises)
 def evolucao_temporal_salarios(df):
     """
     Retorna a evolução temporal dos salários (considerando data de admissão).
     """
-    df['data_de_admissao'] = pd.to_datetime(df['data_de_admissao'], dayfirst=True, errors='coerce')
-    df = df.sort_values('data_de_admissao')
-    df['custo_acumulado'] = df['custo_total_anual'].cumsum()
+    dados = curva_custo_acumulado(df).como_dataframe('data_de_admissao', 'custo_acumulado')
+    return {"name": "evolucao_temporal_salarios","data":dados,"texto": ''}
+
+@com_cache_resultado(cache_analises)
+def quadro_ativo(df, grupo='departamento', freq='ME'):
+    """
+    Quantidade de funcionários ativos e folha ativa (soma dos salários) em
+    cada fim de mês (freq='ME') ou dia (freq='D'), por `grupo`
+    ('departamento', 'cargo' ou None para o total). Um funcionário está
+    ativo da data de admissão até a data de demissão, inclusive.
+
+    Returns:
+        Uma tupla (quantidade, folha) de DataFrames com uma coluna por grupo.
+    """
+    grupos = df[grupo] if grupo else None
+    return ativos_por_periodo(df['data_de_admissao'], df['data_de_demissao'], df['salario'], grupos, freq=freq)
+
+@com_cache_resultado(cache_analises)
+def quadro_funcionarios_por_setor(df):
+    """
+    Retorna a evolução mensal da quantidade de funcionários ativos por setor.
+    """
+    quantidade, _ = quadro_ativo(df, 'departamento')
+    return {"name": "quadro_funcionarios_por_setor","data":quantidade,"texto": ''}
 
-    return {"name": "evolucao_temporal_salarios","data":df[['data_de_admissao', 'custo_acumulado']],"texto": ''}
+@com_cache_resultado(cache_analises)
+def folha_ativa_por_setor(df):
+    """
+    Retorna a evolução mensal da folha (salários dos funcionários ativos) por setor.
+    """
+    _, folha = quadro_ativo(df, 'departamento')
+    return {"name": "folha_ativa_por_setor","data":em_moeda(folha),"texto": ''}
+
+# Cenários comparados na tela de simulação (NaN mantém o valor do arquivo)
+CENARIOS_SIMULACAO = pd.DataFrame(
+    {
+        'reajuste':          [0.0,    0.0,    0.05,   0.0,    0.05],
+        'reajuste_Producao': [0.0,    0.0,    0.0,    0.10,   0.0],
+        'inss_patronal':     [np.nan, 0.20,   np.nan, np.nan, 0.20],
+    },
+    index=['Atual', 'INSS patronal 20%', 'Reajuste geral 5%', 'Reajuste Produção 10%', 'Reajuste 5% + INSS 20%'],
+)
+
+@com_cache_resultado(cache_analises)
+def comparacao_cenarios(df):
+    """
+    Retorna o custo total anual de cada cenário de `CENARIOS_SIMULACAO`.
+    """
+    total, _ = simular_cenarios(df, CENARIOS_SIMULACAO)
+    return {"name": "comparacao_cenarios","data":em_moeda(total),"texto": ''}
 
+@com_cache_resultado(cache_analises)
+def custo_por_inss_e_reajuste(df):
+    """
+    Retorna o custo total anual para cada alíquota de INSS patronal (0% a 30%,
+    de 0,1 em 0,1 ponto) combinada com cada reajuste geral, calculado de uma
+    só vez para todos os cenários.
+    """
+    cenarios = grade_cenarios(inss_patronal=np.round(np.linspace(0, 0.30, 301), 3), reajuste=[0.0, 0.02, 0.05, 0.08, 0.10])
+    total, _ = simular_cenarios(df, cenarios)
+    dados = total.groupby([cenarios['inss_patronal'], cenarios['reajuste']]).first().unstack()
+    dados.index = dados.index * 100
+    dados.columns = [f"Reajuste {reajuste:.0%}" for reajuste in dados.columns]
+    return {"name": "custo_por_inss_e_reajuste","data":em_moeda(dados),"texto": ''}
+
+@com_cache_resultado(cache_analises)
 def distribuicao_graus_academicos(df):
     """
     Retorna a distribuição de graus acadêmicos.
     """
     return {"name": "distribuicao_graus_academicos","data":df['grau_academico'].value_counts(),"texto": ''}
 
+@com_cache_resultado(cache_analises)
 def custo_total_anual_por_setor(df):
     """
     Retorna o custo total anual por setor.
     """
-    return {"name": "custo_total_anual_por_setor","data": df.groupby('departamento')['custo_total_anual'].sum(),"texto": ''}
+    return {"name": "custo_total_anual_por_setor","data": em_moeda(consultar(cubo_custos(df), ['departamento'], 'custo_total_anual')),"texto": ''}
 
+@com_cache_resultado(cache_analises)
 def custo_total_anual_por_funcao(df):
     """
     Retorna o custo total anual por função.
     """
-    return {"name": "custo_total_anual_por_funcao","data":df.groupby('cargo')['custo_total_anual'].sum().nlargest(10),"texto": ''}
+    dados = top_k(consultar(cubo_custos(df), ['cargo'], 'custo_total_anual'), 10)
+    return {"name": "custo_total_anual_por_funcao","data":em_moeda(dados),"texto": ''}
 
 # --- Funções de Visualização com Pygame ---
 
 def formatar_valor(valor):
-    return locale.currency(valor, grouping=True)
+    """
+    Formata um valor em centavos como moeda. É o único ponto onde os
+    centavos são convertidos para reais.
+    """
+    return locale.currency(para_unidades(valor), grouping=True)
 
 def show_value_screen(screen, value, font):
     """
@@ -148,11 +412,11 @@ def show_plot_screen(screen, data, title, xlabel, ylabel):
     fig, ax = plt.subplots(figsize=(8, 6))
 
     if isinstance(data, pd.Series):
-        if data.dtype == 'float64' or data.dtype == 'int64':
+        if data.attrs.get('moeda'):
           data.plot(kind='bar', ax=ax)
           ax.set_xticklabels(data.index, rotation=45, ha='right')
           # Formatando os valores do eixo y para moeda
-          ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, loc: locale.currency(x, grouping=True)))
+          ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, loc: formatar_valor(x)))
 
         else:
           data.plot(kind='bar', ax=ax)
@@ -163,7 +427,13 @@ def show_plot_screen(screen, data, title, xlabel, ylabel):
             ax.plot(data['data_de_admissao'], data['custo_acumulado'])
             ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%d/%m/%Y'))
             fig.autofmt_xdate()
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, loc: locale.currency(x, grouping=True)))
+            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, loc: formatar_valor(x)))
+        else:
+            # Uma linha por coluna (ex: quadro de funcionários por setor, cenários de custo)
+            data.plot(ax=ax, linewidth=1)
+            ax.legend(fontsize='x-small', ncol=2)
+            if data.attrs.get('moeda'):
+                ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, loc: formatar_valor(x)))
 
 
     ax.set_title(title)
@@ -248,12 +518,14 @@ class Button:
         """
         Chama a função de ação do botão
         """
-        import numpy as np
         result = self.action(self.df)      
         
-        if isinstance(result['data'], (int, float,np.int64, np.float64)):
+        if isinstance(result['data'], (int, float, np.integer, np.floating)):
             print('Show value screen')
             show_value_screen(self.screen, f"{result['texto']} {formatar_valor(result['data'])}", self.font)
+        elif isinstance(result['data'], str):
+            print('Show value screen')
+            show_value_screen(self.screen, f"{result['texto']} {result['data']}", self.font)
         else:
             print('Show plot screen')
             show_plot_screen(self.screen, result['data'], self.title, self.xlabel, self.ylabel)
@@ -271,7 +543,12 @@ def main():
     pygame.display.set_caption("Análise de Dados de RH")
 
     # Carrega os dados
-    df = load_and_clean_csv("./assets/datasets/funcionarios_ficticios/dados.csv")  # Substitua "dados.csv" pelo caminho do seu arquivo
+    df = load_and_clean_csv(CAMINHO_DADOS)  # Substitua CAMINHO_DADOS pelo caminho do seu arquivo
+    cubo_custos(df)  # Monta o cubo de agregação uma única vez, antes dos cliques
+    invalidos = int((~registros_validos(df)).sum())
+    if invalidos:
+        print(f"{invalidos} registros com erros de validação:")
+        print(resumo_erros(df['erros_validacao']).loc[lambda s: s > 0].to_string())
 
     # Fonte para os botões
     font = pygame.font.Font(None, 24)
@@ -281,18 +558,38 @@ def main():
     button_height = 40
     gap = 10
     start_y = 50
+    # Os botões são distribuídos em duas colunas
+    left_x = screen_width // 4 - button_width // 2
+    right_x = 3 * screen_width // 4 - button_width // 2
     buttons = [
-        Button("Total Anual de Salários", (screen_width - button_width) // 2, start_y, button_width, button_height, total_anual_salarios, df, screen, font, "", "", ""),
-        Button("Top 10 Setores por Salário Anual", (screen_width - button_width) // 2, start_y + (button_height + gap), button_width, button_height, top_10_setores_por_salario_anual, df, screen, font, "Top 10 Setores por Salário Anual", "Setor", "Custo Anual"),
-        Button("Top 10 Funções por Salário Anual", (screen_width - button_width) // 2, start_y + 2 * (button_height + gap), button_width, button_height, top_10_funcoes_por_salario_anual, df, screen, font, "Top 10 Funções por Salário Anual", "Função", "Custo Anual"),
-        Button("Top 10 Setores por Salário Mensal", (screen_width - button_width) // 2, start_y + 3 * (button_height + gap), button_width, button_height, top_10_setores_por_salario_mensal, df, screen, font, "Top 10 Setores por Salário Mensal", "Setor", "Salário Mensal Aprox."),
-        Button("Top 10 Funções por Salário Mensal", (screen_width - button_width) // 2, start_y + 4 * (button_height + gap), button_width, button_height, top_10_funcoes_por_salario_mensal, df, screen, font, "Top 10 Funções por Salário Mensal", "Função", "Salário Mensal Aprox."),
-        Button("Evolução Temporal dos Salários", (screen_width - button_width) // 2, start_y + 5 * (button_height + gap), button_width, button_height, evolucao_temporal_salarios, df, screen, font, "Evolução Temporal dos Salários", "Data de Admissão", "Custo Acumulado"),
-        Button("Distribuição de Graus Acadêmicos", (screen_width - button_width) // 2, start_y + 6 * (button_height + gap), button_width, button_height, distribuicao_graus_academicos, df, screen, font, "Distribuição de Graus Acadêmicos", "Grau Acadêmico", "Quantidade"),
-        Button("Custo Total Anual por Setor", (screen_width - button_width) // 2, start_y + 7 * (button_height + gap), button_width, button_height, custo_total_anual_por_setor, df, screen, font, "Custo Total Anual por Setor", "Setor", "Custo Anual"),
-        Button("Custo Total Anual por Função", (screen_width - button_width) // 2, start_y + 8 * (button_height + gap), button_width, button_height, custo_total_anual_por_funcao, df, screen, font, "Custo Total Anual por Função", "Função", "Custo Anual"),
+        Button("Total Anual de Salários", left_x, start_y, button_width, button_height, total_anual_salarios, df, screen, font, "", "", ""),
+        Button("Top 10 Setores por Salário Anual", left_x, start_y + (button_height + gap), button_width, button_height, top_10_setores_por_salario_anual, df, screen, font, "Top 10 Setores por Salário Anual", "Setor", "Custo Anual"),
+        Button("Top 10 Funções por Salário Anual", left_x, start_y + 2 * (button_height + gap), button_width, button_height, top_10_funcoes_por_salario_anual, df, screen, font, "Top 10 Funções por Salário Anual", "Função", "Custo Anual"),
+        Button("Top 10 Setores por Salário Mensal", left_x, start_y + 3 * (button_height + gap), button_width, button_height, top_10_setores_por_salario_mensal, df, screen, font, "Top 10 Setores por Salário Mensal", "Setor", "Salário Mensal Aprox."),
+        Button("Top 10 Funções por Salário Mensal", left_x, start_y + 4 * (button_height + gap), button_width, button_height, top_10_funcoes_por_salario_mensal, df, screen, font, "Top 10 Funções por Salário Mensal", "Função", "Salário Mensal Aprox."),
+        Button("Evolução Temporal dos Salários", left_x, start_y + 5 * (button_height + gap), button_width, button_height, evolucao_temporal_salarios, df, screen, font, "Evolução Temporal dos Salários", "Data de Admissão", "Custo Acumulado"),
+        Button("Distribuição de Graus Acadêmicos", left_x, start_y + 6 * (button_height + gap), button_width, button_height, distribuicao_graus_academicos, df, screen, font, "Distribuição de Graus Acadêmicos", "Grau Acadêmico", "Quantidade"),
+        Button("Top 10 Maiores Salários", left_x, start_y + 7 * (button_height + gap), button_width, button_height, top_10_maiores_salarios, df, screen, font, "Top 10 Maiores Salários", "Funcionário", "Salário Mensal"),
+        Button("Custo Total Anual por Setor", right_x, start_y, button_width, button_height, custo_total_anual_por_setor, df, screen, font, "Custo Total Anual por Setor", "Setor", "Custo Anual"),
+        Button("Custo Total Anual por Função", right_x, start_y + (button_height + gap), button_width, button_height, custo_total_anual_por_funcao, df, screen, font, "Custo Total Anual por Função", "Função", "Custo Anual"),
+        Button("Funcionários Ativos por Setor", right_x, start_y + 2 * (button_height + gap), button_width, button_height, quadro_funcionarios_por_setor, df, screen, font, "Funcionários Ativos por Setor", "Data", "Funcionários"),
+        Button("Folha Ativa por Setor", right_x, start_y + 3 * (button_height + gap), button_width, button_height, folha_ativa_por_setor, df, screen, font, "Folha Ativa por Setor", "Data", "Salários"),
+        Button("Comparação de Cenários", right_x, start_y + 4 * (button_height + gap), button_width, button_height, comparacao_cenarios, df, screen, font, "Custo Anual por Cenário", "Cenário", "Custo Anual"),
+        Button("Custo por INSS e Reajuste", right_x, start_y + 5 * (button_height + gap), button_width, button_height, custo_por_inss_e_reajuste, df, screen, font, "Custo Anual por Alíquota de INSS Patronal", "INSS Patronal (%)", "Custo Anual"),
     ]
 
+    def recarregar_dados(df_atual):
+        """
+        Lê as linhas acrescentadas ao arquivo e passa os dados atualizados
+        para todos os botões.
+        """
+        novo = atualizar_dados(df_atual)
+        for button in buttons:
+            button.df = novo
+        return {"name": "recarregar_dados","data": f"{len(novo) - len(df_atual)} novos registros ({len(novo)} no total)","texto": 'Dados recarregados:'}
+
+    buttons.append(Button("Recarregar Dados", right_x, start_y + 6 * (button_height + gap), button_width, button_height, recarregar_dados, df, screen, font, "", "", ""))
+
     # Loop principal
     running = True
     while running:
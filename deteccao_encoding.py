@@ -0,0 +1,140 @@
+import os
+import json
+import codecs
+import hashlib
+import pandas as pd
+from chardet import UniversalDetector
+from cache_colunar import DIRETORIO_CACHE
+
+# Os arquivos de metadados (sidecar) com o encoding detectado ficam no cache
+DIRETORIO_ENCODINGS = os.path.join(DIRETORIO_CACHE, "encodings")
+
+# Tamanho de cada bloco da amostra e limite total lido do arquivo
+TAMANHO_BLOCO = 64 * 1024
+LIMITE_AMOSTRA = 1024 * 1024
+
+# Encoding usado quando nada mais funciona (aceita qualquer sequência de bytes)
+ENCODING_ALTERNATIVO = 'latin-1'
+
+
+def _caminho_sidecar(caminho):
+    chave = hashlib.blake2b(os.path.abspath(caminho).encode('utf-8'), digest_size=16).hexdigest()
+    nome = os.path.basename(caminho)
+    return os.path.join(DIRETORIO_ENCODINGS, f"{nome}.{chave}.json")
+
+
+def _ler_sidecar(caminho, estado):
+    try:
+        with open(_caminho_sidecar(caminho), 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if dados.get('tamanho') == estado.st_size and dados.get('mtime_ns') == estado.st_mtime_ns:
+        return dados.get('encoding')
+    return None
+
+
+def _gravar_sidecar(caminho, estado, encoding, confianca):
+    os.makedirs(DIRETORIO_ENCODINGS, exist_ok=True)
+    dados = {
+        'arquivo': os.path.abspath(caminho),
+        'tamanho': estado.st_size,
+        'mtime_ns': estado.st_mtime_ns,
+        'encoding': encoding,
+        'confianca': confianca,
+    }
+    destino = _caminho_sidecar(caminho)
+    temporario = f"{destino}.tmp{os.getpid()}"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f)
+    os.replace(temporario, destino)
+
+
+def _detectar_na_amostra(caminho, limite_amostra):
+    """
+    Lê no máximo `limite_amostra` bytes do arquivo, em blocos. Enquanto a
+    amostra for UTF-8 válido, nenhum detector é executado; na primeira
+    sequência inválida, o chardet é alimentado de forma incremental e a
+    leitura para assim que ele atinge confiança suficiente.
+
+    Returns:
+        Uma tupla (encoding, confianca).
+    """
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    detector = None
+    lidos = []
+    total = 0
+
+    with open(caminho, 'rb') as f:
+        while total < limite_amostra:
+            bloco = f.read(min(TAMANHO_BLOCO, limite_amostra - total))
+            if not bloco:
+                break
+            total += len(bloco)
+
+            if detector is None:
+                lidos.append(bloco)
+                try:
+                    decodificador.decode(bloco)
+                    continue
+                except UnicodeDecodeError:
+                    detector = UniversalDetector()
+                    bloco = b''.join(lidos)
+                    lidos = None
+
+            detector.feed(bloco)
+            if detector.done:
+                break
+
+    if detector is None:
+        # Toda a amostra é UTF-8 válido (o ASCII puro também cai aqui)
+        return 'utf-8', 1.0
+
+    resultado = detector.close()
+    encoding = resultado.get('encoding')
+    if not encoding or encoding.lower() in ('ascii', 'utf-8'):
+        # A amostra não decodifica como UTF-8, então não pode ser ASCII/UTF-8
+        return ENCODING_ALTERNATIVO, 0.0
+    return encoding.lower(), resultado.get('confidence') or 0.0
+
+
+def detectar_encoding(caminho, limite_amostra=LIMITE_AMOSTRA):
+    """
+    Detecta o encoding de um arquivo de texto a partir de uma amostra limitada.
+
+    O resultado fica gravado em um arquivo sidecar em assets/cache/encodings,
+    associado ao tamanho e à data de modificação do arquivo. Enquanto o
+    arquivo não mudar, a detecção não é refeita.
+
+    Args:
+        caminho: O caminho do arquivo.
+        limite_amostra: Quantidade máxima de bytes examinados.
+
+    Returns:
+        O nome do encoding (ex: 'utf-8', 'windows-1252').
+    """
+    estado = os.stat(caminho)
+    encoding = _ler_sidecar(caminho, estado)
+    if encoding:
+        return encoding
+
+    encoding, confianca = _detectar_na_amostra(caminho, limite_amostra)
+    _gravar_sidecar(caminho, estado, encoding, confianca)
+    return encoding
+
+
+def read_csv_com_encoding(caminho, **kwargs):
+    """
+    Lê um CSV com o pandas usando o encoding detectado por `detectar_encoding`.
+
+    Como a detecção examina apenas uma amostra, um caractere inválido pode
+    aparecer depois dela. Nesse caso o arquivo é relido com o encoding
+    alternativo (latin-1) e o sidecar é atualizado.
+    """
+    encoding = detectar_encoding(caminho)
+    try:
+        return pd.read_csv(caminho, encoding=encoding, **kwargs)
+    except UnicodeDecodeError:
+        print(f"Encoding '{encoding}' inválido para {caminho}, usando '{ENCODING_ALTERNATIVO}'.")
+        _gravar_sidecar(caminho, os.stat(caminho), ENCODING_ALTERNATIVO, 0.0)
+        return pd.read_csv(caminho, encoding=ENCODING_ALTERNATIVO, **kwargs)
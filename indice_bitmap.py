@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+# Quantidade de bits 1 em cada byte, para contar as linhas de um bitmap
+_BITS_POR_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+
+class IndiceBitmap:
+    """
+    Índice bitmap de colunas categóricas: para cada valor distinto de cada
+    coluna indexada, um bitset compactado (np.packbits, um bit por linha)
+    marca as linhas com aquele valor.
+
+    Filtros são combinações de bitsets com E/OU/NÃO bit a bit, que percorrem
+    n/8 bytes em vez de comparar os n valores da coluna. As posições
+    retornadas correspondem às posições das linhas no DataFrame indexado.
+    """
+
+    def __init__(self, df, colunas):
+        self.n = len(df)
+        self.cheio = np.packbits(np.ones(self.n, dtype=bool))
+        self.vazio = np.zeros_like(self.cheio)
+        self.valores = {}  # coluna -> Index dos valores distintos (na ordem)
+        self.bitmaps = {}  # coluna -> {valor: bitset}
+        for col in colunas:
+            codigos, valores = pd.factorize(df[col], sort=True)
+            self.valores[col] = pd.Index(valores)
+            self.bitmaps[col] = {
+                valor: np.packbits(codigos == i)
+                for i, valor in enumerate(self.valores[col])
+            }
+
+    @property
+    def colunas(self):
+        return list(self.bitmaps)
+
+    def bitmap(self, coluna, valor):
+        """
+        Bitset das linhas em que `coluna` == `valor` (vazio se o valor não
+        existe).
+        """
+        return self.bitmaps[coluna].get(valor, self.vazio)
+
+    def qualquer(self, coluna, valores):
+        """
+        Bitset das linhas em que `coluna` é um dos `valores` (OU).
+        """
+        return self.ou(*[self.bitmap(coluna, valor) for valor in valores])
+
+    def e(self, *bitsets):
+        return np.bitwise_and.reduce(bitsets) if bitsets else self.cheio
+
+    def ou(self, *bitsets):
+        return np.bitwise_or.reduce(bitsets) if bitsets else self.vazio
+
+    def negar(self, bitset):
+        # Os bits de preenchimento do último byte continuam zerados
+        return np.bitwise_and(np.bitwise_not(bitset), self.cheio)
+
+    def de_mascara(self, mascara):
+        """
+        Converte uma máscara booleana (uma posição por linha) em bitset.
+        """
+        return np.packbits(np.asarray(mascara, dtype=bool))
+
+    def mascara(self, bitset):
+        return np.unpackbits(bitset, count=self.n).astype(bool)
+
+    def posicoes(self, bitset):
+        """
+        Posições (iloc) das linhas marcadas no bitset.
+        """
+        return np.flatnonzero(np.unpackbits(bitset, count=self.n))
+
+    def contar(self, bitset):
+        return int(_BITS_POR_BYTE[bitset].sum())
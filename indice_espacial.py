@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+
+# Raio médio da Terra, em km
+RAIO_TERRA_KM = 6371.0088
+
+# Par "(lat, lon)" no fim de um texto de endereço
+_PADRAO_COORDENADAS = r'\(\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\)\s*$'
+
+
+def extrair_coordenadas(serie):
+    """
+    Extrai as coordenadas "(lat, lon)" de uma coluna de texto com uma única
+    expressão regular vetorizada.
+
+    Returns:
+        Uma tupla (lat, lon) de arrays float64, com NaN onde não há coordenadas.
+    """
+    partes = serie.astype('string').str.extract(_PADRAO_COORDENADAS)
+    lat = pd.to_numeric(partes[0], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    lon = pd.to_numeric(partes[1], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    fora = (np.abs(lat) > 90) | (np.abs(lon) > 180)
+    lat[fora] = np.nan
+    lon[fora] = np.nan
+    return lat, lon
+
+
+def _unitarios(lat, lon):
+    """
+    Converte latitude/longitude (graus) em vetores unitários 3D.
+    """
+    lat, lon = np.radians(lat), np.radians(lon)
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def _corda(km):
+    """
+    Distância em linha reta (entre vetores unitários) equivalente a uma
+    distância em km sobre a superfície.
+    """
+    return 2 * np.sin(np.minimum(np.asarray(km, dtype=np.float64) / RAIO_TERRA_KM, np.pi) / 2)
+
+
+def _km(corda):
+    return 2 * RAIO_TERRA_KM * np.arcsin(np.clip(corda / 2, 0, 1))
+
+
+class IndiceEspacial:
+    """
+    Índice espacial de pontos (lat, lon) em uma grade uniforme sobre os
+    vetores unitários 3D: cada ponto cai em um cubo de lado fixo, e os
+    pontos ficam ordenados pelo cubo. Consultas por raio e de vizinhos mais
+    próximos só medem a distância dos pontos dos cubos ao redor da consulta;
+    a distância em linha reta entre vetores unitários cresce junto com a
+    distância sobre a superfície, então não há distorção perto dos polos nem
+    na linha de data.
+
+    As posições retornadas são as posições (iloc) nos arrays originais;
+    pontos sem coordenadas (NaN) ficam fora do índice.
+    """
+
+    def __init__(self, lat, lon, tamanho_celula_km=50):
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        self.n = len(lat)
+        self.lat, self.lon = lat, lon
+
+        validos = np.flatnonzero(~(np.isnan(lat) | np.isnan(lon)))
+        self.lado = float(_corda(tamanho_celula_km))
+        self.celulas_por_eixo = int(np.ceil(2 / self.lado)) + 1
+
+        pontos = _unitarios(lat[validos], lon[validos])
+        celulas = np.floor((pontos + 1) / self.lado).astype(np.int64)
+        chaves = self._chave(celulas)
+
+        ordem = np.argsort(chaves, kind='stable')
+        self.posicoes = validos[ordem]
+        self.pontos = pontos[ordem]
+        self.chaves, self.inicios, contagens = np.unique(chaves[ordem], return_index=True, return_counts=True)
+        self.fins = self.inicios + contagens
+        self.coordenadas_celulas = celulas[ordem][self.inicios]
+
+        # Ordem por latitude, para as consultas por retângulo
+        self.ordem_lat = validos[np.argsort(lat[validos], kind='stable')]
+        self.lat_ordenada = lat[self.ordem_lat]
+
+    def _chave(self, celulas):
+        m = self.celulas_por_eixo
+        return (celulas[..., 0] * m + celulas[..., 1]) * m + celulas[..., 2]
+
+    def _candidatos(self, celula, anel):
+        """
+        Posições (no array ordenado) dos pontos nos cubos a até `anel` cubos
+        de distância da célula da consulta, em cada eixo.
+        """
+        lado = 2 * anel + 1
+        if lado ** 3 < len(self.chaves):
+            deslocamentos = np.arange(-anel, anel + 1)
+            vizinhas = celula + np.stack(np.meshgrid(deslocamentos, deslocamentos, deslocamentos, indexing='ij'), axis=-1).reshape(-1, 3)
+            chaves = self._chave(vizinhas)
+            encontradas = np.searchsorted(self.chaves, chaves)
+            encontradas = encontradas[(encontradas < len(self.chaves)) & (self.chaves[np.minimum(encontradas, len(self.chaves) - 1)] == chaves)]
+        else:
+            encontradas = np.flatnonzero((np.abs(self.coordenadas_celulas - celula) <= anel).all(axis=1))
+
+        inicios, fins = self.inicios[encontradas], self.fins[encontradas]
+        tamanhos = fins - inicios
+        if not tamanhos.sum():
+            return np.zeros(0, dtype=np.int64)
+        # Concatena os intervalos [inicio, fim) sem laço em Python
+        deslocamento = np.repeat(inicios - np.concatenate([[0], np.cumsum(tamanhos)[:-1]]), tamanhos)
+        return np.arange(tamanhos.sum()) + deslocamento
+
+    def _consulta(self, lat, lon):
+        ponto = _unitarios(np.atleast_1d(lat), np.atleast_1d(lon))[0]
+        celula = np.floor((ponto + 1) / self.lado).astype(np.int64)
+        return ponto, celula
+
+    def raio(self, lat, lon, raio_km, mascara=None):
+        """
+        Pontos a até `raio_km` de (lat, lon), do mais próximo para o mais
+        distante. `mascara` (booleana, uma posição por ponto original)
+        restringe os pontos considerados.
+
+        Returns:
+            Uma tupla (posicoes, distancias_km).
+        """
+        ponto, celula = self._consulta(lat, lon)
+        limite = _corda(raio_km)
+        candidatos = self._candidatos(celula, int(np.ceil(limite / self.lado)))
+        if mascara is not None:
+            candidatos = candidatos[np.asarray(mascara)[self.posicoes[candidatos]]]
+        distancias = np.linalg.norm(self.pontos[candidatos] - ponto, axis=1)
+        dentro = distancias <= limite
+        candidatos, distancias = candidatos[dentro], distancias[dentro]
+        ordem = np.argsort(distancias, kind='stable')
+        return self.posicoes[candidatos[ordem]], _km(distancias[ordem])
+
+    def vizinhos(self, lat, lon, k=1, mascara=None):
+        """
+        Os `k` pontos mais próximos de (lat, lon), do mais próximo para o mais
+        distante (menos de `k` se não houver pontos suficientes).
+
+        Os cubos ao redor da consulta são examinados em anéis crescentes até
+        que a k-ésima distância encontrada seja menor que a distância mínima
+        de qualquer ponto fora dos anéis examinados.
+
+        Returns:
+            Uma tupla (posicoes, distancias_km).
+        """
+        ponto, celula = self._consulta(lat, lon)
+        anel = 1
+        while True:
+            candidatos = self._candidatos(celula, anel)
+            if mascara is not None:
+                candidatos = candidatos[np.asarray(mascara)[self.posicoes[candidatos]]]
+            todos = anel * self.lado >= 2
+            if len(candidatos) >= k or todos:
+                distancias = np.linalg.norm(self.pontos[candidatos] - ponto, axis=1)
+                selecionados = np.argsort(distancias, kind='stable')[:k]
+                kesima = distancias[selecionados[-1]] if len(selecionados) else 0
+                # Pontos fora do anel estão a mais de anel * lado da consulta
+                if todos or kesima <= anel * self.lado:
+                    return self.posicoes[candidatos[selecionados]], _km(distancias[selecionados])
+                anel = max(anel + 1, int(np.ceil(kesima / self.lado)))
+            else:
+                anel *= 2
+
+    def retangulo(self, lat_min, lat_max, lon_min, lon_max, mascara=None):
+        """
+        Pontos dentro do retângulo de latitude/longitude. Se lon_min > lon_max,
+        o retângulo atravessa a linha de data.
+
+        Returns:
+            As posições dos pontos, em ordem crescente.
+        """
+        inicio = np.searchsorted(self.lat_ordenada, lat_min, side='left')
+        fim = np.searchsorted(self.lat_ordenada, lat_max, side='right')
+        faixa = self.ordem_lat[inicio:fim]
+        lon = self.lon[faixa]
+        if lon_min <= lon_max:
+            dentro = (lon >= lon_min) & (lon <= lon_max)
+        else:
+            dentro = (lon >= lon_min) | (lon <= lon_max)
+        posicoes = faixa[dentro]
+        if mascara is not None:
+            posicoes = posicoes[np.asarray(mascara)[posicoes]]
+        return np.sort(posicoes)
+
+    def raio_em_lote(self, lats, lons, raio_km, mascara=None):
+        """
+        Consulta por raio para vários pontos. Retorna uma lista de tuplas
+        (posicoes, distancias_km), uma por consulta.
+        """
+        return [self.raio(lat, lon, raio_km, mascara) for lat, lon in zip(lats, lons)]
+
+    def vizinhos_em_lote(self, lats, lons, k=1, mascara=None):
+        """
+        Vizinhos mais próximos de vários pontos.
+
+        Returns:
+            Uma tupla (posicoes, distancias_km) de matrizes consultas × k,
+            completadas com -1 e NaN quando há menos de k pontos.
+        """
+        posicoes = np.full((len(lats), k), -1, dtype=np.int64)
+        distancias = np.full((len(lats), k), np.nan)
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            p, d = self.vizinhos(lat, lon, k, mascara)
+            posicoes[i, :len(p)], distancias[i, :len(d)] = p, d
+        return posicoes, distancias
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+from deteccao_encoding import read_csv_com_encoding
+from conversao_colunar import ler_convertido
+
+# Quantidade de linhas lidas para inferir o esquema do arquivo
+LINHAS_AMOSTRA = 10000
+
+# Proporção máxima de valores distintos (na amostra) para um texto virar categórico
+LIMITE_CARDINALIDADE = 0.5
+
+
+def _megabytes(n_bytes):
+    return n_bytes / (1024 * 1024)
+
+
+def memoria_dataframe(df):
+    """
+    Retorna a memória ocupada por um DataFrame, em bytes, incluindo o
+    conteúdo das strings.
+    """
+    return int(df.memory_usage(deep=True).sum())
+
+
+def inferir_dtypes(amostra, limite_cardinalidade=LIMITE_CARDINALIDADE):
+    """
+    Analisa uma amostra do arquivo e retorna o dicionário de dtypes a ser
+    passado ao `read_csv` na leitura completa.
+
+    Apenas os textos de baixa cardinalidade são definidos aqui (como
+    'category'), pois essa conversão é válida para qualquer valor que apareça
+    depois da amostra. Os números são reduzidos depois da leitura, em
+    `otimizar_tipos`, com base nos valores reais.
+    """
+    dtypes = {}
+    for col in amostra.columns:
+        serie = amostra[col]
+        if not (pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie)):
+            continue
+        if _e_booleano(serie):
+            continue
+        if serie.nunique(dropna=True) <= limite_cardinalidade * len(serie):
+            dtypes[col] = 'category'
+    return dtypes
+
+
+def _e_booleano(serie):
+    """
+    Verifica se uma coluna de texto contém apenas valores TRUE/FALSE (com
+    possíveis valores ausentes).
+    """
+    valores = serie.dropna()
+    if valores.empty:
+        return False
+    return valores.astype(str).str.upper().isin(['TRUE', 'FALSE']).all()
+
+
+def _reduzir_float(serie):
+    """
+    Converte para float32 somente quando todos os valores sobrevivem à
+    conversão sem perda de precisão.
+    """
+    convertida = serie.astype(np.float32)
+    if np.array_equal(convertida.to_numpy(dtype=np.float64), serie.to_numpy(), equal_nan=True):
+        return convertida
+    return serie
+
+
+def otimizar_tipos(df, limite_cardinalidade=LIMITE_CARDINALIDADE, ignorar=()):
+    """
+    Reduz os tipos de um DataFrame já carregado (exceto as colunas em
+    `ignorar`, já codificadas pelo chamador), sem nunca alargar uma coluna:
+
+    * inteiros para int8/int16/int32 conforme o intervalo dos valores (as
+      somas do pandas já acumulam em int64);
+    * floats para float32 quando não há perda de precisão;
+    * textos TRUE/FALSE para bool (ou 'boolean' quando há valores ausentes);
+    * textos de baixa cardinalidade para 'category'.
+
+    Returns:
+        Um novo DataFrame com os tipos reduzidos.
+    """
+    df = df.copy()
+    for col in df.columns:
+        serie = df[col]
+        if col in ignorar or pd.api.types.is_bool_dtype(serie) or isinstance(serie.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(serie):
+            reduzida = pd.to_numeric(serie, downcast='integer')
+            if reduzida.dtype.itemsize < serie.dtype.itemsize:
+                df[col] = reduzida
+        elif pd.api.types.is_float_dtype(serie):
+            df[col] = _reduzir_float(serie)
+        elif pd.api.types.is_object_dtype(serie) or pd.api.types.is_string_dtype(serie):
+            if _e_booleano(serie):
+                booleana = serie.astype(str).str.upper().eq('TRUE').where(serie.notna())
+                df[col] = booleana.astype('boolean' if serie.isna().any() else bool)
+            elif serie.nunique(dropna=True) <= limite_cardinalidade * len(serie):
+                df[col] = serie.astype('category')
+    return df
+
+
+def relatorio_memoria(antes, depois, descricao='', estimado=False):
+    """
+    Imprime a memória antes e depois da otimização dos tipos. Com
+    `estimado`, o valor de antes é marcado como estimativa.
+    """
+    reducao = (1 - depois / antes) * 100 if antes else 0
+    rotulo = " (estimativa)" if estimado else ""
+    print(f"Memória {descricao}: {_megabytes(antes):.2f} MB{rotulo} -> {_megabytes(depois):.2f} MB ({reducao:.1f}% menor)")
+
+
+def read_csv_otimizado(caminho, linhas_amostra=LINHAS_AMOSTRA, relatorio=True, **kwargs):
+    """
+    Lê um CSV com tipos reduzidos.
+
+    Uma amostra de `linhas_amostra` linhas é lida primeiro para inferir o
+    esquema; o arquivo completo é então lido já com as colunas de texto
+    categóricas, e os números são reduzidos em seguida. Se o CSV já foi
+    convertido para Feather (veja `conversao_colunar`), o arquivo convertido
+    é lido no lugar do CSV.
+
+    Args:
+        caminho: O caminho do arquivo CSV.
+        linhas_amostra: Quantidade de linhas usada na inferência.
+        relatorio: Se True, imprime a memória antes e depois.
+        **kwargs: Parâmetros adicionais repassados ao `read_csv`.
+
+    Returns:
+        O DataFrame com tipos reduzidos.
+    """
+    if not kwargs:
+        df = ler_convertido(caminho)
+        if df is not None:
+            antes = memoria_dataframe(df)
+            df = otimizar_tipos(df)
+            if relatorio:
+                relatorio_memoria(antes, memoria_dataframe(df), descricao=f"de {caminho}")
+            return df
+
+    dtypes_informados = kwargs.pop('dtype', {})
+    amostra = read_csv_com_encoding(caminho, nrows=linhas_amostra, dtype=dtypes_informados, **kwargs)
+    dtypes = {**inferir_dtypes(amostra), **dtypes_informados}
+
+    df = read_csv_com_encoding(caminho, dtype=dtypes, **kwargs)
+    df = otimizar_tipos(df)
+
+    if relatorio:
+        # O arquivo completo não é lido sem tipos; a memória "antes" é
+        # estimada a partir da amostra
+        por_linha = memoria_dataframe(amostra) / max(len(amostra), 1)
+        relatorio_memoria(por_linha * len(df), memoria_dataframe(df), descricao=f"de {caminho}", estimado=True)
+    return df
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+
+def _dias(datas):
+    """
+    Converte datas para a quantidade de dias desde 1970-01-01 (int64),
+    retornando também a máscara das datas ausentes.
+    """
+    datas = np.asarray(pd.to_datetime(datas), dtype='datetime64[D]')
+    ausentes = np.isnat(datas)
+    return datas.view(np.int64), ausentes
+
+
+def _valores(valores, n):
+    """
+    Converte os valores dos intervalos para int64 (valores inteiros, como
+    centavos) ou float64, com os ausentes valendo zero.
+    """
+    if valores is None:
+        return np.zeros(n, dtype=np.int64)
+    valores = pd.Series(valores) if not isinstance(valores, pd.Series) else valores
+    if pd.api.types.is_integer_dtype(valores):
+        return valores.to_numpy(dtype=np.int64, na_value=0)
+    return np.nan_to_num(valores.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def ativos_por_periodo(inicios, fins, valores=None, grupos=None, freq='ME', inicio=None, fim=None):
+    """
+    Calcula, para cada data de uma grade (diária ou mensal), a quantidade de
+    intervalos ativos e a soma dos seus valores, opcionalmente por grupo.
+
+    Um intervalo está ativo na data t quando inicio <= t <= fim (o fim
+    ausente significa que o intervalo continua aberto). Em vez de percorrer
+    as linhas, os eventos de início e de fim são ordenados uma única vez
+    (com o grupo na chave) e cada ponto da grade é respondido por busca
+    binária nas somas acumuladas dos eventos: O(n log n + G·T log n).
+
+    Args:
+        inicios: Datas de início (ex: admissão).
+        fins: Datas de fim (ex: demissão); NaT para intervalos abertos.
+        valores: Valor de cada intervalo somado enquanto ativo (ex: salário).
+            None para contar apenas. Valores inteiros (ex: centavos) são
+            somados em aritmética inteira.
+        grupos: Grupo de cada intervalo (ex: departamento). None para o total.
+        freq: Frequência da grade do pandas ('D' diária, 'ME' fim de mês).
+        inicio: Primeira data da grade (padrão: o primeiro início).
+        fim: Última data da grade (padrão: o fim do período que contém o
+            último início ou fim).
+
+    Returns:
+        Uma tupla (quantidade, soma) de DataFrames indexados pelas datas da
+        grade, com uma coluna por grupo.
+    """
+    dias_inicio, sem_inicio = _dias(inicios)
+    dias_fim, sem_fim = _dias(fins)
+    valores = _valores(valores, len(dias_inicio))
+
+    if grupos is None:
+        codigos, rotulos = np.zeros(len(dias_inicio), dtype=np.int64), pd.Index(['total'])
+    else:
+        codigos, rotulos = pd.factorize(grupos, sort=True)
+
+    validos = ~sem_inicio & (codigos >= 0)
+    dias_inicio, dias_fim, sem_fim = dias_inicio[validos], dias_fim[validos], sem_fim[validos]
+    codigos, valores = codigos[validos], valores[validos]
+
+    dias_saida = dias_fim[~sem_fim] + 1
+    if not len(dias_inicio) and (inicio is None or fim is None):
+        vazio = pd.DataFrame(columns=rotulos, index=pd.DatetimeIndex([]), dtype=valores.dtype)
+        return vazio, vazio.copy()
+    if inicio is None:
+        inicio = np.datetime64(int(dias_inicio.min()), 'D')
+    if fim is None:
+        # A grade vai até o período que contém o último evento (ex: o fim do mês)
+        ultimo = np.datetime64(int(max(dias_inicio.max(), dias_fim[~sem_fim].max(initial=dias_inicio.max()))), 'D')
+        fim = pd.tseries.frequencies.to_offset(freq).rollforward(pd.Timestamp(ultimo))
+    grade = pd.date_range(inicio, fim, freq=freq)
+    dias_grade, _ = _dias(grade)
+
+    # Cada grupo ocupa uma faixa de chaves: grupo * largura + dia relativo
+    todos = np.concatenate([dias_inicio, dias_saida, dias_grade])
+    origem = todos.min() if len(todos) else 0
+    largura = int(todos.max() - origem + 1) if len(todos) else 1
+
+    def contar(codigos_evento, dias_evento, valores_evento):
+        chaves = codigos_evento * largura + (dias_evento - origem)
+        ordem = np.argsort(chaves, kind='stable')
+        chaves = chaves[ordem]
+        acumulado = np.concatenate([np.zeros(1, dtype=valores.dtype), np.cumsum(valores_evento[ordem])])
+
+        grupos_consulta = np.arange(len(rotulos))[:, None] * largura
+        primeiro = np.searchsorted(chaves, grupos_consulta, side='left')
+        ultimo = np.searchsorted(chaves, grupos_consulta + (dias_grade - origem)[None, :], side='right')
+        return ultimo - primeiro, acumulado[ultimo] - acumulado[primeiro]
+
+    # O fim é inclusivo: o intervalo deixa de contar no dia seguinte
+    n_inicios, s_inicios = contar(codigos, dias_inicio, valores)
+    n_fins, s_fins = contar(codigos[~sem_fim], dias_saida, valores[~sem_fim])
+
+    quantidade = pd.DataFrame((n_inicios - n_fins).T, index=grade, columns=rotulos)
+    soma = pd.DataFrame((s_inicios - s_fins).T, index=grade, columns=rotulos)
+    return quantidade, soma
@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 import unicodedata
 import re
 import numpy as np
+from cache_colunar import com_cache_colunar
+from conversao_colunar import ler_csv
 
 # Função para converter nomes de colunas em snake_case sem acentos
 def normalize_column_name(column_name):
@@ -14,8 +16,9 @@ def normalize_column_name(column_name):
     return column_name.lower()
 
 # Carregar e tratar o CSV
+@com_cache_colunar(versao=1)
 def load_and_preprocess_csv(file_path):
-    df = pd.read_csv(file_path, encoding='utf-8')
+    df = ler_csv(file_path, encoding='utf-8')
     df.columns = [normalize_column_name(col) for col in df.columns]
     return df
 
@@ -0,0 +1,263 @@
+import os
+import unicodedata
+import numpy as np
+import pandas as pd
+from cache_colunar import DIRETORIO_CACHE, hash_arquivo, ler_tabela, gravar_tabela, remover_versoes_antigas
+from conversao_colunar import ler_csv
+
+CAMINHO_HOSPITAIS = "./assets/datasets/cms/hospital-general-information/HospInfo.csv"
+CAMINHO_DEMOGRAFIA = "./assets/datasets/ahmedmohamed2003/county-level-demographic-population-race-gender/demographic_data.csv"
+
+# Versão da junção gravada no cache. Incremente sempre que a normalização mudar.
+VERSAO = 1
+
+# Código FIPS que indica um hospital sem condado (ou estado) correspondente
+SEM_FIPS = -1
+
+# Sigla -> (nome, código FIPS) dos estados e territórios
+ESTADOS = {
+    'AL': ('Alabama', 1), 'AK': ('Alaska', 2), 'AZ': ('Arizona', 4), 'AR': ('Arkansas', 5),
+    'CA': ('California', 6), 'CO': ('Colorado', 8), 'CT': ('Connecticut', 9), 'DE': ('Delaware', 10),
+    'DC': ('District of Columbia', 11), 'FL': ('Florida', 12), 'GA': ('Georgia', 13), 'HI': ('Hawaii', 15),
+    'ID': ('Idaho', 16), 'IL': ('Illinois', 17), 'IN': ('Indiana', 18), 'IA': ('Iowa', 19),
+    'KS': ('Kansas', 20), 'KY': ('Kentucky', 21), 'LA': ('Louisiana', 22), 'ME': ('Maine', 23),
+    'MD': ('Maryland', 24), 'MA': ('Massachusetts', 25), 'MI': ('Michigan', 26), 'MN': ('Minnesota', 27),
+    'MS': ('Mississippi', 28), 'MO': ('Missouri', 29), 'MT': ('Montana', 30), 'NE': ('Nebraska', 31),
+    'NV': ('Nevada', 32), 'NH': ('New Hampshire', 33), 'NJ': ('New Jersey', 34), 'NM': ('New Mexico', 35),
+    'NY': ('New York', 36), 'NC': ('North Carolina', 37), 'ND': ('North Dakota', 38), 'OH': ('Ohio', 39),
+    'OK': ('Oklahoma', 40), 'OR': ('Oregon', 41), 'PA': ('Pennsylvania', 42), 'RI': ('Rhode Island', 44),
+    'SC': ('South Carolina', 45), 'SD': ('South Dakota', 46), 'TN': ('Tennessee', 47), 'TX': ('Texas', 48),
+    'UT': ('Utah', 49), 'VT': ('Vermont', 50), 'VA': ('Virginia', 51), 'WA': ('Washington', 53),
+    'WV': ('West Virginia', 54), 'WI': ('Wisconsin', 55), 'WY': ('Wyoming', 56), 'AS': ('American Samoa', 60),
+    'GU': ('Guam', 66), 'MP': ('Northern Mariana Islands', 69), 'PR': ('Puerto Rico', 72),
+    'VI': ('U.S. Virgin Islands', 78),
+}
+
+# Sufixos do tipo de condado removidos dos nomes ("Harris County" == "HARRIS")
+_SUFIXOS_CONDADO = r'\s+(?:city and borough|census area|planning region|municipality|municipio|county|parish|borough)$'
+
+
+def _sem_acentos(texto):
+    return ''.join(c for c in unicodedata.normalize('NFKD', texto) if not unicodedata.combining(c))
+
+
+def _por_valor_distinto(serie, funcao):
+    """
+    Aplica `funcao` (que recebe e retorna uma série) apenas aos valores
+    distintos de `serie` e espalha o resultado para as linhas.
+    """
+    codigos, valores = pd.factorize(serie)
+    resultado = funcao(pd.Series(valores, dtype=object)).to_numpy()
+    return resultado, codigos
+
+
+def codigos_estado(serie):
+    """
+    Converte uma coluna de estados, por sigla ("TX") ou por nome ("Texas"),
+    sem diferenciar maiúsculas de minúsculas, para o código FIPS do estado.
+
+    Returns:
+        Um array int32, com `SEM_FIPS` para estados desconhecidos.
+    """
+    mapa = {}
+    for sigla, (nome, codigo) in ESTADOS.items():
+        mapa[sigla.casefold()] = codigo
+        mapa[nome.casefold()] = codigo
+
+    def converter(valores):
+        return valores.astype(str).str.strip().str.casefold().map(mapa).fillna(SEM_FIPS)
+
+    tabela, codigos = _por_valor_distinto(serie, converter)
+    tabela = np.append(tabela, SEM_FIPS).astype(np.int32)
+    return tabela[codigos]
+
+
+def normalizar_condado(serie):
+    """
+    Normaliza nomes de condado para comparação: sem acentos, em minúsculas,
+    sem o sufixo do tipo ("County", "Parish", "Borough", ...), com "St."
+    escrito por extenso e sem pontuação nem espaços. Ex: "St. Mary's County"
+    e "SAINT MARYS" viram "saintmarys"; "Miami-Dade County" e "MIAMI-DADE"
+    viram "miamidade". As cidades independentes ("Baltimore city") mantêm o
+    "city", para não colidirem com o condado de mesmo nome.
+
+    Returns:
+        Um array de textos (None para valores ausentes).
+    """
+    def converter(valores):
+        texto = valores.astype(str).map(_sem_acentos).str.casefold().str.strip()
+        texto = texto.str.replace(_SUFIXOS_CONDADO, '', regex=True)
+        texto = texto.str.replace(r'\bste\.?\s', 'sainte ', regex=True).str.replace(r'\bst\.?\s', 'saint ', regex=True)
+        return texto.str.replace(r'[^a-z0-9]', '', regex=True)
+
+    tabela, codigos = _por_valor_distinto(serie, converter)
+    tabela = np.append(tabela, None).astype(object)
+    return tabela[codigos]
+
+
+def carregar_condados(caminho=CAMINHO_DEMOGRAFIA):
+    """
+    Lê a tabela demográfica dos condados com o FIPS como inteiro e a chave
+    normalizada (código do estado, nome do condado) usada na junção.
+    """
+    df = ler_csv(caminho, usecols=['County', 'State', 'FIPS', 'Total Population'])
+    return pd.DataFrame({
+        'fips': pd.to_numeric(df['FIPS'], errors='coerce').fillna(SEM_FIPS).to_numpy(dtype=np.int32),
+        'county': df['County'].to_numpy(dtype=object),
+        'state': df['State'].to_numpy(dtype=object),
+        'total_population': pd.to_numeric(df['Total Population'], errors='coerce').fillna(0).to_numpy(dtype=np.int64),
+        'codigo_estado': codigos_estado(df['State']),
+        'chave_condado': normalizar_condado(df['County']),
+    })
+
+
+def fips_dos_hospitais(hospitais, condados):
+    """
+    Junta os hospitais aos condados por (código do estado, nome normalizado)
+    com uma tabela hash (pd.MultiIndex.get_indexer): cada nome distinto é
+    normalizado uma única vez e cada linha é resolvida por uma consulta à
+    tabela, sem comparar textos linha a linha.
+
+    Args:
+        hospitais: DataFrame com as colunas 'State' e 'County Name' do HospInfo.
+        condados: Tabela retornada por `carregar_condados`.
+
+    Returns:
+        Um array int32 com o FIPS do condado de cada hospital (`SEM_FIPS`
+        quando não há correspondência).
+    """
+    referencia = pd.MultiIndex.from_arrays([condados['codigo_estado'].to_numpy(), condados['chave_condado'].to_numpy()])
+    estados = codigos_estado(hospitais['State'])
+    chaves = normalizar_condado(hospitais['County Name'])
+    posicoes = referencia.get_indexer(pd.MultiIndex.from_arrays([estados, chaves]))
+
+    # Cidades independentes às vezes vêm sem o "city" ("SALEM" -> "Salem city")
+    faltantes = np.flatnonzero((posicoes < 0) & (chaves != None))  # noqa: E711
+    if len(faltantes):
+        cidades = pd.MultiIndex.from_arrays([estados[faltantes], chaves[faltantes] + 'city'])
+        posicoes[faltantes] = referencia.get_indexer(cidades)
+    fips = condados['fips'].to_numpy()[posicoes]
+    return np.where(posicoes >= 0, fips, SEM_FIPS).astype(np.int32)
+
+
+def _por_100k(contagens, populacao):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(populacao > 0, contagens / populacao * 100_000, np.nan)
+
+
+def calcular_metricas(hospitais, condados):
+    """
+    Calcula hospitais e hospitais com emergência por 100 mil habitantes, por
+    condado e por estado. As contagens são feitas com np.bincount sobre as
+    posições da junção. Hospitais sem condado correspondente ainda contam
+    no estado, quando o estado é reconhecido.
+
+    Returns:
+        Uma tupla (por_condado, por_estado) de DataFrames indexados pelo FIPS.
+    """
+    fips = fips_dos_hospitais(hospitais, condados)
+    emergencia = hospitais['Emergency Services'].astype(str).str.strip().str.casefold().eq('true').to_numpy()
+
+    posicoes = pd.Index(condados['fips']).get_indexer(fips)
+    encontrados = posicoes >= 0
+    n = len(condados)
+    populacao = condados['total_population'].to_numpy()
+    por_condado = condados[['fips', 'county', 'state', 'total_population']].assign(
+        hospitais=np.bincount(posicoes[encontrados], minlength=n),
+        hospitais_emergencia=np.bincount(posicoes[encontrados & emergencia], minlength=n),
+    )
+    por_condado['hospitais_por_100k'] = _por_100k(por_condado['hospitais'].to_numpy(), populacao)
+    por_condado['emergencia_por_100k'] = _por_100k(por_condado['hospitais_emergencia'].to_numpy(), populacao)
+
+    estados = codigos_estado(hospitais['State'])
+    conhecidos = estados != SEM_FIPS
+    siglas = {codigo: sigla for sigla, (_, codigo) in ESTADOS.items()}
+    populacao_estado = condados.groupby('codigo_estado')['total_population'].sum()
+    codigos = populacao_estado.index.to_numpy()
+    tamanho = max(ESTADOS.values(), key=lambda e: e[1])[1] + 1
+    hosp_estado = np.bincount(estados[conhecidos], minlength=tamanho)[codigos]
+    emerg_estado = np.bincount(estados[conhecidos & emergencia], minlength=tamanho)[codigos]
+    por_estado = pd.DataFrame({
+        'codigo_estado': codigos.astype(np.int32),
+        'sigla': [siglas[codigo] for codigo in codigos],
+        'state': [ESTADOS[siglas[codigo]][0] for codigo in codigos],
+        'total_population': populacao_estado.to_numpy(),
+        'hospitais': hosp_estado,
+        'hospitais_emergencia': emerg_estado,
+        'hospitais_por_100k': _por_100k(hosp_estado, populacao_estado.to_numpy()),
+        'emergencia_por_100k': _por_100k(emerg_estado, populacao_estado.to_numpy()),
+    })
+
+    sem_condado = int((~encontrados).sum())
+    if sem_condado:
+        print(f"Junção hospitais x condados: {sem_condado} de {len(fips)} hospitais sem condado correspondente.")
+    return por_condado.set_index('fips'), por_estado.set_index('codigo_estado')
+
+
+# Métricas já calculadas nesta execução, por (hash dos hospitais, hash da demografia)
+_metricas = {}
+
+# Hash de cada arquivo já lido nesta execução: caminho -> ((tamanho, mtime_ns), hash)
+_hashes = {}
+
+
+def _hash_memorizado(caminho):
+    """
+    Hash do conteúdo do arquivo, recalculado só quando o tamanho ou a data de
+    modificação mudam; as consultas repetidas custam apenas um `os.stat`.
+    """
+    estado = os.stat(caminho)
+    assinatura = (estado.st_size, estado.st_mtime_ns)
+    chave = os.path.abspath(caminho)
+    if chave not in _hashes or _hashes[chave][0] != assinatura:
+        _hashes[chave] = (assinatura, hash_arquivo(caminho))
+    return _hashes[chave][1]
+
+
+def metricas_per_capita(caminho_hospitais=CAMINHO_HOSPITAIS, caminho_demografia=CAMINHO_DEMOGRAFIA, diretorio_cache=None):
+    """
+    Retorna as métricas per capita por condado e por estado (veja
+    `calcular_metricas`).
+
+    A junção é feita uma única vez por conteúdo dos dois arquivos: o
+    resultado fica em memória durante a execução e gravado no cache colunar,
+    com o hash dos dois arquivos no nome, para as próximas execuções. Os
+    arquivos só são lidos de novo para o hash quando o tamanho ou a data de
+    modificação deles mudam.
+
+    Returns:
+        Uma tupla (por_condado, por_estado). Os DataFrames são compartilhados
+        entre as chamadas e não devem ser alterados.
+    """
+    hashes = (_hash_memorizado(caminho_hospitais), _hash_memorizado(caminho_demografia))
+    if hashes in _metricas:
+        return _metricas[hashes]
+
+    diretorio_cache = diretorio_cache or DIRETORIO_CACHE
+    prefixos = {nome: os.path.join(diretorio_cache, f"juncao_demografica.{nome}.v{VERSAO}") for nome in ('condados', 'estados')}
+    bases = {nome: f"{prefixo}-{hashes[0]}-{hashes[1]}" for nome, prefixo in prefixos.items()}
+
+    tabelas = {}
+    for nome, base_cache in bases.items():
+        for formato in ('feather', 'pkl'):
+            caminho_cache = f"{base_cache}.{formato}"
+            if os.path.exists(caminho_cache):
+                try:
+                    tabelas[nome] = ler_tabela(caminho_cache).set_index('fips' if nome == 'condados' else 'codigo_estado')
+                    break
+                except Exception as e:
+                    print(f"Cache inválido em {caminho_cache}, refazendo a junção: {e}")
+
+    if len(tabelas) == len(bases):
+        resultado = (tabelas['condados'], tabelas['estados'])
+    else:
+        hospitais = ler_csv(caminho_hospitais, usecols=['State', 'County Name', 'Emergency Services'])
+        resultado = calcular_metricas(hospitais, carregar_condados(caminho_demografia))
+        os.makedirs(diretorio_cache, exist_ok=True)
+        for (nome, base_cache), tabela in zip(bases.items(), resultado):
+            caminho_cache = gravar_tabela(tabela.reset_index(), base_cache)
+            if caminho_cache:
+                remover_versoes_antigas(prefixos[nome], {caminho_cache})
+
+    _metricas[hashes] = resultado
+    return resultado
@@ -1,41 +1,212 @@
 import os
-import kagglehub
+import json
 import shutil
+import hashlib
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from cache_colunar import DIRETORIO_CACHE, hash_arquivo
+from conversao_colunar import converter_datasets
 
-def copiar_arquivos(caminho_origem, caminho_destino):
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Os manifestos da sincronização ficam no cache, um por diretório de destino
+DIRETORIO_SINCRONIZACAO = os.path.join(DIRETORIO_CACHE, "sincronizacao")
+
+# ioctl do Linux que cria um reflink (cópia compartilhando blocos, copy-on-write)
+FICLONE = 0x40049409
+
+# Quantidade de cópias simultâneas
+MAX_THREADS = 8
+
+# Quantidade de datasets baixados simultaneamente
+MAX_DOWNLOADS = 4
+
+# Origens disponíveis para os datasets: {nome: fabrica(**opcoes) -> baixar(dataset)}
+ORIGENS = {}
+
+
+def _caminho_manifesto_sincronizacao(caminho_destino):
+    chave = hashlib.blake2b(os.path.abspath(caminho_destino).encode('utf-8'), digest_size=16).hexdigest()
+    nome = os.path.basename(os.path.normpath(caminho_destino))
+    return os.path.join(DIRETORIO_SINCRONIZACAO, f"{nome}.{chave}.json")
+
+
+def _ler_manifesto_sincronizacao(caminho_destino):
+    try:
+        with open(_caminho_manifesto_sincronizacao(caminho_destino), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _gravar_manifesto_sincronizacao(caminho_destino, manifesto):
+    caminho = _caminho_manifesto_sincronizacao(caminho_destino)
+    os.makedirs(DIRETORIO_SINCRONIZACAO, exist_ok=True)
+    temporario = f"{caminho}.tmp{os.getpid()}"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=1, sort_keys=True)
+    os.replace(temporario, caminho)
+
+
+def listar_arquivos(caminho):
+    """
+    Lista recursivamente os arquivos de um diretório.
+
+    Returns:
+        Uma lista com os caminhos relativos a `caminho`, usando '/' como separador.
+    """
+    arquivos = []
+    for raiz, diretorios, nomes in os.walk(caminho):
+        diretorios.sort()
+        relativo = os.path.relpath(raiz, caminho)
+        for nome in sorted(nomes):
+            arquivos.append(nome if relativo == '.' else f"{relativo}/{nome}".replace(os.sep, '/'))
+    return arquivos
+
+
+def _reflink(origem, destino):
+    """
+    Cria `destino` como um reflink de `origem` (btrfs, XFS). Gera OSError
+    quando o sistema de arquivos não suporta.
     """
-    Copia todos os arquivos de um diretório para outro.
+    if fcntl is None:
+        raise OSError("reflink não suportado nesta plataforma")
+    with open(origem, 'rb') as f_origem, open(destino, 'wb') as f_destino:
+        fcntl.ioctl(f_destino.fileno(), FICLONE, f_origem.fileno())
+    shutil.copystat(origem, destino)
+
+
+def vincular_ou_copiar(origem, destino, vincular=True):
+    """
+    Coloca uma cópia de `origem` em `destino` de forma atômica. Quando
+    `vincular` é True, tenta primeiro um reflink (sem copiar os dados,
+    possível apenas no mesmo sistema de arquivos); se não funcionar, copia o
+    arquivo com `shutil.copy2`. Hardlinks não são usados: o destino e o cache
+    do Kaggle Hub seriam o mesmo arquivo, e editar um alteraria o outro.
+
+    Returns:
+        O método usado: 'reflink' ou 'copia'.
+    """
+    temporario = f"{destino}.tmp{os.getpid()}"
+    metodos = [('reflink', _reflink)] if vincular else []
+    metodos.append(('copia', shutil.copy2))
+    for metodo, funcao in metodos:
+        try:
+            funcao(origem, temporario)
+            os.replace(temporario, destino)
+            return metodo
+        except OSError:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            if metodo == 'copia':
+                raise
+
+
+def _sincronizar_arquivo(caminho_origem, caminho_destino, relativo, registro, vincular):
+    """
+    Sincroniza um arquivo. O hash só é calculado quando o tamanho ou a data
+    de modificação mudaram, para distinguir um arquivo regravado com o mesmo
+    conteúdo de um arquivo realmente alterado. Sem registro no manifesto
+    (primeira sincronização ou manifesto apagado), um destino do mesmo
+    tamanho é comparado pelo hash antes de ser copiado de novo.
+
+    Returns:
+        Uma tupla (relativo, situacao, registro), com a situação 'copiado',
+        'ignorado' ou 'falha' (neste caso o registro é a mensagem de erro).
+    """
+    origem = os.path.join(caminho_origem, relativo)
+    destino = os.path.join(caminho_destino, relativo)
+    try:
+        estado = os.stat(origem)
+        atual = {'tamanho': estado.st_size, 'mtime_ns': estado.st_mtime_ns}
+        existe = os.path.isfile(destino) and os.path.getsize(destino) == estado.st_size
+
+        if existe and registro and registro['tamanho'] == estado.st_size:
+            if registro['mtime_ns'] == estado.st_mtime_ns:
+                return relativo, 'ignorado', registro
+            conteudo = hash_arquivo(origem)
+            if conteudo == registro['hash']:
+                return relativo, 'ignorado', {**atual, 'hash': conteudo}
+        else:
+            conteudo = hash_arquivo(origem)
+            if existe and registro is None and hash_arquivo(destino) == conteudo:
+                return relativo, 'ignorado', {**atual, 'hash': conteudo}
+
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        vincular_ou_copiar(origem, destino, vincular)
+        return relativo, 'copiado', {**atual, 'hash': conteudo}
+    except OSError as e:
+        return relativo, 'falha', str(e)
+
+
+def copiar_arquivos(caminho_origem, caminho_destino, vincular=True, max_threads=MAX_THREADS):
+    """
+    Sincroniza os arquivos de um diretório com outro, copiando apenas os
+    arquivos novos ou alterados. Os arquivos sincronizados antes e que não
+    existem mais na origem são removidos do destino.
+
+    Um manifesto no cache guarda o caminho relativo, o tamanho, a data de
+    modificação e o hash de cada arquivo sincronizado no destino. As cópias são
+    feitas em um pool de threads e usam reflinks ou cópia (o reflink, sem
+    copiar os dados, só quando origem e destino estão no mesmo sistema de
+    arquivos).
 
     Args:
         caminho_origem: O caminho do diretório de origem.
         caminho_destino: O caminho do diretório de destino.
+        vincular: Se True, tenta um reflink antes de copiar.
+        max_threads: Quantidade máxima de cópias simultâneas.
+
+    Returns:
+        Um dicionário com as listas 'copiados', 'ignorados', 'removidos' e
+        'falhas' (esta com tuplas (caminho, erro)).
     """
+    # Verifica se os caminhos existem
+    if not os.path.isdir(caminho_origem):
+        raise FileNotFoundError(f"Diretório de origem '{caminho_origem}' não encontrado.")
+    os.makedirs(caminho_destino, exist_ok=True)
 
-    try:
-        # Verifica se os caminhos existem
-        if not os.path.exists(caminho_origem):
-            raise FileNotFoundError(f"Diretório de origem '{caminho_origem}' não encontrado.")
-        if not os.path.exists(caminho_destino):
-            raise FileNotFoundError(f"Diretório de destino '{caminho_destino}' não encontrado.")
-
-        # Itera sobre os arquivos e subdiretórios no diretório de origem
-        for item in os.listdir(caminho_origem):
-            caminho_completo_origem = os.path.join(caminho_origem, item)
-            caminho_completo_destino = os.path.join(caminho_destino, item)
-
-            # Se for um arquivo, copia
-            if os.path.isfile(caminho_completo_origem):
-                shutil.copy2(caminho_completo_origem, caminho_completo_destino)  # Use copy2 para preservar metadados
-
-            # Se for um subdiretório, chama a função recursivamente
-            elif os.path.isdir(caminho_completo_origem):
-                # Cria o subdiretório correspondente no destino (se não existir)
-                os.makedirs(caminho_completo_destino, exist_ok=True)
-                copiar_arquivos(caminho_completo_origem, caminho_completo_destino)
-
-    except Exception as e:
-        print(f"Erro ao copiar arquivos: {e}")
+    manifesto = _ler_manifesto_sincronizacao(caminho_destino)
+    resumo = {'copiados': [], 'ignorados': [], 'removidos': [], 'falhas': []}
+    novo_manifesto = {}
+    arquivos = listar_arquivos(caminho_origem)
+
+    with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        tarefas = [
+            executor.submit(_sincronizar_arquivo, caminho_origem, caminho_destino, relativo, manifesto.get(relativo), vincular)
+            for relativo in arquivos
+        ]
+        for tarefa in tarefas:
+            relativo, situacao, registro = tarefa.result()
+            if situacao == 'falha':
+                resumo['falhas'].append((relativo, registro))
+                continue
+            novo_manifesto[relativo] = registro
+            resumo['copiados' if situacao == 'copiado' else 'ignorados'].append(relativo)
+
+    # Arquivos que saíram da origem não devem continuar no destino
+    for relativo in sorted(set(manifesto) - set(arquivos)):
+        try:
+            os.remove(os.path.join(caminho_destino, relativo))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            resumo['falhas'].append((relativo, str(e)))
+            novo_manifesto[relativo] = manifesto[relativo]
+            continue
+        resumo['removidos'].append(relativo)
+
+    _gravar_manifesto_sincronizacao(caminho_destino, novo_manifesto)
+
+    print(f"Sincronização de '{caminho_destino}': {len(resumo['copiados'])} copiados, "
+          f"{len(resumo['ignorados'])} ignorados, {len(resumo['removidos'])} removidos, "
+          f"{len(resumo['falhas'])} falhas.")
+    for relativo, erro in resumo['falhas']:
+        print(f"  Falha ao copiar '{relativo}': {erro}")
+    return resumo
 
 def concatenar_path(caminho1, caminho2):
   """
@@ -50,38 +221,145 @@ def concatenar_path(caminho1, caminho2):
   """
 
   return os.path.join(caminho1, caminho2)
+def registrar_origem(nome):
+    """
+    Decorador que registra uma origem de datasets em `ORIGENS`. A função
+    registrada recebe as opções da origem e retorna uma função
+    `baixar(dataset)` que devolve o diretório local com os arquivos.
+    """
+    def decorador(fabrica):
+        ORIGENS[nome] = fabrica
+        return fabrica
+    return decorador
+
+
+@registrar_origem('kagglehub')
+def origem_kagglehub(**opcoes):
+    """
+    Baixa a última versão do dataset com o Kaggle Hub.
+    """
+    import kagglehub
+    return kagglehub.dataset_download
+
+
+@registrar_origem('espelho')
+def origem_espelho(diretorio=None, **opcoes):
+    """
+    Usa um diretório local com a mesma estrutura do Kaggle (<usuario>/<dataset>)
+    no lugar do Kaggle Hub, por exemplo para restaurar os datasets sem acesso
+    à rede.
+    """
+    if not diretorio:
+        raise ValueError("A origem 'espelho' exige o diretório do espelho (-espelho).")
+
+    def baixar(dataset):
+        caminho = concatenar_path(caminho1=diretorio, caminho2=dataset)
+        if not os.path.isdir(caminho):
+            raise FileNotFoundError(f"Dataset '{dataset}' não encontrado no espelho '{diretorio}'.")
+        return caminho
+    return baixar
+
+
+def ler_lista_datasets(caminho):
+    """
+    Lê um arquivo com um dataset por linha. Linhas vazias e comentários
+    (iniciados por '#') são ignorados.
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        linhas = (linha.split('#', 1)[0].strip() for linha in f)
+        return [linha for linha in linhas if linha]
+
+
+def baixar_dataset(dataset, baixar, caminho_destino):
+    """
+    Baixa um dataset e sincroniza os arquivos em <caminho_destino>/<dataset>.
+
+    Returns:
+        Uma tupla (diretorio_destino, resumo_da_sincronizacao).
+    """
+    path = baixar(dataset)
+    target_dir = concatenar_path(caminho1=caminho_destino, caminho2=dataset)
+    os.makedirs(target_dir, exist_ok=True)
+    return target_dir, copiar_arquivos(caminho_origem=path, caminho_destino=target_dir)
+
+
+def baixar_datasets(datasets, origem='kagglehub', caminho_destino="./assets/datasets/", max_workers=MAX_DOWNLOADS, converter=False, **opcoes):
+    """
+    Baixa e sincroniza vários datasets simultaneamente, em um pool de threads
+    limitado a `max_workers` datasets por vez. Opcionalmente, converte em
+    seguida os CSVs baixados para Feather (veja `conversao_colunar`).
+
+    Args:
+        datasets: Lista de datasets (ex: ['cms/hospital-general-information']).
+        origem: Nome da origem registrada em `ORIGENS`.
+        caminho_destino: Diretório base onde os datasets são gravados.
+        max_workers: Quantidade máxima de datasets processados ao mesmo tempo.
+        converter: Se True, converte os CSVs dos datasets para Feather.
+        **opcoes: Opções repassadas para a origem (ex: diretorio do espelho).
+
+    Returns:
+        Um dicionário {dataset: diretorio_destino} com os datasets concluídos
+        e um dicionário {dataset: erro} com as falhas.
+    """
+    if origem not in ORIGENS:
+        raise ValueError(f"Origem '{origem}' desconhecida. Disponíveis: {', '.join(ORIGENS)}")
+    baixar = ORIGENS[origem](**opcoes)
+    datasets = list(dict.fromkeys(datasets))
+
+    concluidos, falhas = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tarefas = {executor.submit(baixar_dataset, dataset, baixar, caminho_destino): dataset for dataset in datasets}
+        for tarefa, dataset in tarefas.items():
+            try:
+                target_dir, resumo = tarefa.result()
+            except Exception as e:
+                falhas[dataset] = str(e)
+                print(f"Erro ao importar o dataset '{dataset}': {e}")
+                continue
+            if resumo['falhas']:
+                falhas[dataset] = f"{len(resumo['falhas'])} arquivos não copiados"
+            concluidos[dataset] = target_dir
+
+    print(f"Datasets importados: {len(concluidos)} de {len(datasets)} ({len(falhas)} com falhas).")
+
+    if converter and concluidos:
+        for caminho, erro in converter_datasets(concluidos.values())['falhas']:
+            falhas.setdefault(os.path.relpath(caminho, caminho_destino), erro)
+    return concluidos, falhas
+
+
 def main():
-    parser = argparse.ArgumentParser(description="Script para download de dados de um dataset do Kaggle.")
+    parser = argparse.ArgumentParser(description="Script para download de dados de datasets do Kaggle.")
 
     # Adiciona argumentos
-    parser.add_argument("-dataset", dest="dataset", help="Nome do dataset no Kaggle Hub (ex: guilhermelima92/dados-demorficos)")
-    parser.add_argument("-target_path", dest="target_path", help="Caminho para salvar os dados (ex: ./assets/datasets)")
+    parser.add_argument("-dataset", dest="dataset", nargs='+', default=[], help="Nome de um ou mais datasets no Kaggle Hub (ex: guilhermelima92/dados-demorficos)")
+    parser.add_argument("-arquivo", dest="arquivo", help="Arquivo com um dataset por linha (ex: datasets.txt)")
+    parser.add_argument("-target_path", dest="target_path", default="./assets/datasets/", help="Caminho para salvar os dados (ex: ./assets/datasets)")
+    parser.add_argument("-origem", dest="origem", default="kagglehub", choices=sorted(ORIGENS), help="Origem dos datasets")
+    parser.add_argument("-espelho", dest="espelho", help="Diretório local usado pela origem 'espelho'")
+    parser.add_argument("-converter", dest="converter", action="store_true", help="Converte os CSVs baixados para Feather comprimido")
+    parser.add_argument("-max_workers", dest="max_workers", type=int, default=MAX_DOWNLOADS, help="Quantidade de datasets baixados ao mesmo tempo")
 
     # Faz o parsing dos argumentos
     args = parser.parse_args()
 
-    # Verifica se algum argumento foi fornecido
-    if args.dataset or args.target_path:
-        print(f"Importando dados do dataset Kaggle: {args.dataset}")
-
-        # Faz o download da última versão do dataset para o diretório especificado
-        path = kagglehub.dataset_download(args.dataset)
-        if not args.target_path:
-            args.target_path = "./assets/datasets/"
-
-        if args.target_path:
-            # Define o diretório de destino
-            target_dir = concatenar_path(caminho1=args.target_path,caminho2=args.dataset)
-            # Cria o diretório, se ele ainda não existir
-            os.makedirs(target_dir, exist_ok=True)
-            copiar_arquivos(caminho_origem=path,caminho_destino=target_dir)
-            print("Path to dataset files:", target_dir)
-        else: 
-            print("Path to dataset files:", path)
+    datasets = list(args.dataset)
+    if args.arquivo:
+        datasets += ler_lista_datasets(args.arquivo)
 
-        
+    # Verifica se algum dataset foi informado
+    if datasets:
+        print(f"Importando dados dos datasets Kaggle: {', '.join(datasets)}")
+        concluidos, falhas = baixar_datasets(
+            datasets, origem=args.origem, caminho_destino=args.target_path,
+            max_workers=args.max_workers, converter=args.converter, diretorio=args.espelho,
+        )
+        for dataset, target_dir in concluidos.items():
+            print("Path to dataset files:", target_dir)
+        if falhas:
+            raise SystemExit(1)
     else:
         print("Nenhum parâmetro foi informado. Utiliza -h")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# Quantidade de centavos em uma unidade monetária (R$ 1,00)
+CENTAVOS = 100
+
+
+def para_centavos(serie):
+    """
+    Converte uma coluna de valores monetários em unidades (reais) para
+    centavos inteiros (Int64, mantendo os valores ausentes). Textos no
+    formato brasileiro ("R$ 1.234,56") e com ponto decimal ("1234.56") também
+    são aceitos: o ponto só é tratado como separador de milhar quando há uma
+    vírgula decimal.
+
+    Cada valor é arredondado para o centavo mais próximo uma única vez, na
+    carga; a partir daí somas e consolidações são feitas em aritmética
+    inteira, exatas e independentes da ordem.
+
+    Raises:
+        ValueError: Se algum texto preenchido não for um valor monetário.
+    """
+    if not pd.api.types.is_numeric_dtype(serie):
+        texto = serie.astype('string').str.replace(r'R\$|\s', '', regex=True)
+        virgula_decimal = texto.str.contains(',', regex=False).fillna(False)
+        texto = texto.where(~virgula_decimal, texto.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+        numeros = pd.to_numeric(texto, errors='coerce')
+        invalidos = (texto.notna() & texto.ne('') & numeros.isna()).fillna(False)
+        if invalidos.any():
+            exemplos = serie[invalidos].head(5).tolist()
+            raise ValueError(f"Valores monetários inválidos em '{serie.name}': {exemplos}")
+        serie = numeros
+    if pd.api.types.is_integer_dtype(serie):
+        return serie.astype('Int64') * CENTAVOS
+    valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    centavos = pd.array(np.rint(valores * CENTAVOS), dtype='Float64').astype('Int64')
+    return pd.Series(centavos, index=serie.index, name=serie.name)
+
+
+def para_unidades(centavos):
+    """
+    Converte um valor (ou array) em centavos para unidades, apenas para exibição.
+    """
+    return np.asarray(centavos, dtype=np.float64) / CENTAVOS if np.ndim(centavos) else float(centavos) / CENTAVOS
+
+
+def centavos_numpy(serie):
+    """
+    Retorna os centavos de uma coluna como ndarray int64 (ausentes valem zero).
+    """
+    return serie.to_numpy(dtype=np.int64, na_value=0)
@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+# Colunas que guardam listas no formato literal do Python ("['A', 'B']")
+COLUNAS_LISTA = (
+    'directors', 'writers', 'stars', 'genres', 'countries_origin',
+    'filming_locations', 'production_companies', 'languages',
+)
+
+# Multiplicadores dos sufixos usados na contagem de votos ("187K", "1.2M")
+MULTIPLICADORES = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+# Separador entre dois itens da lista: "', '" (o repr do Python usa aspas
+# duplas quando o texto contém um apóstrofo: "O'Brien")
+PADRAO_SEPARADOR_LISTA = r"""['"], ['"]"""
+SEPARADOR = "\x1f"
+
+PADRAO_MOVIE_ID = r'tt(?P<movie_id>\d+)'
+PADRAO_DURACAO = r'^\s*(?:(?P<horas>\d+)\s*h)?\s*(?:(?P<minutos>\d+)\s*m)?\s*$'
+PADRAO_RANKING = r'^\s*(?:(?P<ranking>\d+)\.\s+)?(?P<titulo>.*?)\s*$'
+
+
+def _para_arrow(serie):
+    """
+    Converte uma coluna de texto para um array do pyarrow, sem cópia quando a
+    coluna já é armazenada em Arrow.
+    """
+    array = pa.array(serie, type=pa.string(), from_pandas=True)
+    return array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+
+
+def extrair_grupos(serie, padrao):
+    """
+    Extrai os grupos nomeados de uma expressão regular em uma coluna de texto.
+    Usa o `extract_regex` do pyarrow quando disponível (executado em C++) e o
+    `str.extract` do pandas como alternativa.
+
+    Returns:
+        Um DataFrame com uma coluna por grupo, alinhado ao índice da série.
+    """
+    if pa is None:
+        return serie.astype('string').str.extract(padrao)
+
+    resultado = pc.extract_regex(_para_arrow(serie), padrao)
+    return pd.DataFrame(
+        {campo.name: resultado.field(campo.name).to_pandas() for campo in resultado.type},
+        index=serie.index,
+    )
+
+
+def extrair_movie_id(links):
+    """
+    Extrai o identificador numérico do IMDB (tt0114709 -> 114709) a partir
+    da coluna "Movie Link".
+    """
+    grupos = extrair_grupos(links, PADRAO_MOVIE_ID)
+    return pd.to_numeric(grupos['movie_id'], errors='coerce').astype('Int64')
+
+
+def converter_votos(votos):
+    """
+    Converte a contagem de votos em texto ("187K", "1.2M", "950") para inteiro.
+    """
+    votos = votos.astype('string').str.strip().str.upper()
+    multiplicador = votos.str[-1].map(MULTIPLICADORES).astype('float64').fillna(1)
+    numero = pd.to_numeric(votos.str.rstrip('KMB').str.replace(',', '', regex=False), errors='coerce')
+    return (numero * multiplicador).round().astype('Int64')
+
+
+def converter_duracao(duracao):
+    """
+    Converte a duração em texto ("2h 4m", "45m", "2h") para minutos.
+    """
+    grupos = extrair_grupos(duracao, PADRAO_DURACAO)
+    horas = pd.to_numeric(grupos['horas'], errors='coerce')
+    minutos = pd.to_numeric(grupos['minutos'], errors='coerce')
+    total = horas.fillna(0) * 60 + minutos.fillna(0)
+    return total.where(horas.notna() | minutos.notna()).astype('Int16')
+
+
+def separar_ranking(titulos):
+    """
+    Separa o prefixo de ranking do título ("1. Toy Story" -> 1, "Toy Story").
+
+    Returns:
+        Uma tupla (ranking, titulo).
+    """
+    grupos = extrair_grupos(titulos, PADRAO_RANKING)
+    return pd.to_numeric(grupos['ranking'], errors='coerce').astype('Int32'), grupos['titulo']
+
+
+def _explodir_arrow(listas):
+    """
+    Separa os itens com as funções de texto do pyarrow, mantendo os dados em
+    Arrow até a codificação em dicionário.
+
+    Returns:
+        Uma tupla (quantidades, validos, valores): a quantidade de itens de
+        cada linha, a máscara dos itens não vazios e o categórico dos itens.
+    """
+    corpo = pc.utf8_slice_codeunits(_para_arrow(listas).fill_null(''), 2, -2)
+    separadas = pc.split_pattern_regex(corpo, PADRAO_SEPARADOR_LISTA)
+    quantidades = pc.list_value_length(separadas).to_numpy(zero_copy_only=False)
+
+    itens = pc.list_flatten(separadas)
+    validos = pc.not_equal(itens, '')
+    itens = itens.filter(validos)
+    if pc.any(pc.match_substring(itens, '\\')).as_py():
+        itens = pc.replace_substring_regex(itens, r"\\(.)", r"\1")
+
+    dicionario = itens.dictionary_encode()
+    valores = pd.Categorical.from_codes(
+        dicionario.indices.to_numpy(zero_copy_only=False),
+        categories=pd.Index(dicionario.dictionary.to_pylist(), dtype=object),
+    )
+    return quantidades, validos.to_numpy(zero_copy_only=False), valores
+
+
+def _explodir_pandas(listas):
+    """
+    Mesma separação de `_explodir_arrow`, usando apenas o pandas: os
+    separadores viram um caractere de controle e todos os itens são
+    separados com um único `split`.
+    """
+    corpo = listas.fillna('').astype(str).str.slice(2, -2)
+    corpo = corpo.str.replace(PADRAO_SEPARADOR_LISTA, SEPARADOR, regex=True)
+    quantidades = corpo.str.count(SEPARADOR).to_numpy() + 1
+
+    itens = np.array(SEPARADOR.join(corpo.tolist()).split(SEPARADOR), dtype=object)
+    validos = itens != ''
+    valores = pd.Series(itens[validos], dtype=object)
+    if valores.str.contains('\\', regex=False).any():
+        valores = valores.str.replace(r"\\(.)", r"\1", regex=True)
+    return quantidades, validos, pd.Categorical(valores.to_numpy())
+
+
+def explodir_lista(chaves, listas, nome='valor'):
+    """
+    Transforma uma coluna de listas em texto em uma tabela normalizada
+    (chaves do filme, valor), com os valores codificados em dicionário
+    (categórico).
+
+    Em vez de avaliar cada lista com `ast.literal_eval`, os colchetes e as
+    aspas externas são removidos e todos os itens são separados de uma vez;
+    cada item é associado ao filme pela quantidade de itens de cada linha.
+
+    Args:
+        chaves: Série com o identificador de cada filme, ou DataFrame com as
+            colunas da chave (ex: 'ano' e 'movie_id' no `catalogo_imdb`,
+            onde o mesmo movie_id pode aparecer em mais de um ano).
+        listas: Série com as listas em texto ("['A', 'B']").
+        nome: Nome da coluna de valores na tabela resultante.
+
+    Returns:
+        Um DataFrame com as colunas da chave e `nome`.
+    """
+    explodir = _explodir_arrow if pa is not None else _explodir_pandas
+    quantidades, validos, valores = explodir(listas)
+
+    # Listas vazias ("[]") e valores ausentes geram um item vazio, descartado
+    if isinstance(chaves, pd.Series):
+        chaves = chaves.to_frame()
+    tabela = {coluna: np.repeat(chaves[coluna].to_numpy(), quantidades)[validos] for coluna in chaves.columns}
+    tabela[nome] = valores
+    return pd.DataFrame(tabela)
+
+
+def processar_filmes(df):
+    """
+    Converte as colunas em texto dos CSVs do IMDB (já com os nomes
+    normalizados) para tipos numéricos e tabelas normalizadas. O 'movie_id'
+    já existente (ex: nas partições do `catalogo_imdb`) é reaproveitado;
+    senão é extraído do 'movie_link'.
+
+    Returns:
+        Uma tupla (filmes, listas), onde `filmes` é o DataFrame convertido
+        (sem as colunas de lista) e `listas` é um dicionário
+        {coluna: DataFrame(ano, movie_id, valor)}, a ser juntado aos filmes
+        pelas duas chaves ('ano' só existe quando vem do catálogo).
+    """
+    filmes = df.drop(columns=[coluna for coluna in COLUNAS_LISTA if coluna in df.columns])
+    if 'movie_id' not in filmes.columns and 'movie_link' in filmes.columns:
+        filmes.insert(0, 'movie_id', extrair_movie_id(filmes['movie_link']))
+    if 'title' in filmes.columns:
+        filmes['rank'], filmes['title'] = separar_ranking(filmes['title'])
+    if 'votes' in filmes.columns:
+        filmes['votes'] = converter_votos(filmes['votes'])
+    if 'duration' in filmes.columns:
+        filmes['duration_min'] = converter_duracao(filmes['duration'])
+        filmes = filmes.drop(columns='duration')
+    if 'mpa' in filmes.columns:
+        filmes['mpa'] = filmes['mpa'].astype('category')
+
+    chaves = filmes[[coluna for coluna in ('ano', 'movie_id') if coluna in filmes.columns]]
+    listas = {}
+    for coluna in COLUNAS_LISTA:
+        if coluna in df.columns:
+            listas[coluna] = explodir_lista(chaves, df[coluna], nome=coluna)
+
+    return filmes, listas
@@ -0,0 +1,130 @@
+import heapq
+import numpy as np
+import pandas as pd
+
+
+def posicoes_top_k(valores, k=10, maiores=True):
+    """
+    Posições dos `k` maiores (ou menores) valores de um array, do primeiro
+    para o último colocado, usando uma seleção parcial (`np.partition`, O(n))
+    em vez de ordenar o array inteiro; só os candidatos são ordenados.
+
+    Em caso de empate, as posições que aparecem primeiro vêm antes. Os
+    valores ausentes (NaN) só entram, no fim, quando há menos de `k` valores
+    válidos.
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    chaves = -valores if maiores else valores
+    ausentes = np.isnan(chaves)
+    validos = np.flatnonzero(~ausentes)
+    if len(validos) <= k:
+        candidatos = validos
+    else:
+        # Valor do k-ésimo colocado; todos os empatados com ele são candidatos
+        limite = np.partition(chaves[validos], k - 1)[k - 1]
+        candidatos = validos[chaves[validos] <= limite]
+
+    posicoes = candidatos[np.lexsort((candidatos, chaves[candidatos]))[:k]]
+    if len(posicoes) < k:
+        posicoes = np.concatenate([posicoes, np.flatnonzero(ausentes)[:k - len(posicoes)]])
+    return posicoes
+
+
+def top_k(serie, k=10, maiores=True):
+    """
+    Retorna os `k` maiores (ou menores) valores da série, como
+    `Series.nlargest(k)` / `Series.nsmallest(k)`, com os empates na ordem em
+    que aparecem na série (veja `posicoes_top_k`).
+    """
+    return serie.iloc[posicoes_top_k(serie.to_numpy(dtype=np.float64, na_value=np.nan), k, maiores)]
+
+
+def top_k_linhas(df, coluna, k=10, maiores=True):
+    """
+    Retorna as `k` linhas de `df` com os maiores (ou menores) valores de
+    `coluna`, como `df.sort_values(coluna).head(k)` sem a ordenação completa.
+    """
+    return df.iloc[posicoes_top_k(df[coluna].to_numpy(dtype=np.float64, na_value=np.nan), k, maiores)]
+
+
+def top_k_por_grupo(df, grupo, coluna, k=10, maiores=True):
+    """
+    Retorna as `k` linhas com os maiores (ou menores) valores de `coluna`
+    em cada grupo de `grupo` (ex: os 3 condados mais populosos de cada
+    estado). Linhas sem grupo são ignoradas.
+
+    As linhas são separadas por grupo com uma ordenação estável dos códigos
+    do grupo (inteiros pequenos, ordenados por radix sort em O(n)) e a seleção
+    parcial é feita dentro de cada grupo.
+
+    Returns:
+        As linhas de `df`, agrupadas na ordem dos grupos e, dentro de cada
+        grupo, do primeiro para o último colocado.
+    """
+    codigos, grupos = pd.factorize(df[grupo], sort=True)
+    tipo = np.int16 if len(grupos) < np.iinfo(np.int16).max else np.int64
+    ordem = np.argsort(codigos.astype(tipo), kind='stable')
+    limites = np.searchsorted(codigos[ordem], np.arange(len(grupos) + 1))
+
+    valores = df[coluna].to_numpy(dtype=np.float64, na_value=np.nan)
+    selecionadas = []
+    for inicio, fim in zip(limites[:-1], limites[1:]):
+        linhas = ordem[inicio:fim]
+        selecionadas.append(linhas[posicoes_top_k(valores[linhas], k, maiores)])
+    posicoes = np.concatenate(selecionadas) if selecionadas else np.zeros(0, dtype=np.int64)
+    return df.iloc[posicoes]
+
+
+class TopKIncremental:
+    """
+    Os `k` maiores (ou menores) valores de dados que só recebem acréscimos,
+    mantidos em um heap de tamanho `k`. Cada lote acrescentado passa por uma
+    seleção parcial e só os seus candidatos melhores que o último colocado
+    atual entram no heap: o custo de um acréscimo depende do lote, não do
+    total já visto.
+
+    Em caso de empate, os valores acrescentados primeiro vêm antes; valores
+    ausentes são ignorados.
+    """
+
+    def __init__(self, k=10, maiores=True):
+        self.k = k
+        self.maiores = maiores
+        self.heap = []  # (chave, -ordem, rotulo, valor); heap[0] é o último colocado
+        self.vistos = 0
+
+    def acrescentar(self, valores, rotulos=None):
+        """
+        Acrescenta um lote de valores (com os seus rótulos; por padrão a
+        ordem de chegada).
+        """
+        valores = np.asarray(valores)
+        rotulos = np.arange(self.vistos, self.vistos + len(valores)) if rotulos is None else np.asarray(rotulos)
+        chaves = valores.astype(np.float64) if self.maiores else -valores.astype(np.float64)
+
+        candidatos = posicoes_top_k(chaves, self.k)
+        candidatos = candidatos[~np.isnan(chaves[candidatos])]
+        if len(self.heap) == self.k:
+            candidatos = candidatos[chaves[candidatos] > self.heap[0][0]]
+        for posicao in candidatos:
+            item = (chaves[posicao], -(self.vistos + int(posicao)), rotulos[posicao], valores[posicao])
+            if len(self.heap) < self.k:
+                heapq.heappush(self.heap, item)
+            else:
+                heapq.heappushpop(self.heap, item)
+        self.vistos += len(valores)
+        return self
+
+    def copia(self):
+        copia = TopKIncremental(self.k, self.maiores)
+        copia.heap = list(self.heap)
+        copia.vistos = self.vistos
+        return copia
+
+    def resultado(self, nome=None):
+        """
+        Os valores atuais como série indexada pelos rótulos, do primeiro para
+        o último colocado.
+        """
+        itens = sorted(self.heap, reverse=True)
+        return pd.Series([item[3] for item in itens], index=[item[2] for item in itens], name=nome)
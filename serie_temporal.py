@@ -0,0 +1,150 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+from cache_colunar import DIRETORIO_CACHE, gravar_tabela, ler_tabela, remover_versoes_antigas
+from cache_resultados import impressao_digital
+
+# Chave usada para as datas ausentes (NaT): ficam sempre no fim da ordenação
+_FIM = np.iinfo(np.int64).max
+
+# Versão do formato da curva gravada no cache
+VERSAO = 3
+
+
+def _chaves(datas):
+    datas = np.asarray(datas, dtype='datetime64[ns]')
+    chaves = datas.view(np.int64).copy()
+    chaves[np.isnat(datas)] = _FIM
+    return chaves
+
+
+def _valores(valores):
+    """
+    Valores como ndarray: inteiros (ex: centavos) viram int64, para uma soma
+    acumulada exata, e os demais float64; os ausentes valem zero.
+    """
+    valores = valores if isinstance(valores, pd.Series) else pd.Series(np.asarray(valores))
+    if pd.api.types.is_integer_dtype(valores):
+        return valores.to_numpy(dtype=np.int64, na_value=0)
+    return np.nan_to_num(valores.to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+class CurvaAcumulada:
+    """
+    Soma acumulada de uma coluna de valores ordenada por uma coluna de datas.
+
+    A ordenação (índice de ordenação estável, com as datas ausentes no fim) e
+    a soma acumulada são calculadas uma única vez. Novas linhas são
+    incorporadas com `acrescentar`, que só recalcula a soma a partir do
+    ponto onde elas entram.
+    """
+
+    def __init__(self, rotulos, datas, acumulado):
+        self.rotulos = np.asarray(rotulos)
+        self.datas = np.asarray(datas, dtype='datetime64[ns]')
+        self.acumulado = np.asarray(acumulado)
+
+    @classmethod
+    def construir(cls, rotulos, datas, valores):
+        """
+        Ordena as linhas pela data e calcula a soma acumulada dos valores.
+        """
+        datas = np.asarray(datas, dtype='datetime64[ns]')
+        ordem = np.argsort(_chaves(datas), kind='stable')
+        valores = _valores(valores)[ordem]
+        return cls(np.asarray(rotulos)[ordem], datas[ordem], np.cumsum(valores))
+
+    @property
+    def total(self):
+        return self.acumulado[-1] if len(self.acumulado) else 0
+
+    def acrescentar(self, rotulos, datas, valores):
+        """
+        Incorpora novas linhas mantendo a ordenação. Quando todas as datas
+        novas são posteriores às existentes (o caso comum de admissões
+        recentes), a curva é apenas estendida; caso contrário, a soma é
+        recalculada somente a partir da primeira posição alterada.
+        """
+        nova = CurvaAcumulada.construir(rotulos, datas, valores)
+        if not len(nova.datas):
+            return self
+
+        chaves_novas = _chaves(nova.datas)
+        posicoes = np.searchsorted(_chaves(self.datas), chaves_novas, side='right')
+        valores_novos = np.diff(nova.acumulado, prepend=0)
+
+        inicio = posicoes[0]
+        valores = np.insert(np.diff(self.acumulado, prepend=0), posicoes, valores_novos)
+        anterior = self.acumulado[inicio - 1] if inicio else 0
+        acumulado = np.concatenate([self.acumulado[:inicio], np.cumsum(valores[inicio:]) + anterior])
+
+        self.rotulos = np.insert(self.rotulos, posicoes, nova.rotulos)
+        self.datas = np.insert(self.datas, posicoes, nova.datas)
+        self.acumulado = acumulado
+        return self
+
+    def como_dataframe(self, coluna_data, coluna_acumulado):
+        return pd.DataFrame({coluna_data: self.datas, coluna_acumulado: self.acumulado}, index=pd.Index(self.rotulos))
+
+
+def _ler_curva(base_cache):
+    """
+    Lê uma curva gravada no cache, ou retorna None se ela não existir.
+    """
+    for formato in ('feather', 'pkl'):
+        caminho_cache = f"{base_cache}.{formato}"
+        if os.path.exists(caminho_cache):
+            try:
+                tabela = ler_tabela(caminho_cache)
+                return CurvaAcumulada(tabela['rotulo'], tabela['data'], tabela['acumulado'])
+            except Exception as e:
+                print(f"Cache inválido em {caminho_cache}, recalculando a curva: {e}")
+    return None
+
+
+def curva_acumulada(df, coluna_data, coluna_valor, diretorio_cache=None):
+    """
+    Retorna a `CurvaAcumulada` de `coluna_valor` ordenada por `coluna_data`.
+
+    Quando o DataFrame veio de `carregar_com_cache` (tem o hash e a
+    identidade do arquivo em `df.attrs`), a curva com o índice de ordenação
+    é gravada no cache e reaproveitada nas próximas execuções. A chave inclui
+    a quantidade de linhas e uma impressão digital das linhas, porque filtros
+    e fatias do DataFrame herdam os attrs. Se o DataFrame completo veio de
+    uma ingestão incremental (`attrs['hash_anterior']`), a curva do conteúdo
+    anterior é estendida apenas com as linhas novas.
+    """
+    hash_origem = df.attrs.get('hash_origem')
+    origem = df.attrs.get('origem')
+    if not (hash_origem and origem):
+        return CurvaAcumulada.construir(df.index, df[coluna_data], df[coluna_valor])
+
+    diretorio_cache = diretorio_cache or DIRETORIO_CACHE
+    prefixo = os.path.join(diretorio_cache, f"curva.{origem}.{coluna_data}.{coluna_valor}.v{VERSAO}")
+    impressao = impressao_digital(df[[coluna_data, coluna_valor]])
+    base_cache = f"{prefixo}-{hash_origem}-{len(df)}-{impressao}"
+    curva = _ler_curva(base_cache)
+    if curva is not None:
+        return curva
+
+    anterior = None
+    completo = df.attrs.get('linhas') == len(df)
+    if completo and df.attrs.get('hash_anterior') and df.attrs.get('linhas_anteriores') is not None:
+        # A curva do DataFrame completo anterior tem o hash e a quantidade de linhas dele
+        for caminho in sorted(glob.glob(f"{glob.escape(prefixo)}-{df.attrs['hash_anterior']}-{df.attrs['linhas_anteriores']}-*")):
+            anterior = _ler_curva(os.path.splitext(caminho)[0])
+            if anterior is not None:
+                break
+    if anterior is not None and len(anterior.rotulos) == df.attrs['linhas_anteriores']:
+        novas = df.iloc[df.attrs['linhas_anteriores']:]
+        curva = anterior.acrescentar(novas.index, novas[coluna_data], novas[coluna_valor])
+    else:
+        curva = CurvaAcumulada.construir(df.index, df[coluna_data], df[coluna_valor])
+    os.makedirs(diretorio_cache, exist_ok=True)
+    tabela = pd.DataFrame({'rotulo': curva.rotulos, 'data': curva.datas, 'acumulado': curva.acumulado})
+    caminho_cache = gravar_tabela(tabela, base_cache)
+    if caminho_cache:
+        # Mantém as curvas de outras seleções do mesmo conteúdo
+        remover_versoes_antigas(prefixo, set(glob.glob(f"{glob.escape(prefixo)}-{hash_origem}-*")))
+    return curva
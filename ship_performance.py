@@ -3,6 +3,8 @@ import pandas as pd
 import unicodedata
 import re
 import matplotlib.pyplot as plt
+from cache_colunar import com_cache_colunar
+from conversao_colunar import ler_csv
 
 
 def normalize_column_names(columns):
@@ -15,8 +17,9 @@ def normalize_column_names(columns):
     return [normalize(col) for col in columns]
 
 
+@com_cache_colunar(versao=1)
 def load_csv(file_path):
-    df = pd.read_csv(file_path)
+    df = ler_csv(file_path)
     df.columns = normalize_column_names(df.columns)
     return df
 
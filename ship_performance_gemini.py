@@ -5,6 +5,8 @@ import seaborn as sns
 import unidecode
 import re
 import webbrowser
+from cache_colunar import com_cache_colunar
+from conversao_colunar import ler_csv
 
 # Função para converter nomes de colunas para snake_case
 
@@ -20,9 +22,10 @@ def to_snake_case(name):
 # Função para carregar o arquivo CSV e tratar os nomes das colunas
 
 
+@com_cache_colunar(versao=1)
 def load_data(filepath):
     try:
-        df = pd.read_csv(filepath)
+        df = ler_csv(filepath)
         df.columns = [to_snake_case(col) for col in df.columns]
         print(df.columns)
         return df
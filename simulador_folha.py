@@ -0,0 +1,155 @@
+import itertools
+import numpy as np
+import pandas as pd
+from moeda import CENTAVOS, centavos_numpy
+
+# Componentes de remuneração (valores anuais em centavos), sobre os quais incidem os encargos
+COMPONENTES_REMUNERACAO = [
+    'horas_extras', 'adicional_noturno', 'insalubridade', 'periculosidade', 'descanso_remunerado',
+    'ferias', 'adicional_de_ferias', '1_3_de_ferias', '13o_salario',
+]
+
+# Encargos (valores anuais em centavos). Em um cenário, cada encargo pode ser mantido como
+# está no arquivo ou recalculado como uma alíquota sobre a remuneração.
+COMPONENTES_ENCARGOS = [
+    'fgts_de_ferias', 'inss_de_ferias', 'fgts_do_13o_salario', 'inss_13o_salario', 'fgts',
+    'inss_patronal', 'inss_terceiros_sistema_s', 'rat_fap_sat', 'salario_educacao_salario_familia',
+]
+
+# Quantidade máxima de valores (cenários × funcionários) calculados de uma vez
+LIMITE_CELULAS = 4_000_000
+
+
+def matriz_componentes(df):
+    """
+    Monta a matriz funcionários × componentes do custo anual: o salário anual
+    (12 salários mensais) seguido dos componentes de remuneração e dos
+    encargos presentes no DataFrame (valores ausentes valem zero).
+
+    Returns:
+        Uma tupla (nomes, matriz) com a lista de componentes e o ndarray int64
+        em centavos.
+    """
+    nomes = ['salario_anual']
+    colunas = [centavos_numpy(df['salario']) * 12]
+    for col in COMPONENTES_REMUNERACAO + COMPONENTES_ENCARGOS:
+        if col in df.columns:
+            nomes.append(col)
+            colunas.append(centavos_numpy(df[col]))
+    return nomes, np.column_stack(colunas)
+
+
+def recompor_custo(df, pesos=None):
+    """
+    Recalcula o custo anual de cada funcionário a partir dos componentes, como
+    o produto da matriz de componentes por um vetor de pesos (1 para todos
+    os componentes quando `pesos` é None), arredondado para centavos.
+    """
+    nomes, matriz = matriz_componentes(df)
+    if pesos is None:
+        return pd.Series(matriz.sum(axis=1), index=df.index, name='custo_recalculado')
+    custo = np.rint(matriz @ np.asarray(pesos, dtype=np.float64)).astype(np.int64)
+    return pd.Series(custo, index=df.index, name='custo_recalculado')
+
+
+def grade_cenarios(**parametros):
+    """
+    Gera todas as combinações dos valores informados para cada parâmetro.
+
+    Exemplo: grade_cenarios(inss_patronal=[0.20, 0.22], reajuste=[0, 0.05])
+    gera 4 cenários.
+
+    Returns:
+        Um DataFrame com um cenário por linha e um parâmetro por coluna.
+    """
+    nomes = list(parametros)
+    return pd.DataFrame(list(itertools.product(*parametros.values())), columns=nomes)
+
+
+def simular_cenarios(df, cenarios, grupo='departamento'):
+    """
+    Calcula o custo anual total de vários cenários de uma só vez, com
+    broadcasting entre cenários (S) e funcionários (n).
+
+    Cada coluna de `cenarios` é um parâmetro:
+
+    * 'reajuste': reajuste salarial para todos (ex: 0.05 para 5%);
+    * 'reajuste_<valor do grupo>': reajuste adicional para um departamento
+      (ex: 'reajuste_Producao');
+    * 'teto_horas_extras': valor anual máximo de horas extras por funcionário,
+      em reais (NaN para sem teto);
+    * o nome de um encargo em `COMPONENTES_ENCARGOS` (ex: 'inss_patronal'):
+      alíquota aplicada sobre a remuneração (salário anual + componentes de
+      remuneração), substituindo o valor do arquivo. NaN mantém o valor do
+      arquivo.
+
+    Cada valor recalculado de um funcionário (salário reajustado, encargo por
+    alíquota) é arredondado para o centavo, e as somas são feitas em
+    aritmética inteira.
+
+    Args:
+        df: DataFrame dos funcionários.
+        cenarios: DataFrame com um cenário por linha (ex: `grade_cenarios`).
+        grupo: Coluna usada nos reajustes por grupo e no custo por grupo.
+
+    Returns:
+        Uma tupla (total, por_grupo): a série do custo total de cada cenário
+        e o DataFrame cenários × grupos, em centavos.
+    """
+    nomes, matriz = matriz_componentes(df)
+    indice = {nome: i for i, nome in enumerate(nomes)}
+    codigos, rotulos = pd.factorize(df[grupo], sort=True)
+
+    # Pertinência ao grupo (n × G), para somar por grupo com um produto de matrizes
+    pertence = np.zeros((len(df), len(rotulos)), dtype=np.int64)
+    validos = codigos >= 0
+    pertence[np.flatnonzero(validos), codigos[validos]] = 1
+
+    # Os cenários são processados em blocos para limitar a memória (S × n)
+    tamanho_bloco = max(1, LIMITE_CELULAS // max(len(df), 1))
+    totais, grupos = [np.zeros(0, dtype=np.int64)], [np.zeros((0, len(rotulos)), dtype=np.int64)]
+    for inicio in range(0, len(cenarios), tamanho_bloco):
+        custo = _simular_bloco(matriz, indice, codigos, rotulos, cenarios.iloc[inicio:inicio + tamanho_bloco])
+        totais.append(custo.sum(axis=1))
+        grupos.append(custo @ pertence)
+
+    total = pd.Series(np.concatenate(totais), index=cenarios.index, name='custo_total_anual')
+    por_grupo = pd.DataFrame(np.vstack(grupos), index=cenarios.index, columns=rotulos)
+    return total, por_grupo
+
+
+def _simular_bloco(matriz, indice, codigos, rotulos, cenarios):
+    """
+    Custo anual de cada funcionário em cada cenário do bloco (S × n), em centavos.
+    """
+    n_cenarios = len(cenarios)
+
+    # Reajuste por cenário e funcionário (S × n)
+    reajuste = np.zeros((n_cenarios, 1))
+    if 'reajuste' in cenarios:
+        reajuste = reajuste + cenarios['reajuste'].to_numpy(dtype=np.float64)[:, None]
+    reajuste_grupo = np.zeros((n_cenarios, len(rotulos) + 1))  # a última coluna é a dos sem grupo
+    for j, rotulo in enumerate(rotulos):
+        if f"reajuste_{rotulo}" in cenarios:
+            reajuste_grupo[:, j] = cenarios[f"reajuste_{rotulo}"].to_numpy(dtype=np.float64)
+    fator = 1 + reajuste + reajuste_grupo[:, codigos]
+
+    remuneracao = np.rint(matriz[:, indice['salario_anual']] * fator).astype(np.int64)
+    for col in COMPONENTES_REMUNERACAO:
+        if col not in indice:
+            continue
+        valores = matriz[:, indice[col]][None, :]
+        if col == 'horas_extras' and 'teto_horas_extras' in cenarios:
+            teto = cenarios['teto_horas_extras'].to_numpy(dtype=np.float64)[:, None]
+            teto = np.rint(np.where(np.isnan(teto), np.inf, teto * CENTAVOS))
+            valores = np.minimum(valores, teto).astype(np.int64)
+        remuneracao = remuneracao + valores
+
+    custo = remuneracao
+    for col in COMPONENTES_ENCARGOS:
+        valores = matriz[:, indice[col]][None, :] if col in indice else np.zeros((1, matriz.shape[0]), dtype=np.int64)
+        if col in cenarios:
+            aliquota = cenarios[col].to_numpy(dtype=np.float64)[:, None]
+            valores = np.where(np.isnan(aliquota), valores, np.rint(aliquota * remuneracao)).astype(np.int64)
+        custo = custo + valores
+    return custo
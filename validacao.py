@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+# Regras de validação e o bit de cada uma na coluna de erros
+CAMPO_OBRIGATORIO = 1
+CPF_INVALIDO = 2
+DATA_INVALIDA = 4
+ID_DUPLICADO = 8
+CPF_DUPLICADO = 16
+
+DESCRICOES = {
+    CAMPO_OBRIGATORIO: 'campo obrigatório vazio',
+    CPF_INVALIDO: 'CPF inválido',
+    DATA_INVALIDA: 'data inválida',
+    ID_DUPLICADO: 'ID duplicado',
+    CPF_DUPLICADO: 'CPF duplicado',
+}
+
+# Pesos dos dígitos verificadores do CPF
+_PESOS_DV1 = np.arange(10, 1, -1)
+_PESOS_DV2 = np.arange(11, 1, -1)
+
+# Quantidade de linhas de exemplo mostradas por regra no relatório
+LINHAS_EXEMPLO = 5
+
+
+def normalizar_cpf(serie):
+    """
+    Converte uma coluna de CPF para texto com 11 dígitos. Os CPFs lidos como
+    número perdem os zeros à esquerda, que são restaurados aqui; pontos e
+    traços são removidos.
+    """
+    if pd.api.types.is_numeric_dtype(serie):
+        texto = serie.astype('Int64').astype('string')
+    else:
+        texto = serie.astype('string').str.replace(r'[.\-\s]', '', regex=True)
+    return texto.str.zfill(11)
+
+
+def cpfs_invalidos(serie):
+    """
+    Verifica os dígitos verificadores de uma coluna de CPFs (texto com 11
+    dígitos). Os dígitos são convertidos para uma matriz n × 11 e os dois
+    verificadores são calculados com produtos de matrizes, sem laço por linha.
+
+    Returns:
+        Uma máscara booleana com True para os CPFs presentes e inválidos.
+    """
+    presentes = serie.notna().to_numpy()
+    formato = serie.str.fullmatch(r'\d{11}').fillna(False).to_numpy(dtype=bool)
+
+    invalidos = presentes & ~formato
+    if not formato.any():
+        return pd.Series(invalidos, index=serie.index)
+
+    # Cada caractere vira um inteiro (código Unicode - '0')
+    texto = serie[formato].to_numpy(dtype='U11')
+    digitos = texto.view(np.uint32).reshape(-1, 11).astype(np.int64) - ord('0')
+
+    dv1 = (digitos[:, :9] @ _PESOS_DV1) * 10 % 11 % 10
+    dv2 = (digitos[:, :10] @ _PESOS_DV2) * 10 % 11 % 10
+    repetidos = (digitos == digitos[:, :1]).all(axis=1)  # 000.000.000-00, 111.111.111-11, ...
+
+    invalidos[formato] = (dv1 != digitos[:, 9]) | (dv2 != digitos[:, 10]) | repetidos
+    return pd.Series(invalidos, index=serie.index)
+
+
+def campos_vazios(df, colunas):
+    """
+    Retorna um DataFrame booleano com True onde o campo está ausente ou só
+    tem espaços.
+    """
+    vazios = {}
+    for col in colunas:
+        serie = df[col]
+        vazio = serie.isna()
+        if pd.api.types.is_string_dtype(serie) or pd.api.types.is_object_dtype(serie) or isinstance(serie.dtype, pd.CategoricalDtype):
+            vazio |= serie.astype('string').str.strip().eq('').fillna(False)
+        vazios[col] = vazio.to_numpy(dtype=bool)
+    return pd.DataFrame(vazios, index=df.index)
+
+
+def datas_invalidas(serie, formato):
+    """
+    Retorna uma máscara com True para os valores preenchidos que não são
+    datas válidas no `formato` informado.
+    """
+    texto = serie.astype('string').str.strip()
+    preenchidos = texto.notna() & texto.ne('')
+    convertidas = pd.to_datetime(texto, format=formato, errors='coerce')
+    return (preenchidos & convertidas.isna()).fillna(False).astype(bool)
+
+
+def duplicados(serie):
+    """
+    Retorna uma máscara com True para todas as ocorrências de valores
+    (presentes) que aparecem mais de uma vez.
+    """
+    return (serie.duplicated(keep=False) & serie.notna()).astype(bool)
+
+
+def validar(df, obrigatorias=(), coluna_cpf=None, colunas_data=(), formato_data='%d/%m/%Y', coluna_id=None):
+    """
+    Valida um DataFrame com operações vetorizadas: campos obrigatórios,
+    dígitos verificadores do CPF, datas e IDs/CPFs duplicados.
+
+    Args:
+        df: O DataFrame a validar (com o CPF em texto, veja `normalizar_cpf`).
+        obrigatorias: Colunas que não podem ficar vazias.
+        coluna_cpf: Coluna do CPF (None para não validar).
+        colunas_data: Colunas de data ainda em texto.
+        formato_data: Formato das datas (padrão dd/mm/aaaa).
+        coluna_id: Coluna do identificador que não pode se repetir.
+
+    Returns:
+        Uma tupla (erros, relatorio): `erros` é uma série uint8 com os bits
+        das regras violadas por linha (0 para linhas válidas) e `relatorio` é
+        um DataFrame com a quantidade de linhas e alguns exemplos por regra e
+        coluna.
+    """
+    erros = np.zeros(len(df), dtype=np.uint8)
+    linhas = []
+
+    def registrar(regra, coluna, mascara):
+        mascara = np.asarray(mascara, dtype=bool)
+        erros[mascara] |= regra
+        if mascara.any():
+            exemplos = df.index[mascara][:LINHAS_EXEMPLO].tolist()
+            linhas.append((DESCRICOES[regra], coluna, int(mascara.sum()), exemplos))
+
+    vazios = campos_vazios(df, [col for col in obrigatorias if col in df.columns])
+    for col in vazios.columns:
+        registrar(CAMPO_OBRIGATORIO, col, vazios[col])
+    if coluna_cpf:
+        registrar(CPF_INVALIDO, coluna_cpf, cpfs_invalidos(df[coluna_cpf]))
+        registrar(CPF_DUPLICADO, coluna_cpf, duplicados(df[coluna_cpf]))
+    for col in colunas_data:
+        if col in df.columns:
+            registrar(DATA_INVALIDA, col, datas_invalidas(df[col], formato_data))
+    if coluna_id:
+        registrar(ID_DUPLICADO, coluna_id, duplicados(df[coluna_id]))
+
+    relatorio = pd.DataFrame(linhas, columns=['regra', 'coluna', 'linhas', 'exemplos'])
+    return pd.Series(erros, index=df.index, name='erros_validacao'), relatorio
+
+
+def resumo_erros(erros):
+    """
+    Resume uma coluna de erros gerada por `validar` (por exemplo, depois de
+    lida do cache): quantidade de linhas por regra violada.
+    """
+    erros = np.asarray(erros, dtype=np.uint8)
+    return pd.Series(
+        {descricao: int(((erros & regra) != 0).sum()) for regra, descricao in DESCRICOES.items()},
+        name='linhas',
+    )
+
+
+def atualizar_duplicados(erros, df, coluna_cpf=None, coluna_id=None):
+    """
+    Recalcula apenas os bits de ID e CPF duplicados sobre o DataFrame inteiro,
+    mantendo os demais. Usado quando linhas novas, validadas sozinhas, são
+    acrescentadas a um DataFrame já validado.
+    """
+    erros = np.asarray(erros, dtype=np.uint8) & np.uint8(~(ID_DUPLICADO | CPF_DUPLICADO) & 0xFF)
+    if coluna_cpf:
+        erros = erros | np.where(duplicados(df[coluna_cpf]).to_numpy(), CPF_DUPLICADO, 0).astype(np.uint8)
+    if coluna_id:
+        erros = erros | np.where(duplicados(df[coluna_id]).to_numpy(), ID_DUPLICADO, 0).astype(np.uint8)
+    return pd.Series(erros, index=df.index, name='erros_validacao')